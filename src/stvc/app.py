@@ -1,24 +1,37 @@
 """STVC main application — ties all components together."""
 
+import dataclasses
+import functools
 import logging
 import signal
 import sys
 import threading
 import time
 import tkinter as tk
-
-from stvc.config import load_config, load_dictionary, ensure_config_dir
-from stvc.audio import AudioRecorder
-from stvc.transcriber import Transcriber
-from stvc.postprocess import process as postprocess
+from typing import Iterable, Iterator
+
+from stvc.config import load_config, load_dictionary, ensure_config_dir, save_config
+from stvc.autotune import calibrate
+from stvc.audio import SAMPLE_RATE, AudioRecorder, MicrophoneSource, trim_silence
+from stvc.transcriber import DECODE_PROFILES, DecodeGuard, Transcriber, select_profile
+from stvc.streaming import StreamingSession
+from stvc.longform import LongFormTranscriber
+from stvc.handsfree import HandsFreeDictation, VadSegmenter
+from stvc.pipeline import Piece, Stage, Utterance
+from stvc.postprocess import SegmentJoiner
 from stvc.injector import inject_text
 from stvc.hotkey import HotkeyListener
 from stvc.tray import TrayIcon, TrayState
 from stvc.settings import SettingsWindow
-from stvc.context.window_detect import get_active_window, detect_app_type
-from stvc.context.extractors import get_extractor
-from stvc.context.term_parser import extract_terms
-from stvc.context.merger import build_prompt
+from stvc.context.window_detect import get_active_window, detect_app_type, process_cache
+from stvc.context.extractors import registry as extractors
+from stvc.context.idf import get_idf_table
+from stvc.context.merger import BaseTerms, build_prompt, prepare_base_terms, set_tokenizer
+from stvc.context.prefetch import Context, ContextPrefetch, ContextPrefetcher
+from stvc.context.term_cache import file_term_cache
+from stvc.context.term_parser import set_ranking
+from stvc.context.tracker import ContextTracker, default_focus_source
+from stvc.context.workspace_index import WorkspaceIndex, set_workspace_index
 
 log = logging.getLogger(__name__)
 
@@ -27,6 +40,8 @@ class STVCApp:
     """Main STVC application orchestrator.
 
     Coordinates: hotkey -> audio capture -> transcription -> post-processing -> injection.
+    Capture, transcription and injection run as separate pipeline stages,
+    so the next recording can start while the previous one decodes.
     """
 
     def __init__(self):
@@ -36,9 +51,35 @@ class STVCApp:
         # Components (initialized in start())
         self._recorder: AudioRecorder | None = None
         self._transcriber: Transcriber | None = None
+        self._base_terms: BaseTerms | None = None
+        self._longform: LongFormTranscriber | None = None
         self._hotkey: HotkeyListener | None = None
+        self._handsfree: HandsFreeDictation | None = None
         self._tray: TrayIcon | None = None
-        self._processing_lock = threading.Lock()
+        self._press_accepted = False
+        self._streaming_session: StreamingSession | None = None
+        self._prefetcher: ContextPrefetcher | None = None
+        self._tracker: ContextTracker | None = None
+        self._workspace_index: WorkspaceIndex | None = None
+        self._context_prefetch: ContextPrefetch | None = None
+
+        # Pipeline: hotkey callbacks only enqueue jobs on the capture stage
+        pipeline_cfg = self._config.get("pipeline", {})
+        self._inject = inject_text
+        self._inject_stage = Stage("inject", self._inject_piece, maxsize=int(pipeline_cfg.get("queue_size", 4)))
+        self._transcribe_stage = Stage(
+            "transcribe", self._transcribe_utterance,
+            maxsize=int(pipeline_cfg.get("queue_size", 4)), output=self._inject_stage,
+        )
+        self._capture_stage = Stage("capture", lambda job: job(), output=self._transcribe_stage)
+
+        # Tray state bookkeeping across stages
+        self._state_lock = threading.Lock()
+        self._recording = False
+        self._in_flight = 0
+
+        # Set once the model is loaded and warmed up on the loader thread
+        self._model_ready = threading.Event()
 
         # Tkinter root for settings window (hidden)
         self._tk_root: tk.Tk | None = None
@@ -46,91 +87,296 @@ class STVCApp:
         self._settings_requested = False
 
     def _on_ptt_press(self):
-        """Called when push-to-talk hotkey is pressed — start recording."""
-        if not self._processing_lock.acquire(blocking=False):
-            log.debug("Already processing, ignoring press.")
-            return
+        """Called on the keyboard hook thread when push-to-talk is pressed.
 
-        try:
-            log.info("PTT pressed — recording.")
-            if self._tray:
-                self._tray.set_state(TrayState.LISTENING)
-            self._recorder.start()
-        except Exception:
-            self._processing_lock.release()
-            raise
+        Must return immediately: it only queues the recording start on
+        the capture stage.
+        """
+        if self._press_accepted:
+            return
+        self._press_accepted = True
+        self._capture_stage.put(self._start_recording)
 
     def _on_ptt_release(self):
-        """Called when push-to-talk hotkey is released — transcribe and inject."""
+        """Called on the keyboard hook thread when push-to-talk is released."""
+        if not self._press_accepted:
+            return
+        self._press_accepted = False
+        self._capture_stage.put(functools.partial(self._finish_recording, time.perf_counter()))
+
+    def _refresh_tray(self, recording: bool | None = None, in_flight: int = 0):
+        """Update recording/in-flight bookkeeping and the tray icon to match."""
+        with self._state_lock:
+            if recording is not None:
+                self._recording = recording
+            self._in_flight += in_flight
+            if self._recording:
+                state = TrayState.LISTENING
+            elif not self._model_ready.is_set():
+                state = TrayState.LOADING
+            elif self._in_flight:
+                state = TrayState.TRANSCRIBING
+            elif self._handsfree is not None:
+                state = TrayState.LISTENING
+            else:
+                state = TrayState.IDLE
+        if self._tray:
+            self._tray.set_state(state)
+
+    def _start_recording(self):
+        """Start recording (capture stage)."""
+        log.info("PTT pressed — recording.")
+        self._refresh_tray(recording=True)
+        self._recorder.start()
+
+        # The focused window can't change while the key is held; use the
+        # tracker's ready-made prompt if it has one, else extract now
+        context = self._tracker.lookup() if self._tracker is not None else None
+        if context is not None:
+            self._context_prefetch = ContextPrefetch.ready(context)
+        elif self._prefetcher is not None:
+            self._context_prefetch = self._prefetcher.submit()
+
+        streaming_cfg = self._config.get("streaming", {})
+        if streaming_cfg.get("enabled", False) and self._model_ready.is_set():
+            # Partial decodes start while the key is held, so they need
+            # the prompt now; waiting on the prefetch is capped by its deadline
+            context = self._resolve_context(self._context_prefetch)
+            self._streaming_session = StreamingSession(
+                self._transcriber,
+                self._recorder.get_audio,
+                initial_prompt=context.prompt,
+                step=float(streaming_cfg.get("step", 1.0)),
+            )
+            self._streaming_session.start()
+
+    def _finish_recording(self, released_at: float) -> Utterance | None:
+        """Stop recording and hand the audio to the transcription stage (capture stage).
+
+        Args:
+            released_at: perf_counter() timestamp of the key release
+        """
+        session, self._streaming_session = self._streaming_session, None
+        prefetch, self._context_prefetch = self._context_prefetch, None
         try:
-            log.info("PTT released — transcribing.")
+            log.info("PTT released.")
             self._recorder.stop()
 
-            if self._tray:
-                self._tray.set_state(TrayState.TRANSCRIBING)
-
+            # get_audio() is a view; the next start() records into a fresh arena
             audio = self._recorder.get_audio()
-            if audio.size == 0:
-                log.info("No audio captured.")
-                return
+        except Exception:
+            if session is not None:
+                session.cancel()
+            raise
+        finally:
+            self._refresh_tray(recording=False)
+
+        if audio.size == 0:
+            log.info("No audio captured.")
+            if session is not None:
+                session.cancel()
+            return None
+
+        if session is not None:
+            # finish() runs on the transcription stage, possibly after the
+            # next press has started recording; pin it to this utterance
+            session.freeze(audio)
+        self._refresh_tray(in_flight=1)
+        return Utterance(audio=audio, released_at=released_at, session=session, context=prefetch)
+
+    def _wait_for_model(self):
+        """Block until the background model load has finished."""
+        if not self._model_ready.is_set():
+            log.info("Model still loading, utterance queued until it is ready.")
+            self._model_ready.wait()
+
+    def _transcribe_utterance(self, utterance: Utterance) -> Iterator[Piece]:
+        """Transcribe one utterance, passing segments on as they decode (transcription stage)."""
+        mode = "streaming" if utterance.session is not None else "batch"
+        first = True
+        try:
+            self._wait_for_model()
+            if utterance.session is not None:
+                # Streaming decodes with the base prompt while recording;
+                # only the uncommitted tail is left to decode here
+                texts = [utterance.session.finish()]
+            else:
+                texts = self._transcribe_segments(utterance.audio, utterance.context, utterance.released_at)
+            for text in texts:
+                if first:
+                    first = False
+                    log.info(
+                        "Release-to-first-segment: %.0f ms (%s).",
+                        (time.perf_counter() - utterance.released_at) * 1000, mode,
+                    )
+                yield Piece(utterance, text)
+        except Exception:
+            log.exception("Transcription failed.")
+            if utterance.session is not None:
+                utterance.session.cancel()
+        log.info("Release-to-text: %.0f ms (%s).", (time.perf_counter() - utterance.released_at) * 1000, mode)
+        yield Piece(utterance, final=True)
+
+    def _create_joiner(self) -> SegmentJoiner:
+        """Incremental post-processor configured from [post_processing]."""
+        pp_config = self._config.get("post_processing", {})
+        return SegmentJoiner(
+            fix_questions=pp_config.get("fix_question_marks", True),
+            remove_fillers=pp_config.get("remove_filler_words", True),
+        )
+
+    def _inject_piece(self, piece: Piece):
+        """Post-process and inject one transcript segment (injection stage)."""
+        utterance = piece.utterance
+        if utterance.joiner is None:
+            utterance.joiner = self._create_joiner()
 
-            # Context-aware prompt building
-            context_enabled = self._config.get("context", {}).get("enabled", True)
-            merged_prompt = None
-
-            if context_enabled:
-                try:
-                    # Get active window
-                    window_info = get_active_window()
-                    app_type = detect_app_type(window_info)
-                    log.debug(f"Active window: {app_type} - {window_info.title}")
-
-                    # Extract content
-                    extractor = get_extractor(app_type)
-                    content = extractor.extract(window_info)
-
-                    if content:
-                        # Extract terms
-                        context_terms = extract_terms(content, max_terms=50)
-                        log.debug(f"Extracted {len(context_terms)} context terms: {context_terms[:10]}")
-
-                        # Build merged prompt
-                        base_prompt = self._transcriber.initial_prompt
-                        merged_prompt = build_prompt(base_prompt, context_terms, max_tokens=224)
-                    else:
-                        log.debug("No content extracted from active window")
-
-                except Exception as e:
-                    log.debug(f"Context extraction failed, using base dictionary: {e}")
-
-            # Transcribe with context-aware prompt or base prompt
-            text = self._transcriber.transcribe(audio, initial_prompt=merged_prompt)
-            if not text:
+        if piece.final:
+            if utterance.first_injected_at is None:
                 log.info("No speech detected.")
-                return
+            self._refresh_tray(in_flight=-1)
+            return
 
-            # Post-process
-            pp_config = self._config.get("post_processing", {})
-            text = postprocess(
-                text,
-                fix_questions=pp_config.get("fix_question_marks", True),
-                remove_fillers=pp_config.get("remove_filler_words", True),
+        text = utterance.joiner.feed(piece.text)
+        if not text:
+            return
+        if utterance.first_injected_at is None:
+            utterance.first_injected_at = time.perf_counter()
+            log.info(
+                "Release-to-first-character: %.0f ms.",
+                (utterance.first_injected_at - utterance.released_at) * 1000,
             )
-
-            if not text:
-                log.info("Text empty after post-processing.")
-                return
-
-            # Inject into focused window
-            log.info("Injecting: %s", text[:80])
-            inject_text(text)
-
-        except Exception:
-            log.exception("Error during transcription/injection.")
+        log.info("Injecting: %s", text[:80])
+        self._inject(text)
+
+    def _deliver(self, texts: Iterable[str]):
+        """Post-process transcript segments and inject each into the focused window."""
+        joiner = self._create_joiner()
+        for segment in texts:
+            text = joiner.feed(segment)
+            if text:
+                log.info("Injecting: %s", text[:80])
+                self._inject(text)
+        if not joiner.started:
+            log.info("No speech detected.")
+
+    def _on_handsfree_segment(self, audio):
+        """Called on the hands-free worker thread for each detected speech segment."""
+        self._refresh_tray(in_flight=1)
+        try:
+            self._wait_for_model()
+            self._deliver(self._transcribe_segments(audio))
         finally:
-            if self._tray:
-                self._tray.set_state(TrayState.IDLE)
-            self._processing_lock.release()
+            self._refresh_tray(in_flight=-1)
+
+    def _resolve_context(self, prefetch: ContextPrefetch | None, released_at: float | None = None) -> Context:
+        """Context for the current recording: the one prefetched on press, else extracted now.
+
+        Args:
+            prefetch: Context extraction started on key press, if any
+            released_at: perf_counter() timestamp of the key release, if released
+        """
+        if prefetch is not None:
+            return prefetch.result(released_at)
+        if self._config.get("context", {}).get("enabled", True):
+            return (self._tracker.lookup() if self._tracker is not None else None) or self._build_context()
+        return Context()
+
+    def _build_context(self) -> Context:
+        """Extract terms from the foreground window and merge them into the prompt."""
+        app_type = None
+        try:
+            # Get active window
+            window_info = get_active_window()
+            app_type = detect_app_type(window_info)
+            log.debug(f"Active window: {app_type} - {window_info.title}")
+
+            # Extract terms (cached per file version for editors)
+            context_terms = extractors.extract_terms(app_type, window_info, max_terms=50)
+            if not context_terms:
+                log.debug("No content extracted from active window")
+                return Context(app_type=app_type)
+            log.debug(f"Extracted {len(context_terms)} context terms: {context_terms[:10]}")
+
+            # Build merged prompt
+            return Context(prompt=build_prompt(self._base_terms, context_terms), app_type=app_type)
+
+        except Exception as e:
+            log.debug(f"Context extraction failed, using base dictionary: {e}")
+            return Context(app_type=app_type)
+
+    def _transcribe_segments(
+        self,
+        audio,
+        prefetch: ContextPrefetch | None = None,
+        released_at: float | None = None,
+    ) -> Iterator[str]:
+        """Build the context-aware prompt and transcribe the recording, yielding segments.
+
+        Args:
+            audio: Recorded samples
+            prefetch: Context extraction started on key press, if any
+            released_at: perf_counter() timestamp of the key release
+        """
+        # Trim silence client-side so the model skips its own VAD pass
+        speech_timestamps = None
+        vad_cfg = self._config.get("vad", {})
+        if vad_cfg.get("enabled", True):
+            vad = trim_silence(
+                audio,
+                backend=vad_cfg.get("backend", "energy"),
+                min_speech_ms=int(vad_cfg.get("min_speech_ms", 250)),
+                min_silence_ms=int(vad_cfg.get("min_silence_ms", 500)),
+                speech_pad_ms=int(vad_cfg.get("speech_pad_ms", 200)),
+            )
+            if not vad.has_speech:
+                log.info("VAD found no speech in %.2fs of audio.", audio.size / SAMPLE_RATE)
+                return
+            log.info(
+                "VAD trimmed %.2fs of %.2fs (%.0f%%).",
+                vad.trimmed_seconds, audio.size / SAMPLE_RATE,
+                100 * vad.trimmed_seconds * SAMPLE_RATE / audio.size,
+            )
+            audio, speech_timestamps = vad.audio, vad.speech_timestamps
+
+        # Context-aware prompt building; push-to-talk starts it on press
+        context = self._resolve_context(prefetch, released_at)
+        merged_prompt, app_type = context.prompt, context.app_type
+
+        # Pick decode settings from clip length and target app
+        duration = audio.size / SAMPLE_RATE
+        decode_cfg = self._config.get("decode", {})
+        profile_name = decode_cfg.get("profile", "auto")
+        if profile_name in DECODE_PROFILES:
+            profile = DECODE_PROFILES[profile_name]
+        else:
+            profile = select_profile(
+                duration, app_type,
+                short_duration=float(decode_cfg.get("short_duration", 3.0)),
+                long_duration=float(decode_cfg.get("long_duration", 20.0)),
+            )
+        log.info("Decode profile: %s (%.2fs, app=%s).", profile.name, duration, app_type or "n/a")
+
+        # Transcribe with context-aware prompt or base prompt; long
+        # dictations are split at pauses and decoded in batches
+        decode_start = time.perf_counter()
+        longform_cfg = self._config.get("longform", {})
+        if longform_cfg.get("enabled", True) and duration >= float(longform_cfg.get("min_duration", 60.0)):
+            if self._longform is None:
+                self._longform = LongFormTranscriber(
+                    self._transcriber, batch_size=int(longform_cfg.get("batch_size", 8)),
+                )
+            yield self._longform.transcribe(
+                audio, initial_prompt=merged_prompt, speech_timestamps=speech_timestamps, profile=profile,
+            )
+        else:
+            yield from self._transcriber.transcribe_iter(
+                audio, initial_prompt=merged_prompt, speech_timestamps=speech_timestamps, profile=profile,
+            )
+        log.debug(
+            "Decoded %.2fs of audio in %.0f ms (worst so far %.0f ms).",
+            duration, (time.perf_counter() - decode_start) * 1000, self._transcriber.max_decode_seconds * 1000,
+        )
 
     def _on_settings(self):
         """Open settings window (called from tray thread, sets flag for main thread)."""
@@ -163,16 +409,100 @@ class STVCApp:
         log.info(f"Audio device changed to: {new_device}")
         # Recreate recorder with new device
         if self._recorder:
-            self._recorder = AudioRecorder(device=int(new_device))
+            self._recorder.close()
+            self._recorder = self._create_recorder(int(new_device))
+
+    def _create_recorder(self, device: int | None) -> AudioRecorder:
+        """Build an AudioRecorder from the [audio] config and open it."""
+        audio_cfg = self._config.get("audio", {})
+        recorder = AudioRecorder(
+            device=device,
+            max_duration=float(audio_cfg.get("max_duration", 300.0)),
+            warm_stream=audio_cfg.get("warm_stream", False),
+            preroll_ms=int(audio_cfg.get("preroll_ms", 300)),
+        )
+        recorder.open()
+        return recorder
+
+    def _create_guard(self) -> DecodeGuard | None:
+        """Build the runaway-decode guard from the [guard] config."""
+        guard_cfg = self._config.get("guard", {})
+        if not guard_cfg.get("enabled", True):
+            return None
+        fields = {f.name for f in dataclasses.fields(DecodeGuard)}
+        guard = DecodeGuard(**{k: v for k, v in guard_cfg.items() if k in fields})
+        # Calibrated decode speed, if autotune measured one
+        rtf = self._config.get("model", {}).get("decode_rtf")
+        if rtf and "decode_rtf" not in guard_cfg:
+            guard.decode_rtf = float(rtf)
+        return guard
 
     def _on_dictionary_changed(self, new_dict: str):
         """Handle dictionary change from settings."""
         log.info("Dictionary changed, updating transcriber prompt.")
         if self._transcriber:
             self._transcriber.update_base_prompt(new_dict)
+            self._base_terms = prepare_base_terms(new_dict)
+            if self._tracker:
+                self._tracker.clear()
+
+    def _autotune(self):
+        """Resolve "auto" model settings once and persist them (loader thread)."""
+        model_cfg = self._config.get("model", {})
+        if "auto" not in (model_cfg.get("device", "auto"), model_cfg.get("compute_type", "auto")):
+            return
+
+        log.info("Calibrating model settings for this machine...")
+        settings, model, calibrated = calibrate(model_cfg, language=self._transcriber.language)
+        self._transcriber.model_name = settings["name"]
+        self._transcriber.device = settings["device"]
+        self._transcriber.compute_type = settings["compute_type"]
+        self._transcriber.cpu_threads = settings.get("cpu_threads", 0)
+        self._transcriber.num_workers = settings.get("num_workers", 1)
+        if model is not None:
+            # Calibration already loaded the chosen model; don't load it twice
+            self._transcriber.use_model(model)
+        if self._transcriber.guard is not None and "decode_rtf" in settings:
+            self._transcriber.guard.decode_rtf = settings["decode_rtf"]
+
+        if not calibrated:
+            # Keep "auto" so calibration runs again once a model is stored
+            log.info("Calibration incomplete; settings not saved.")
+            return
+
+        self._config["model"] = {**model_cfg, **settings}
+        try:
+            save_config(self._config)
+        except ImportError as e:
+            log.warning(f"Calibrated settings not saved: {e}")
+
+    def _warm_up_model(self, started_at: float):
+        """Load and warm up the model (loader thread), then mark it ready."""
+        try:
+            # Load the term IDF table here rather than during the first dictation
+            get_idf_table()
+            self._autotune()
+            log.info("Warming up transcription model...")
+            self._transcriber.warmup()
+            # Count prompt tokens exactly from now on; re-count the base dictionary once
+            set_tokenizer(self._transcriber.tokenizer)
+            self._base_terms = prepare_base_terms(self._transcriber.initial_prompt)
+            if self._tracker:
+                self._tracker.clear()
+            log.info("Startup: model ready after %.2fs.", time.perf_counter() - started_at)
+        except Exception:
+            log.exception("Model failed to load; transcription will retry on first use.")
+        finally:
+            self._model_ready.set()
+            self._refresh_tray()
 
     def start(self):
-        """Initialize all components and start STVC."""
+        """Initialize all components and start STVC.
+
+        The model loads on a background thread while the tray and hotkey
+        come up; presses before it is ready are recorded and queued.
+        """
+        started_at = time.perf_counter()
         ensure_config_dir()
 
         model_cfg = self._config.get("model", {})
@@ -186,29 +516,97 @@ class STVCApp:
 
         # Audio recorder
         device_index = audio_cfg.get("device")
-        if device_index:
-            self._recorder = AudioRecorder(device=int(device_index))
-        else:
-            self._recorder = AudioRecorder()
+        self._recorder = self._create_recorder(int(device_index) if device_index else None)
 
         # Transcription engine
         initial_prompt = load_dictionary(dict_path)
         self._transcriber = Transcriber(
             model_name=model_cfg.get("name", "large-v3-turbo"),
-            device=model_cfg.get("device", "cuda"),
-            compute_type=model_cfg.get("compute_type", "float16"),
+            device=model_cfg.get("device", "auto"),
+            compute_type=model_cfg.get("compute_type", "auto"),
             beam_size=model_cfg.get("beam_size", 5),
             language=self._config.get("general", {}).get("language", "en"),
             initial_prompt=initial_prompt,
+            cpu_threads=int(model_cfg.get("cpu_threads", 0)),
+            num_workers=int(model_cfg.get("num_workers", 1)),
+            guard=self._create_guard(),
+            allow_download=bool(model_cfg.get("allow_download", False)),
         )
+        self._base_terms = prepare_base_terms(initial_prompt)
 
-        # Warm up model (loads into GPU)
-        log.info("Warming up transcription model...")
-        self._transcriber.warmup()
+        # Load and warm up the model (GPU) in the background
+        threading.Thread(
+            target=self._warm_up_model, args=(started_at,), name="stvc-model-loader", daemon=True,
+        ).start()
 
         # System tray icon with settings callback
         self._tray = TrayIcon(on_quit=self.stop, on_settings=self._on_settings)
         self._tray.start()
+        self._refresh_tray()
+        log.info("Startup: tray ready after %.2fs.", time.perf_counter() - started_at)
+
+        # Extractors for app types added by installed plugins
+        context_cfg = self._config.get("context", {})
+        if context_cfg.get("enabled", True):
+            extractors.load_plugins()
+            try:
+                set_ranking(context_cfg.get("ranking", "tfidf"))
+            except ValueError as e:
+                log.warning(f"{e}; keeping the default.")
+
+        # Project-wide identifiers for editors, indexed in the background
+        if context_cfg.get("enabled", True) and context_cfg.get("workspace_index", True):
+            self._workspace_index = WorkspaceIndex(
+                max_file_bytes=int(context_cfg.get("index_max_file_kb", 256)) * 1024,
+                max_files=int(context_cfg.get("index_max_files", 5000)),
+                cpu_fraction=float(context_cfg.get("index_cpu_fraction", 0.25)),
+            )
+            self._workspace_index.start()
+            set_workspace_index(self._workspace_index)
+
+        # Follow focus changes so prompts are ready before the key is pressed
+        if context_cfg.get("enabled", True) and context_cfg.get("track_focus", True):
+            source = default_focus_source()
+            if source is not None:
+                self._tracker = ContextTracker(
+                    lambda terms: build_prompt(self._base_terms, terms),
+                    source,
+                    debounce=float(context_cfg.get("focus_debounce_ms", 250)) / 1000,
+                    cache_size=int(context_cfg.get("prompt_cache_size", 32)),
+                    terminal_poll_s=float(context_cfg.get("terminal_poll_s", 2.0)),
+                )
+                self._tracker.start()
+
+        handsfree_cfg = self._config.get("handsfree", {})
+        if handsfree_cfg.get("enabled", False):
+            # Continuous listening replaces push-to-talk
+            segmenter = VadSegmenter(
+                min_speech_ms=int(handsfree_cfg.get("min_speech_ms", 300)),
+                min_silence_ms=int(handsfree_cfg.get("min_silence_ms", 1000)),
+                speech_pad_ms=int(handsfree_cfg.get("speech_pad_ms", 300)),
+                max_segment_s=float(handsfree_cfg.get("max_segment_s", 30.0)),
+            )
+            self._handsfree = HandsFreeDictation(
+                MicrophoneSource(device=int(device_index) if device_index else None),
+                on_segment=self._on_handsfree_segment,
+                segmenter=segmenter,
+            )
+            self._handsfree.start()
+            self._refresh_tray()
+            log.info("Startup: listening after %.2fs.", time.perf_counter() - started_at)
+            log.info("STVC is running in hands-free mode. Ctrl+C to exit.")
+            return
+
+        # Context extraction runs during recording, started on each press
+        if context_cfg.get("enabled", True):
+            self._prefetcher = ContextPrefetcher(
+                self._build_context, deadline=float(context_cfg.get("prefetch_deadline_ms", 500)) / 1000,
+            )
+
+        # Pipeline stages, fed by the hotkey callbacks
+        self._inject_stage.start()
+        self._transcribe_stage.start()
+        self._capture_stage.start()
 
         # Hotkey listener
         self._hotkey = HotkeyListener(
@@ -217,6 +615,7 @@ class STVCApp:
             on_release=self._on_ptt_release,
         )
         self._hotkey.start()
+        log.info("Startup: hotkey ready after %.2fs.", time.perf_counter() - started_at)
 
         log.info("STVC is running. Press %s to dictate. Ctrl+C to exit.", hotkey_cfg.get("push_to_talk", "alt+e"))
 
@@ -227,6 +626,23 @@ class STVCApp:
 
         if self._hotkey:
             self._hotkey.stop()
+        self._capture_stage.stop(timeout=1.0)
+        self._transcribe_stage.stop(timeout=1.0)
+        self._inject_stage.stop(timeout=1.0)
+        if self._prefetcher:
+            self._prefetcher.shutdown()
+        if self._tracker:
+            self._tracker.stop()
+        if self._workspace_index:
+            set_workspace_index(None)
+            self._workspace_index.stop()
+        log.info("Term cache: %s.", file_term_cache.stats())
+        log.info("Extractors: %s.", extractors.summary())
+        log.info("Process cache: %s.", process_cache.stats())
+        if self._handsfree:
+            self._handsfree.stop()
+        if self._recorder:
+            self._recorder.close()
         if self._tray:
             self._tray.stop()
         if self._tk_root:
@@ -1,7 +1,13 @@
 """Microphone audio capture using sounddevice."""
 
 import logging
+import queue
 import threading
+import time
+import wave
+from dataclasses import dataclass, field
+from typing import Iterator
+
 import numpy as np
 import sounddevice as sd
 
@@ -11,6 +17,17 @@ SAMPLE_RATE = 16000
 CHANNELS = 1
 DTYPE = "float32"
 
+# Initial arena size; grows by doubling up to max_duration
+INITIAL_BUFFER_SECONDS = 30.0
+DEFAULT_MAX_DURATION = 300.0
+DEFAULT_PREROLL_MS = 300
+
+# Energy VAD defaults
+VAD_FRAME_MS = 30
+VAD_FLOOR_DB = -50.0       # frames quieter than this are never speech
+VAD_MARGIN_DB = 12.0       # speech must be this far above the noise floor
+VAD_ZCR_THRESHOLD = 0.25   # high zero-crossing rate rescues quiet fricatives
+
 
 def list_audio_devices() -> list[dict]:
     """List all available audio input devices.
@@ -37,8 +54,234 @@ def list_audio_devices() -> list[dict]:
     return devices
 
 
+def load_wav(path: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Load a PCM WAV file as 1-D float32 mono audio at `sample_rate`.
+
+    Multi-channel files are averaged to mono; other sample rates are
+    linearly resampled. Intended for benchmarks and replaying test audio.
+
+    Args:
+        path: Path to a 8/16/32-bit PCM WAV file.
+        sample_rate: Target sample rate (default 16kHz).
+
+    Returns:
+        Audio samples as float32 numpy array in [-1, 1].
+    """
+    with wave.open(str(path), "rb") as wf:
+        width = wf.getsampwidth()
+        channels = wf.getnchannels()
+        source_rate = wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+
+    if width == 1:
+        audio = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        audio = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768
+    elif width == 4:
+        audio = np.frombuffer(raw, dtype=np.int32).astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width} bytes")
+
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+
+    if source_rate != sample_rate and audio.size:
+        n = int(audio.size * sample_rate / source_rate)
+        audio = np.interp(
+            np.arange(n) * (source_rate / sample_rate),
+            np.arange(audio.size),
+            audio,
+        ).astype(np.float32)
+
+    return audio
+
+
+@dataclass
+class VadResult:
+    """Outcome of trim_silence().
+
+    Attributes:
+        audio: Trimmed audio (a view into the input), empty if no speech
+        speech_timestamps: (start, end) sample offsets of speech in `audio`
+        original_samples: Length of the untrimmed input in samples
+        sample_rate: Sample rate of the audio
+    """
+    audio: np.ndarray
+    speech_timestamps: list[tuple[int, int]] = field(default_factory=list)
+    original_samples: int = 0
+    sample_rate: int = SAMPLE_RATE
+
+    @property
+    def trimmed_seconds(self) -> float:
+        """Seconds of audio removed before inference."""
+        return (self.original_samples - self.audio.size) / self.sample_rate
+
+    @property
+    def has_speech(self) -> bool:
+        return bool(self.speech_timestamps)
+
+
+def _runs(mask: np.ndarray) -> np.ndarray:
+    """Return (start, end) index pairs of True runs in a boolean array."""
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return np.stack((np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)), axis=1)
+
+
+def frame_features(frames: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Per-frame energy (dBFS) and zero-crossing rate of a (n, frame) array."""
+    energy_db = 10 * np.log10(np.mean(np.square(frames), axis=1) + 1e-10)
+    zcr = np.mean(np.signbit(frames[:, 1:]) != np.signbit(frames[:, :-1]), axis=1)
+    return energy_db, zcr
+
+
+def detect_speech_energy(
+    audio: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    frame_ms: int = VAD_FRAME_MS,
+    floor_db: float = VAD_FLOOR_DB,
+    margin_db: float = VAD_MARGIN_DB,
+    zcr_threshold: float = VAD_ZCR_THRESHOLD,
+) -> np.ndarray:
+    """Classify fixed-size frames as speech using energy and zero-crossing rate.
+
+    The threshold adapts to the clip: it sits `margin_db` above the
+    10th-percentile frame energy (the noise floor), but never below
+    `floor_db` and never more than 20 dB under the loudest frame, so a
+    clip that is speech throughout is not mistaken for noise.
+
+    Returns:
+        Boolean array with one entry per frame.
+    """
+    frame = int(sample_rate * frame_ms / 1000)
+    n = audio.size // frame
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+
+    energy_db, zcr = frame_features(audio[:n * frame].reshape(n, frame))
+
+    noise_floor = np.percentile(energy_db, 10)
+    threshold = max(floor_db, min(noise_floor + margin_db, energy_db.max() - 20))
+
+    voiced = energy_db > threshold
+    unvoiced = (energy_db > threshold - 6) & (energy_db > floor_db) & (zcr > zcr_threshold)
+    return voiced | unvoiced
+
+
+def _detect_speech_silero(
+    audio: np.ndarray,
+    min_speech_ms: int,
+    min_silence_ms: int,
+    speech_pad_ms: int,
+) -> list[tuple[int, int]]:
+    """Speech segments from the Silero model bundled with faster-whisper (16kHz only)."""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    options = VadOptions(
+        min_speech_duration_ms=min_speech_ms,
+        min_silence_duration_ms=min_silence_ms,
+        speech_pad_ms=speech_pad_ms,
+    )
+    return [(ts["start"], ts["end"]) for ts in get_speech_timestamps(audio, options)]
+
+
+def detect_speech(
+    audio: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    backend: str = "energy",
+    min_speech_ms: int = 250,
+    min_silence_ms: int = 500,
+    speech_pad_ms: int = 200,
+) -> list[tuple[int, int]]:
+    """Find speech segments in audio.
+
+    Args:
+        audio: 1-D float32 audio
+        sample_rate: Sample rate of `audio`
+        backend: "energy" (NumPy frame energy/ZCR) or "silero"
+        min_speech_ms: Drop speech runs shorter than this
+        min_silence_ms: Merge speech runs separated by shorter gaps
+        speech_pad_ms: Padding added around each segment
+
+    Returns:
+        List of (start, end) sample offsets, sorted and non-overlapping.
+    """
+    if audio.size == 0:
+        return []
+
+    if backend == "silero":
+        return _detect_speech_silero(audio, min_speech_ms, min_silence_ms, speech_pad_ms)
+    if backend != "energy":
+        raise ValueError(f"Unknown VAD backend: {backend}")
+
+    frame = int(sample_rate * VAD_FRAME_MS / 1000)
+    runs = _runs(detect_speech_energy(audio, sample_rate))
+    if runs.size == 0:
+        return []
+
+    # Merge runs separated by short pauses
+    min_gap = min_silence_ms / VAD_FRAME_MS
+    merged = [list(runs[0])]
+    for start, end in runs[1:]:
+        if start - merged[-1][1] < min_gap:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+
+    min_len = min_speech_ms / VAD_FRAME_MS
+    pad = int(sample_rate * speech_pad_ms / 1000)
+    segments = []
+    for start, end in merged:
+        if end - start < min_len:
+            continue
+        start = max(int(start) * frame - pad, 0)
+        end = min(int(end) * frame + pad, audio.size)
+        if segments and start <= segments[-1][1]:
+            segments[-1] = (segments[-1][0], end)
+        else:
+            segments.append((start, end))
+    return segments
+
+
+def trim_silence(audio: np.ndarray, sample_rate: int = SAMPLE_RATE, **vad_options) -> VadResult:
+    """Trim leading/trailing silence and locate speech before inference.
+
+    Keyword arguments are passed to detect_speech(). Clips with no
+    speech segment long enough come back empty so they can be skipped
+    without touching the model.
+
+    Returns:
+        VadResult whose audio is a zero-copy slice of the input and whose
+        speech_timestamps are relative to that slice.
+    """
+    segments = detect_speech(audio, sample_rate, **vad_options)
+    if not segments:
+        return VadResult(audio[:0], [], audio.size, sample_rate)
+
+    offset, end = segments[0][0], segments[-1][1]
+    return VadResult(
+        audio=audio[offset:end],
+        speech_timestamps=[(start - offset, stop - offset) for start, stop in segments],
+        original_samples=audio.size,
+        sample_rate=sample_rate,
+    )
+
+
 class AudioRecorder:
-    """Records audio from the microphone into a buffer.
+    """Records audio from the microphone into a preallocated buffer.
+
+    The sounddevice callback writes each block in place into a float32
+    arena that grows by doubling up to ``max_duration`` seconds, so long
+    dictations don't allocate a new array per block. Audio past the
+    limit is dropped.
+
+    With ``warm_stream=True`` the input stream is opened once and kept
+    running. Between recordings the callback keeps the last
+    ``preroll_ms`` of audio in a small ring, and start() seeds the new
+    recording with it, so speech that begins as the key goes down is not
+    clipped while the device opens.
+
+    ``stream_factory`` defaults to ``sd.InputStream``; tests can pass any
+    callable accepting the same keyword arguments.
 
     Usage:
         recorder = AudioRecorder()
@@ -48,30 +291,115 @@ class AudioRecorder:
         audio = recorder.get_audio()  # numpy float32 array, 16kHz mono
     """
 
-    def __init__(self, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS, device: int | str | None = None):
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        channels: int = CHANNELS,
+        device: int | str | None = None,
+        max_duration: float = DEFAULT_MAX_DURATION,
+        warm_stream: bool = False,
+        preroll_ms: int = DEFAULT_PREROLL_MS,
+        stream_factory=None,
+    ):
         self.sample_rate = sample_rate
         self.channels = channels
         self.device = device
-        self._buffer: list[np.ndarray] = []
+        self.max_duration = max_duration
+        self.warm_stream = warm_stream
+        self.preroll_ms = preroll_ms
+        self._stream_factory = stream_factory or sd.InputStream
+        self._max_frames = int(max_duration * sample_rate)
+        self._buffer = self._allocate(min(int(INITIAL_BUFFER_SECONDS * sample_rate), self._max_frames))
+        self._write_pos = 0
+        self._handed_out = False
+        self._overflowed = False
         self._stream: sd.InputStream | None = None
         self._lock = threading.Lock()
         self._recording = False
 
+        # Pre-roll ring, only filled while a warm stream is idle
+        preroll_frames = int(preroll_ms * sample_rate / 1000) if warm_stream else 0
+        self._preroll = self._allocate(preroll_frames)
+        self._preroll_pos = 0
+        self._preroll_filled = 0
+
+        # Press-to-first-sample timing
+        self._press_time: float | None = None
+        self.start_latency: float | None = None
+
+    def _allocate(self, frames: int) -> np.ndarray:
+        """Allocate an uninitialized (frames, channels) float32 arena."""
+        return np.empty((frames, self.channels), dtype=np.float32)
+
+    def _reserve(self, frames: int) -> int:
+        """Ensure room for `frames` more samples; returns how many fit.
+
+        Must be called with self._lock held.
+        """
+        needed = self._write_pos + frames
+        capacity = len(self._buffer)
+        if needed > capacity and capacity < self._max_frames:
+            new_capacity = min(max(capacity * 2, needed), self._max_frames)
+            grown = self._allocate(new_capacity)
+            grown[:self._write_pos] = self._buffer[:self._write_pos]
+            self._buffer = grown
+        return min(frames, len(self._buffer) - self._write_pos)
+
+    def _write_preroll(self, indata: np.ndarray):
+        """Append a block to the pre-roll ring, overwriting the oldest audio.
+
+        Must be called with self._lock held.
+        """
+        size = len(self._preroll)
+        if size == 0:
+            return
+        block = indata[-size:]
+        n = len(block)
+        first = min(n, size - self._preroll_pos)
+        self._preroll[self._preroll_pos:self._preroll_pos + first] = block[:first]
+        self._preroll[:n - first] = block[first:]
+        self._preroll_pos = (self._preroll_pos + n) % size
+        self._preroll_filled = min(self._preroll_filled + n, size)
+
+    def _drain_preroll(self):
+        """Copy the pre-roll ring, oldest first, to the start of the arena.
+
+        Must be called with self._lock held.
+        """
+        n = self._preroll_filled
+        if n == 0:
+            return
+        start = (self._preroll_pos - n) % len(self._preroll)
+        first = min(n, len(self._preroll) - start)
+        n = self._reserve(n)
+        self._buffer[:first] = self._preroll[start:start + first]
+        self._buffer[first:n] = self._preroll[:n - first]
+        self._write_pos = n
+        self._preroll_filled = 0
+
     def _callback(self, indata: np.ndarray, frames: int, time_info, status):
         """Called by sounddevice for each audio chunk."""
         if status:
             log.warning("Audio callback status: %s", status)
         with self._lock:
-            if self._recording:
-                self._buffer.append(indata.copy())
-
-    def start(self):
-        """Start recording audio from the configured microphone device."""
-        with self._lock:
-            self._buffer.clear()
-            self._recording = True
+            if not self._recording:
+                self._write_preroll(indata)
+                return
+            if self._press_time is not None:
+                self.start_latency = time.perf_counter() - self._press_time
+                self._press_time = None
+            n = self._reserve(len(indata))
+            if n < len(indata) and not self._overflowed:
+                self._overflowed = True
+                log.warning("Recording exceeded %.0fs limit, dropping further audio.", self.max_duration)
+            self._buffer[self._write_pos:self._write_pos + n] = indata[:n]
+            self._write_pos += n
 
-        self._stream = sd.InputStream(
+    def _open_stream(self):
+        """Create and start the input stream if it isn't running yet."""
+        if self._stream is not None:
+            return
+        self._stream = self._stream_factory(
             samplerate=self.sample_rate,
             channels=self.channels,
             dtype=DTYPE,
@@ -79,28 +407,170 @@ class AudioRecorder:
             device=self.device,
         )
         self._stream.start()
+
+    def _close_stream(self):
+        """Stop and close the input stream if one is open."""
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def open(self):
+        """Open the warm stream ahead of the first press (no-op when cold)."""
+        if self.warm_stream:
+            self._open_stream()
+            log.info("Warm input stream opened (pre-roll %d ms).", self.preroll_ms)
+
+    def close(self):
+        """Close the input stream, including a warm one."""
+        with self._lock:
+            self._recording = False
+        self._close_stream()
+
+    def start(self):
+        """Start recording audio from the configured microphone device."""
+        with self._lock:
+            if self._handed_out:
+                # A view of the old arena may still be in use downstream
+                self._buffer = self._allocate(len(self._buffer))
+                self._handed_out = False
+            self._write_pos = 0
+            self._overflowed = False
+            self._drain_preroll()
+            self._press_time = time.perf_counter()
+            self.start_latency = None
+            self._recording = True
+
+        self._open_stream()
         log.info("Recording started (device=%s).", self.device if self.device is not None else "default")
 
     def stop(self):
-        """Stop recording and close the audio stream."""
+        """Stop recording; the stream is closed unless it is warm."""
         with self._lock:
             self._recording = False
+            self._press_time = None
 
-        if self._stream is not None:
-            self._stream.stop()
-            self._stream.close()
-            self._stream = None
-        log.info("Recording stopped.")
+        if not self.warm_stream:
+            self._close_stream()
+        if self.start_latency is not None:
+            log.info("Recording stopped (press-to-first-sample %.1f ms).", self.start_latency * 1000)
+        else:
+            log.info("Recording stopped.")
 
     def get_audio(self) -> np.ndarray:
         """Return recorded audio as a 1-D float32 numpy array.
 
+        The result is a zero-copy view into the recorder's arena. It stays
+        valid after the next start(), which moves recording to a fresh arena.
+
         Returns:
             Audio samples as float32 numpy array (16kHz mono).
             Empty array if nothing was recorded.
         """
         with self._lock:
-            if not self._buffer:
+            if self._write_pos == 0:
                 return np.array([], dtype=np.float32)
-            audio = np.concatenate(self._buffer, axis=0).flatten()
-        return audio
+            self._handed_out = True
+            return self._buffer[:self._write_pos].reshape(-1)
+
+
+class MicrophoneSource:
+    """Long-lived microphone capture that yields fixed-size blocks.
+
+    Used by hands-free mode: the stream stays open and blocks are handed
+    to the consumer through a queue, so the sounddevice callback never
+    waits on VAD or transcription.
+
+    Args:
+        device: Input device index or name (None for the default)
+        sample_rate: Capture sample rate
+        block_ms: Block size in milliseconds
+        stream_factory: Defaults to ``sd.InputStream``; tests can pass a fake
+    """
+
+    def __init__(
+        self,
+        device: int | str | None = None,
+        sample_rate: int = SAMPLE_RATE,
+        block_ms: int = VAD_FRAME_MS,
+        stream_factory=None,
+    ):
+        self.device = device
+        self.sample_rate = sample_rate
+        self.block_ms = block_ms
+        self._stream_factory = stream_factory or sd.InputStream
+        self._blocks: queue.Queue[np.ndarray | None] = queue.Queue()
+        self._stream = None
+
+    def _callback(self, indata: np.ndarray, frames: int, time_info, status):
+        if status:
+            log.warning("Audio callback status: %s", status)
+        self._blocks.put(indata[:, 0].copy())
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        """Open the stream and yield 1-D float32 blocks until close()."""
+        self._stream = self._stream_factory(
+            samplerate=self.sample_rate,
+            channels=CHANNELS,
+            dtype=DTYPE,
+            blocksize=int(self.sample_rate * self.block_ms / 1000),
+            callback=self._callback,
+            device=self.device,
+        )
+        self._stream.start()
+        log.info("Continuous capture started (device=%s).", self.device if self.device is not None else "default")
+        while True:
+            block = self._blocks.get()
+            if block is None:
+                return
+            yield block
+
+    def close(self):
+        """Stop the stream and end the blocks() iterator."""
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+        self._blocks.put(None)
+
+
+class WavFileSource:
+    """Replays WAV files as if they were microphone input.
+
+    Drop-in replacement for MicrophoneSource in tests and benchmarks.
+
+    Args:
+        paths: WAV files to play back-to-back
+        sample_rate: Rate to resample to
+        block_ms: Block size in milliseconds
+        realtime: Sleep between blocks to mimic a live microphone
+    """
+
+    def __init__(
+        self,
+        paths: list[str],
+        sample_rate: int = SAMPLE_RATE,
+        block_ms: int = VAD_FRAME_MS,
+        realtime: bool = False,
+    ):
+        self.paths = list(paths)
+        self.sample_rate = sample_rate
+        self.block_ms = block_ms
+        self.realtime = realtime
+        self._closed = threading.Event()
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        """Yield 1-D float32 blocks from each file in turn."""
+        block = int(self.sample_rate * self.block_ms / 1000)
+        for path in self.paths:
+            audio = load_wav(path, self.sample_rate)
+            for start in range(0, audio.size, block):
+                if self._closed.is_set():
+                    return
+                yield audio[start:start + block]
+                if self.realtime:
+                    self._closed.wait(self.block_ms / 1000)
+
+    def close(self):
+        """Stop playback."""
+        self._closed.set()
@@ -0,0 +1,165 @@
+"""Automatic device, compute type and model selection.
+
+With ``device = "auto"`` (or ``compute_type = "auto"``) in the [model]
+config, STVC probes for CUDA on first start and falls back to an int8
+CPU profile, sizing ``cpu_threads`` to the physical core count. On CPU
+a short calibration decode picks the largest model that meets
+``latency_target`` and records its real-time factor (``decode_rtf``)
+for the decode guard's time budget; only models already stored locally are tried, so
+calibration never downloads. The result is written back to config.toml so later
+startups skip the probing; set ``device = "auto"`` again to recalibrate.
+"""
+
+import logging
+import os
+import time
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# Largest to smallest; calibration walks down until one is fast enough
+CPU_MODEL_LADDER = ["large-v3-turbo", "medium", "small", "base", "tiny"]
+
+# English-only checkpoints are smaller-vocabulary and a little faster
+ENGLISH_VARIANTS = {"medium", "small", "base", "tiny"}
+
+CALIBRATION_SECONDS = 5.0
+
+
+def cuda_available() -> bool:
+    """Return True if CTranslate2 can see a CUDA device."""
+    try:
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count() > 0
+    except Exception as e:
+        log.debug(f"CUDA probe failed: {e}")
+        return False
+
+
+def physical_cores() -> int:
+    """Physical core count, falling back to logical cores."""
+    try:
+        import psutil
+        cores = psutil.cpu_count(logical=False)
+        if cores:
+            return cores
+    except ImportError:
+        pass
+    return os.cpu_count() or 1
+
+
+def cpu_compute_type() -> str:
+    """Best quantized compute type the CPU build of CTranslate2 supports."""
+    try:
+        import ctranslate2
+        supported = ctranslate2.get_supported_compute_types("cpu")
+    except Exception:
+        return "int8"
+    for compute_type in ("int8", "int8_float32", "float32"):
+        if compute_type in supported:
+            return compute_type
+    return "float32"
+
+
+def resolve_device(device: str, compute_type: str) -> tuple[str, str]:
+    """Resolve "auto" device/compute type to concrete values.
+
+    Returns:
+        (device, compute_type) — ("cuda", "float16") when a GPU is
+        available, otherwise ("cpu", int8-ish).
+    """
+    if device == "auto":
+        device = "cuda" if cuda_available() else "cpu"
+    if compute_type == "auto":
+        compute_type = "float16" if device == "cuda" else cpu_compute_type()
+    return device, compute_type
+
+
+def _model_for_language(name: str, language: str) -> str:
+    if language == "en" and name in ENGLISH_VARIANTS:
+        return f"{name}.en"
+    return name
+
+
+def measure_decode_latency(model, language: str, beam_size: int) -> float:
+    """Time one decode of a calibration clip on a loaded WhisperModel.
+
+    Whisper pads every window to 30s, so encoder cost doesn't depend on
+    clip content; a quiet clip measures the fixed per-utterance floor.
+    """
+    clip = np.zeros(int(CALIBRATION_SECONDS * 16000), dtype=np.float32)
+    start = time.perf_counter()
+    segments, _ = model.transcribe(clip, beam_size=beam_size, language=language, vad_filter=False)
+    for _ in segments:
+        pass
+    return time.perf_counter() - start
+
+
+def calibrate(model_cfg: dict, language: str = "en") -> tuple[dict, object | None, bool]:
+    """Pick device, compute type, threads and (on CPU) model size.
+
+    Args:
+        model_cfg: The [model] config section
+        language: Transcription language
+
+    Returns:
+        (settings, model, calibrated) — concrete [model] settings, the
+        chosen model if calibration loaded it (None otherwise), ready to
+        hand to the Transcriber, and whether the settings are final. On
+        CPU with no model stored locally nothing could be measured; the
+        settings are then only good for this run and shouldn't be saved.
+    """
+    from stvc.models import load_whisper_model, model_available
+
+    device, compute_type = resolve_device(
+        model_cfg.get("device", "auto"), model_cfg.get("compute_type", "auto"),
+    )
+    name = model_cfg.get("name", "large-v3-turbo")
+    settings = {"device": device, "compute_type": compute_type, "name": name}
+
+    if device == "cuda":
+        log.info("Autotune: CUDA available, using %s (%s).", name, compute_type)
+        return settings, None, True
+
+    cpu_threads = int(model_cfg.get("cpu_threads", 0)) or physical_cores()
+    settings["cpu_threads"] = cpu_threads
+    settings["num_workers"] = 1
+
+    target = float(model_cfg.get("latency_target", 1.5))
+    beam_size = int(model_cfg.get("beam_size", 5))
+    ladder = CPU_MODEL_LADDER[CPU_MODEL_LADDER.index(name):] if name in CPU_MODEL_LADDER else [name]
+
+    chosen = None
+    calibrated = False
+    for candidate in ladder:
+        candidate = _model_for_language(candidate, language)
+        if not model_available(candidate):
+            log.info("Autotune: %s is not stored locally, skipping it.", candidate)
+            continue
+        # Release the previous candidate before loading the next one
+        chosen = None
+        try:
+            model = load_whisper_model(candidate, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads)
+            latency = measure_decode_latency(model, language, beam_size)
+        except Exception as e:
+            log.warning(f"Autotune: could not calibrate {candidate}: {e}")
+            model = None
+            continue
+        log.info("Autotune: %s on CPU (%s, %d threads) took %.2fs.", candidate, compute_type, cpu_threads, latency)
+        settings["name"] = candidate
+        settings["decode_rtf"] = round(latency / CALIBRATION_SECONDS, 3)
+        chosen, model = model, None
+        calibrated = True
+        if latency <= target:
+            break
+    else:
+        if not calibrated:
+            log.warning(
+                "Autotune: no model on the ladder is stored locally, keeping %s. "
+                "Run 'python -m stvc.models download <name>' to store one.", settings["name"],
+            )
+        else:
+            log.warning("Autotune: no model met the %.1fs target, using %s.", target, settings["name"])
+
+    return settings, chosen, calibrated
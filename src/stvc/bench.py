@@ -0,0 +1,485 @@
+"""Latency benchmarks for STVC.
+
+Usage:
+    python -m stvc.bench streaming clip.wav [--step 1.0]
+    python -m stvc.bench vad clip.wav [--backend energy|silero]
+    python -m stvc.bench handsfree session.wav [--realtime]
+    python -m stvc.bench longform speech.wav [--minutes 1 5 15]
+    python -m stvc.bench segments long.wav [--fake 8 --delay 0.3]
+    python -m stvc.bench context src/*.py [--repeat 10]
+    python -m stvc.bench terms src/*.py [--repeat 20]
+    python -m stvc.bench sampling src/*.py [--mb 1 4 16 64]
+    python -m stvc.bench ranking src/*.py [--show 10]
+    python -m stvc.bench symbols src/*.py [--kb 50]
+"""
+
+import argparse
+import functools
+import logging
+import time
+
+import numpy as np
+
+from stvc.audio import SAMPLE_RATE, WavFileSource, load_wav, trim_silence
+from stvc.autotune import resolve_device
+from stvc.config import load_config, load_dictionary
+from stvc.transcriber import Transcriber
+
+log = logging.getLogger(__name__)
+
+
+def _make_transcriber(config: dict) -> Transcriber:
+    """Build a warmed-up Transcriber from the user's config."""
+    model_cfg = config.get("model", {})
+    device, compute_type = resolve_device(
+        model_cfg.get("device", "auto"), model_cfg.get("compute_type", "auto"),
+    )
+    transcriber = Transcriber(
+        model_name=model_cfg.get("name", "large-v3-turbo"),
+        device=device,
+        compute_type=compute_type,
+        beam_size=model_cfg.get("beam_size", 5),
+        language=config.get("general", {}).get("language", "en"),
+        initial_prompt=load_dictionary(config.get("dictionary", {}).get("path")),
+        cpu_threads=int(model_cfg.get("cpu_threads", 0)),
+        num_workers=int(model_cfg.get("num_workers", 1)),
+    )
+    transcriber.warmup()
+    return transcriber
+
+
+def bench_streaming(args):
+    """Release-to-text latency: batch vs streaming, per WAV file."""
+    from stvc.streaming import measure_release_latency
+
+    transcriber = _make_transcriber(load_config())
+    for path in args.files:
+        audio = load_wav(path)
+        result = measure_release_latency(transcriber, audio, step=args.step)
+        print(
+            f"{path}: {result['duration']:.1f}s audio | "
+            f"batch {result['batch_latency'] * 1000:.0f} ms | "
+            f"streaming {result['streaming_latency'] * 1000:.0f} ms "
+            f"({result['tail_seconds']:.1f}s tail, {result['partial_decodes']} partial decodes)"
+        )
+        if result["batch_text"] != result["streaming_text"]:
+            print(f"  batch:     {result['batch_text']}")
+            print(f"  streaming: {result['streaming_text']}")
+
+
+def bench_vad(args):
+    """Audio trimmed by client-side VAD and the decode time it saves."""
+    transcriber = _make_transcriber(load_config())
+    for path in args.files:
+        audio = load_wav(path)
+
+        t0 = time.perf_counter()
+        vad = trim_silence(audio, backend=args.backend)
+        vad_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        full_text = transcriber.transcribe(audio)
+        full_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        trimmed_text = transcriber.transcribe(vad.audio, speech_timestamps=vad.speech_timestamps)
+        trimmed_time = time.perf_counter() - t0
+
+        print(
+            f"{path}: trimmed {vad.trimmed_seconds:.2f}s of {audio.size / SAMPLE_RATE:.2f}s "
+            f"(VAD {vad_time * 1000:.1f} ms) | decode {full_time * 1000:.0f} ms -> "
+            f"{trimmed_time * 1000:.0f} ms, saved {(full_time - trimmed_time - vad_time) * 1000:.0f} ms"
+        )
+        if full_text != trimmed_text:
+            print(f"  untrimmed: {full_text}")
+            print(f"  trimmed:   {trimmed_text}")
+
+
+def bench_handsfree(args):
+    """Replay recordings through hands-free segmentation and report real-time factor."""
+    from stvc.handsfree import HandsFreeDictation
+
+    transcriber = _make_transcriber(load_config())
+
+    def on_segment(segment):
+        print(f"  [{segment.size / SAMPLE_RATE:5.2f}s] {transcriber.transcribe(segment)}")
+
+    dictation = HandsFreeDictation(WavFileSource(args.files, realtime=args.realtime), on_segment)
+    t0 = time.perf_counter()
+    dictation.start()
+    dictation.wait()
+    wall = time.perf_counter() - t0
+    print(
+        f"{dictation.segment_count} segments, {dictation.speech_seconds:.1f}s speech of "
+        f"{dictation.captured_seconds:.1f}s audio in {wall:.1f}s wall | RTF {dictation.real_time_factor:.2f}"
+    )
+
+
+def bench_longform(args):
+    """Wall-clock time of sequential vs chunked, batched decoding on long clips."""
+    from stvc.longform import LongFormTranscriber
+
+    transcriber = _make_transcriber(load_config())
+    longform = LongFormTranscriber(transcriber, batch_size=args.batch_size)
+    source = np.concatenate([load_wav(path) for path in args.files])
+
+    for minutes in args.minutes:
+        # Tile the source recordings up to the requested length
+        samples = int(minutes * 60 * SAMPLE_RATE)
+        audio = np.resize(source, samples)
+
+        t0 = time.perf_counter()
+        transcriber.transcribe(audio)
+        sequential = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        longform.transcribe(audio)
+        parallel = time.perf_counter() - t0
+
+        print(
+            f"{minutes:g} min: sequential {sequential:.1f}s | chunked ({transcriber.device}, batch {args.batch_size}) "
+            f"{parallel:.1f}s | speedup {sequential / parallel:.2f}x"
+        )
+
+
+def bench_segments(args):
+    """Time to first injected character: join-then-inject vs per-segment injection."""
+    from stvc.fakes import FakeInjector, FakeWhisperModel
+    from stvc.postprocess import SegmentJoiner, process
+
+    if args.fake:
+        transcriber = Transcriber(model_name="fake")
+        transcriber.use_model(FakeWhisperModel(
+            [f"This is segment number {i + 1}." for i in range(args.fake)], delay=args.delay,
+        ))
+        clips = [("fake", np.zeros(int(args.fake * 5 * SAMPLE_RATE), dtype=np.float32))]
+    else:
+        transcriber = _make_transcriber(load_config())
+        clips = [(path, load_wav(path)) for path in args.files]
+
+    for name, audio in clips:
+        injector = FakeInjector()
+        t0 = time.perf_counter()
+        injector(process(transcriber.transcribe(audio)))
+        batch_first = injector.first_at - t0
+        batch_text = injector.text
+
+        injector = FakeInjector()
+        joiner = SegmentJoiner()
+        t0 = time.perf_counter()
+        for segment in transcriber.transcribe_iter(audio):
+            text = joiner.feed(segment)
+            if text:
+                injector(text)
+        total = time.perf_counter() - t0
+        first = injector.first_at - t0 if injector.first_at is not None else total
+
+        print(
+            f"{name}: {audio.size / SAMPLE_RATE:.1f}s audio | first character: "
+            f"batch {batch_first * 1000:.0f} ms, per-segment {first * 1000:.0f} ms "
+            f"({len(injector.calls)} injections, {total * 1000:.0f} ms total)"
+        )
+        if injector.text != batch_text:
+            print(f"  batch:       {batch_text}")
+            print(f"  per-segment: {injector.text}")
+
+
+def bench_context(args):
+    """Per-file term extraction: cold (read + scan) vs warm (cache hit)."""
+    from stvc.context.extractors import FileBasedExtractor
+    from stvc.context.term_cache import TermCache
+
+    cache = TermCache()
+    extractor = FileBasedExtractor(cache=cache)
+    for path in args.files:
+        cold = []
+        for _ in range(args.repeat):
+            cache.clear()
+            t0 = time.perf_counter()
+            terms = extractor.terms_for_path(path)
+            cold.append(time.perf_counter() - t0)
+
+        warm = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            extractor.terms_for_path(path)
+            warm.append(time.perf_counter() - t0)
+
+        print(
+            f"{path}: {len(terms)} terms | cold {np.median(cold) * 1e6:.0f} us | "
+            f"warm {np.median(warm) * 1e6:.1f} us"
+        )
+    print(f"cache: {cache.stats()}")
+
+
+def bench_terms(args):
+    """Single-pass extract_terms vs the original six-regex version, with a golden check.
+
+    Compares frequency ranking, which is what the original implemented.
+    """
+    from stvc.context.term_parser import extract_terms
+    from stvc.fakes import reference_extract_terms
+
+    mismatches = 0
+    for path in args.files:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            text = f.read(args.max_bytes)
+
+        single_pass = functools.partial(extract_terms, ranking="frequency")
+        expected = reference_extract_terms(text)
+        if single_pass(text) != expected:
+            mismatches += 1
+            print(f"{path}: MISMATCH")
+            print(f"  reference: {expected[:10]}")
+            print(f"  current:   {single_pass(text)[:10]}")
+            continue
+
+        timings = {}
+        for name, fn in (("reference", reference_extract_terms), ("single-pass", single_pass)):
+            samples = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                fn(text)
+                samples.append(time.perf_counter() - t0)
+            timings[name] = np.median(samples)
+        print(
+            f"{path}: {len(text) / 1024:.0f} KB | reference {timings['reference'] * 1000:.2f} ms | "
+            f"single-pass {timings['single-pass'] * 1000:.2f} ms | "
+            f"{timings['reference'] / timings['single-pass']:.1f}x"
+        )
+    print(f"{len(args.files) - mismatches}/{len(args.files)} files match the reference ranking.")
+    if mismatches:
+        raise SystemExit(1)
+
+
+def bench_sampling(args):
+    """File sampling on sources tiled to several MB: time and peak memory per size."""
+    import os
+    import tempfile
+    import tracemalloc
+    from pathlib import Path
+
+    from stvc.context.extractors import sample_file
+    from stvc.context.term_parser import extract_terms
+
+    source = b""
+    for path in args.files:
+        with open(path, "rb") as f:
+            source += f.read() + b"\n"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mb in args.mb:
+            path = os.path.join(tmp, f"tiled-{mb}mb.py")
+            size = int(mb * 1024 * 1024)
+            with open(path, "wb") as f:
+                f.write((source * (size // len(source) + 1))[:size])
+
+            rows = {}
+            for name, read in (
+                ("sampled", lambda: sample_file(path, args.max_bytes)),
+                ("whole", lambda: Path(path).read_text(encoding="utf-8", errors="ignore")),
+            ):
+                samples = []
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    extract_terms(read())
+                    samples.append(time.perf_counter() - t0)
+                tracemalloc.start()
+                extract_terms(read())
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                rows[name] = (np.median(samples), peak)
+            print(
+                f"{mb:g} MB: sampled {rows['sampled'][0] * 1000:.1f} ms, {rows['sampled'][1] / 1024:.0f} KB peak | "
+                f"whole file {rows['whole'][0] * 1000:.1f} ms, {rows['whole'][1] / 1024:.0f} KB peak"
+            )
+
+
+def bench_ranking(args):
+    """Prompts built from frequency vs TF-IDF ranked terms, side by side.
+
+    For each file reports the context terms that made it into the prompt
+    under each ranking, their mean corpus IDF (higher = more specific),
+    how many are names the file itself defines, and the terms that only
+    one ranking kept.
+    """
+    import re
+
+    from stvc.context.idf import get_idf_table
+    from stvc.context.merger import build_prompt, prepare_base_terms
+    from stvc.context.term_parser import extract_terms
+
+    table = get_idf_table()
+    if table is None:
+        raise SystemExit("No IDF table available.")
+    base = prepare_base_terms(load_dictionary(args.dictionary) if args.dictionary else "")
+    definition = re.compile(r'\b(?:def|class|function|func|fn|struct|interface|enum|trait|type)\s+([A-Za-z_]\w*)')
+
+    totals = {"frequency": [0, 0.0, 0], "tfidf": [0, 0.0, 0]}
+    for path in args.files:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            text = f.read(args.max_bytes)
+        defined = {name.lower() for name in definition.findall(text)}
+
+        kept = {}
+        for ranking in totals:
+            terms = extract_terms(text, ranking=ranking)
+            in_prompt = set(build_prompt(base, terms).split(", "))
+            kept[ranking] = [term for term in terms if term in in_prompt]
+            total = totals[ranking]
+            total[0] += len(kept[ranking])
+            total[1] += sum(table.weight(term) for term in kept[ranking])
+            total[2] += sum(term.lower() in defined for term in kept[ranking])
+
+        print(f"{path}:")
+        for ranking, terms in kept.items():
+            mean_idf = sum(table.weight(term) for term in terms) / max(len(terms), 1)
+            n_defined = sum(term.lower() in defined for term in terms)
+            print(f"  {ranking:9} {len(terms):3} terms, mean IDF {mean_idf:.2f}, {n_defined} defined here")
+        print(f"  frequency only: {[t for t in kept['frequency'] if t not in kept['tfidf']][:args.show]}")
+        print(f"  tfidf only:     {[t for t in kept['tfidf'] if t not in kept['frequency']][:args.show]}")
+
+    for ranking, (count, idf_sum, n_defined) in totals.items():
+        print(
+            f"{ranking:9}: {count} prompt terms over {len(args.files)} files, "
+            f"mean IDF {idf_sum / max(count, 1):.2f}, {n_defined} defined in their file"
+        )
+
+
+def bench_symbols(args):
+    """Symbol extraction vs the generic regex terms, on whole files and on samples.
+
+    Each file is tiled to --kb in whole copies, which lexes like the
+    original, and to 8x --kb on disk and read back through sample_file()
+    like FileBasedExtractor reads large files, whose pieces are cut
+    mid-literal and have to be resynced.
+    """
+    import os
+    import tempfile
+
+    from stvc.context.extractors import sample_file
+    from stvc.context.symbols import PIECE_SEPARATOR, extract_symbols, lexer_for
+    from stvc.context.term_parser import extract_terms
+
+    totals = {"regex": 0.0, "symbols": 0.0}
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in args.files:
+            with open(path, encoding="utf-8", errors="ignore") as f:
+                source = f.read()
+            if not source:
+                continue
+            # Whole copies of the file, so the tiled text still lexes
+            text = source.rstrip("\n") + "\n"
+            tiled = text * max(args.kb * 1024 // len(text), 1)
+            large = os.path.join(tmp, os.path.basename(path))
+            with open(large, "w", encoding="utf-8") as f:
+                f.write(text * max(8 * args.kb * 1024 // len(text), 1))
+            sampled = sample_file(large, args.kb * 1024)
+
+            lexer = lexer_for(path)
+            for kind, content in (("tiled", tiled), ("sampled", sampled)):
+                status = "no lexer"
+                if lexer is not None:
+                    pieces = content.split(PIECE_SEPARATOR)
+                    whole = 0
+                    for piece in pieces:
+                        try:
+                            lexer.symbols(piece)
+                            whole += 1
+                        except SyntaxError:
+                            pass
+                    status = f"{whole}/{len(pieces)} pieces lex whole"
+
+                timings = {}
+                for name, fn in (("regex", extract_terms), ("symbols", lambda t: extract_symbols(t, path))):
+                    samples = []
+                    for _ in range(args.repeat):
+                        t0 = time.perf_counter()
+                        terms = fn(content)
+                        samples.append(time.perf_counter() - t0)
+                    timings[name] = np.median(samples)
+                    totals[name] += timings[name]
+                    if args.show:
+                        print(f"  {kind} {name:7} {terms[:args.show]}")
+                print(
+                    f"{path} ({kind}): {len(content) / 1024:.0f} KB, {status} | "
+                    f"regex {timings['regex'] * 1000:.2f} ms | symbols {timings['symbols'] * 1000:.2f} ms | "
+                    f"{timings['regex'] / timings['symbols']:.1f}x"
+                )
+    print(
+        f"total: regex {totals['regex'] * 1000:.1f} ms, symbols {totals['symbols'] * 1000:.1f} ms "
+        f"({totals['regex'] / max(totals['symbols'], 1e-9):.1f}x)"
+    )
+
+
+def main(argv=None):
+    """Entry point for `python -m stvc.bench`."""
+    parser = argparse.ArgumentParser(prog="python -m stvc.bench", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("streaming", help="release-to-text latency, batch vs streaming")
+    p.add_argument("files", nargs="+", help="16kHz WAV recordings")
+    p.add_argument("--step", type=float, default=1.0, help="seconds between partial decodes")
+    p.set_defaults(func=bench_streaming)
+
+    p = sub.add_parser("vad", help="client-side VAD trimming vs model VAD")
+    p.add_argument("files", nargs="+", help="16kHz WAV recordings")
+    p.add_argument("--backend", choices=("energy", "silero"), default="energy")
+    p.set_defaults(func=bench_vad)
+
+    p = sub.add_parser("handsfree", help="hands-free segmentation and real-time factor")
+    p.add_argument("files", nargs="+", help="WAV recordings played back-to-back")
+    p.add_argument("--realtime", action="store_true", help="pace playback like a live microphone")
+    p.set_defaults(func=bench_handsfree)
+
+    p = sub.add_parser("longform", help="sequential vs chunked, batched decoding on long clips")
+    p.add_argument("files", nargs="+", help="speech WAV recordings, tiled to each length")
+    p.add_argument("--minutes", type=float, nargs="+", default=[1, 5, 15])
+    p.add_argument("--batch-size", type=int, default=8)
+    p.set_defaults(func=bench_longform)
+
+    p = sub.add_parser("segments", help="time to first character, batch vs per-segment injection")
+    p.add_argument("files", nargs="*", help="16kHz WAV recordings")
+    p.add_argument("--fake", type=int, metavar="N", help="use a fake model producing N segments instead")
+    p.add_argument("--delay", type=float, default=0.3, help="fake decode time per segment")
+    p.set_defaults(func=bench_segments)
+
+    p = sub.add_parser("context", help="per-file term extraction, cold vs cached")
+    p.add_argument("files", nargs="+", help="source files to scan")
+    p.add_argument("--repeat", type=int, default=10)
+    p.set_defaults(func=bench_context)
+
+    p = sub.add_parser("terms", help="term extraction speed, checked against the original ranking")
+    p.add_argument("files", nargs="+", help="source or scrollback text files")
+    p.add_argument("--repeat", type=int, default=20)
+    p.add_argument("--max-bytes", type=int, default=50000)
+    p.set_defaults(func=bench_terms)
+
+    p = sub.add_parser("sampling", help="file sampling time and memory as files grow")
+    p.add_argument("files", nargs="+", help="source files, tiled to each size")
+    p.add_argument("--mb", type=float, nargs="+", default=[1, 4, 16, 64])
+    p.add_argument("--max-bytes", type=int, default=50000)
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=bench_sampling)
+
+    p = sub.add_parser("ranking", help="prompts from frequency vs TF-IDF term ranking")
+    p.add_argument("files", nargs="+", help="source files to build prompts for")
+    p.add_argument("--dictionary", help="base dictionary to merge with (default: none, whole budget to context)")
+    p.add_argument("--show", type=int, default=10, help="differing terms listed per file")
+    p.add_argument("--max-bytes", type=int, default=50000)
+    p.set_defaults(func=bench_ranking)
+
+    p = sub.add_parser("symbols", help="language-aware symbol extraction vs generic regex terms")
+    p.add_argument("files", nargs="+", help="source files, each repeated up to --kb and sampled from 8x --kb")
+    p.add_argument("--kb", type=int, default=50)
+    p.add_argument("--repeat", type=int, default=20)
+    p.add_argument("--show", type=int, default=0, help="top terms to print per file and method")
+    p.set_defaults(func=bench_symbols)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,8 @@ except ImportError:
 STVC_DIR = Path(os.path.expanduser("~/.stvc"))
 CONFIG_PATH = STVC_DIR / "config.toml"
 DICTIONARY_PATH = STVC_DIR / "dictionary.json"
+MODELS_DIR = STVC_DIR / "models"
+INDEX_DIR = STVC_DIR / "index"
 
 DEFAULTS = {
     "general": {
@@ -28,12 +30,19 @@ DEFAULTS = {
     },
     "model": {
         "name": "large-v3-turbo",
-        "device": "cuda",
-        "compute_type": "float16",
+        "device": "auto",
+        "compute_type": "auto",
         "beam_size": 5,
+        "cpu_threads": 0,
+        "num_workers": 1,
+        "latency_target": 1.5,
+        "allow_download": False,
     },
     "audio": {
         "device": "",
+        "max_duration": 300.0,
+        "warm_stream": False,
+        "preroll_ms": 300,
     },
     "hotkey": {
         "push_to_talk": "ctrl+f13",
@@ -50,6 +59,56 @@ DEFAULTS = {
     },
     "context": {
         "enabled": True,
+        "prefetch_deadline_ms": 500,
+        "track_focus": True,
+        "focus_debounce_ms": 250,
+        "prompt_cache_size": 32,
+        "terminal_poll_s": 2.0,
+        "workspace_index": True,
+        "index_max_file_kb": 256,
+        "index_max_files": 5000,
+        "index_cpu_fraction": 0.25,
+        "ranking": "tfidf",
+    },
+    "vad": {
+        "enabled": True,
+        "backend": "energy",
+        "min_speech_ms": 250,
+        "min_silence_ms": 500,
+        "speech_pad_ms": 200,
+    },
+    "decode": {
+        "profile": "auto",
+        "short_duration": 3.0,
+        "long_duration": 20.0,
+    },
+    "guard": {
+        "enabled": True,
+        "tokens_per_second": 12.0,
+        "chars_per_second": 40.0,
+        "max_compression_ratio": 2.4,
+        "max_repeats": 3,
+        "time_budget_factor": 0.0,
+        "min_time_budget": 3.0,
+    },
+    "longform": {
+        "enabled": True,
+        "min_duration": 60.0,
+        "batch_size": 8,
+    },
+    "pipeline": {
+        "queue_size": 4,
+    },
+    "streaming": {
+        "enabled": False,
+        "step": 1.0,
+    },
+    "handsfree": {
+        "enabled": False,
+        "min_speech_ms": 300,
+        "min_silence_ms": 1000,
+        "speech_pad_ms": 300,
+        "max_segment_s": 30.0,
     },
 }
 
@@ -1,10 +1,20 @@
 """Content extraction strategies for different application types."""
 
+import collections
 import logging
+import mmap
+import os
 import re
+import threading
+import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
 
+from . import symbols, term_parser
+from .term_cache import TermCache, file_term_cache
+from .workspace_index import get_workspace_index
 from .window_detect import WindowInfo
 
 try:
@@ -15,6 +25,161 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# App types whose window title names the file being edited
+FILE_APP_TYPES = ("vscode", "notepadpp")
+
+# Terminal tail read per extraction, and how fast its terms fade
+TERMINAL_MAX_LINES = 200
+TERMINAL_HALF_LIFE_S = 300.0
+
+# Upper bound on characters fetched per terminal line
+MAX_LINE_CHARS = 512
+
+
+def init_com_thread() -> None:
+    """Initialize COM on the calling thread so UI Automation can be used from it."""
+    if not COMTYPES_AVAILABLE:
+        return
+    try:
+        import comtypes
+        comtypes.CoInitialize()
+    except Exception as e:
+        log.debug(f"CoInitialize failed on {threading.current_thread().name}: {e}")
+
+
+# Share of the sampling budget for the start and end of large files; the
+# rest goes to the regions with the most definitions
+HEAD_FRACTION = 0.2
+TAIL_FRACTION = 0.2
+
+# Bytes probed for definitions, as a multiple of the definition budget
+PROBE_FACTOR = 4
+
+# Lines that start a definition in common languages
+DEFINITION_PATTERN = re.compile(
+    rb'^[ \t]*(?:export[ \t]+)?(?:pub[ \t]+)?(?:async[ \t]+)?'
+    rb'(?:def|class|function|interface|struct|enum|trait|impl|fn|func|type)[ \t]',
+    re.MULTILINE,
+)
+
+
+def _whole_lines(chunk: bytes, at_start: bool, at_end: bool) -> bytes:
+    """Trim partial lines off the ends of a chunk cut from the middle of a file."""
+    if not at_start:
+        chunk = chunk[chunk.find(b"\n") + 1:]
+    if not at_end:
+        chunk = chunk[:chunk.rfind(b"\n") + 1]
+    return chunk
+
+
+def _whole_definitions(chunk: bytes, at_start: bool, at_end: bool) -> bytes:
+    """Trim a chunk cut from the middle of a file to start and end at definition lines.
+
+    A definition line is practically never inside a string literal, so
+    a piece between two of them lexes on its own where a piece cut at
+    an arbitrary line may start or end inside a docstring. Chunks with
+    fewer than two definition lines are trimmed to whole lines instead.
+    """
+    starts = [m.start() for m in DEFINITION_PATTERN.finditer(chunk, 0 if at_start else chunk.find(b"\n") + 1)]
+    lo = 0 if at_start else (starts[0] if starts else 0)
+    hi = len(chunk) if at_end else (starts[-1] if starts else 0)
+    if hi <= lo:
+        return _whole_lines(chunk, at_start, at_end)
+    return chunk[lo:hi]
+
+
+def sample_file(path: str | Path, max_bytes: int) -> str:
+    """Read up to about max_bytes of a file, favouring code over preamble.
+
+    Files within the budget are read whole. Larger ones are memory-mapped
+    and sampled: the head, the tail, and the windows with the most
+    class/def/function lines among evenly spaced probes of the middle.
+    Only the probed windows are touched and only the chosen ones are
+    decoded, so time and memory don't grow with file size. Pieces are
+    cut at definition lines where they can be, so symbol lexers see
+    whole definitions rather than half a docstring.
+
+    Args:
+        path: File to read
+        max_bytes: Sampling budget in bytes
+
+    Returns:
+        Decoded sample, pieces separated by symbols.PIECE_SEPARATOR
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= max_bytes:
+            return f.read().decode("utf-8", errors="ignore")
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            head_bytes = int(max_bytes * HEAD_FRACTION)
+            tail_bytes = int(max_bytes * TAIL_FRACTION)
+            budget = max_bytes - head_bytes - tail_bytes
+            lo, hi = head_bytes, size - tail_bytes
+
+            # Probe evenly spaced windows of the middle for definition density
+            window = max(budget // 8, 4096)
+            probes = max(min(PROBE_FACTOR * budget // window, (hi - lo) // window), 1)
+            step = (hi - lo) / probes
+            candidates = []
+            for i in range(probes):
+                start = lo + int(i * step)
+                end = min(start + window, hi)
+                density = len(DEFINITION_PATTERN.findall(mm, start, end))
+                candidates.append((density, start, end))
+
+            chosen = []
+            for density, start, end in sorted(candidates, key=lambda c: (-c[0], c[1])):
+                if budget < end - start:
+                    break
+                chosen.append((start, end))
+                budget -= end - start
+
+            pieces = [_whole_definitions(mm[:head_bytes], True, False)]
+            pieces += [_whole_definitions(mm[start:end], False, False) for start, end in sorted(chosen)]
+            pieces.append(_whole_definitions(mm[size - tail_bytes:], False, True))
+
+    return symbols.PIECE_SEPARATOR.join(piece.decode("utf-8", errors="ignore") for piece in pieces)
+
+
+def parse_file_path(title: str) -> str:
+    """Parse the path of the file being edited from an editor window title.
+
+    Handles common editor title formats:
+    - VS Code: "filename - folder - Visual Studio Code"
+    - Notepad++: "filename - Notepad++"
+    - Generic: looks for path-like strings
+
+    Args:
+        title: Window title text
+
+    Returns:
+        File path if found, empty string otherwise
+    """
+    if not title:
+        return ""
+
+    # VS Code format: "filename - folder - Visual Studio Code"
+    # Try to extract the full path by looking for drive letter patterns
+    # Pattern: C:\path\to\file.ext or similar
+    drive_pattern = r'[A-Za-z]:\\[^"<>|?*\n]+'
+    matches = re.findall(drive_pattern, title)
+    if matches:
+        # Return the longest match (most likely the full path)
+        return max(matches, key=len)
+
+    # Notepad++ format: "filename - Notepad++"
+    # Check if there's a path-like string before " - Notepad++"
+    if " - Notepad++" in title:
+        path_part = title.split(" - Notepad++")[0].strip()
+        if Path(path_part).exists():
+            return path_part
+
+    # VS Code might just show filename without path in title
+    # In this case, we can't reliably extract content
+    log.debug(f"Could not parse file path from title: {title}")
+    return ""
+
 
 class BaseExtractor(ABC):
     """Abstract base class for content extractors."""
@@ -31,6 +196,22 @@ class BaseExtractor(ABC):
         """
         pass
 
+    def extract_terms(self, window_info: WindowInfo, max_terms: int = 50) -> list[str]:
+        """Extract ranked context terms from the application window.
+
+        Args:
+            window_info: Information about the active window
+            max_terms: Maximum number of terms to return
+
+        Returns:
+            Terms as ranked by term_parser.extract_terms()
+        """
+        return term_parser.extract_terms(self.extract(window_info), max_terms=max_terms)
+
+    def stats(self) -> str:
+        """One-line summary of the extractor's own counters for logs, or "" if it keeps none."""
+        return ""
+
 
 class FileBasedExtractor(BaseExtractor):
     """Extractor for editors that display file paths in window title.
@@ -39,13 +220,15 @@ class FileBasedExtractor(BaseExtractor):
     the active file path in the window title bar.
     """
 
-    def __init__(self, max_bytes: int = 50000):
+    def __init__(self, max_bytes: int = 50000, cache: TermCache | None = None):
         """Initialize file-based extractor.
 
         Args:
-            max_bytes: Maximum bytes to read from file (default 50KB)
+            max_bytes: Sampling budget per file (default 50KB), see sample_file()
+            cache: Term cache to use (default: the shared file_term_cache)
         """
         self.max_bytes = max_bytes
+        self.cache = cache if cache is not None else file_term_cache
 
     def extract(self, window_info: WindowInfo) -> str:
         """Extract content by reading the file from disk.
@@ -56,10 +239,10 @@ class FileBasedExtractor(BaseExtractor):
             window_info: Window information with title containing file path
 
         Returns:
-            File content (up to max_bytes), or empty string on failure
+            File content (sampled down to max_bytes), or empty string on failure
         """
         try:
-            file_path = self._parse_file_path(window_info.title)
+            file_path = parse_file_path(window_info.title)
             if not file_path:
                 log.debug("No file path found in window title")
                 return ""
@@ -69,9 +252,8 @@ class FileBasedExtractor(BaseExtractor):
                 log.debug(f"File does not exist: {file_path}")
                 return ""
 
-            # Read up to max_bytes
-            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read(self.max_bytes)
+            # Head, tail and definition-dense regions, up to max_bytes
+            content = sample_file(path, self.max_bytes)
 
             log.debug(f"Extracted {len(content)} chars from {file_path}")
             return content
@@ -80,92 +262,161 @@ class FileBasedExtractor(BaseExtractor):
             log.debug(f"Failed to extract file content: {e}")
             return ""
 
-    def _parse_file_path(self, title: str) -> str:
-        """Parse file path from window title.
+    def extract_terms(self, window_info: WindowInfo, max_terms: int = 50) -> list[str]:
+        """Extract ranked terms from the file named in the window title, using the cache.
+
+        Args:
+            window_info: Window information with title containing file path
+            max_terms: Maximum number of terms taken from the file, and
+                again from the workspace index
 
-        Handles common editor title formats:
-        - VS Code: "filename - folder - Visual Studio Code"
-        - Notepad++: "filename - Notepad++"
-        - Generic: looks for path-like strings
+        Returns:
+            Ranked terms from the file, followed by the workspace's top
+            terms if a workspace index is registered; empty on failure
+        """
+        file_path = parse_file_path(window_info.title)
+        if not file_path:
+            log.debug("No file path found in window title")
+            return []
+        terms = self.terms_for_path(file_path, max_terms)
+
+        # Fill up with project-wide terms; rescans happen in the background
+        index = get_workspace_index()
+        if index is not None:
+            index.request(file_path)
+            terms = term_parser.dedupe_terms(terms + index.top_terms(file_path, max_terms), max_terms * 2)
+        return terms
+
+    def terms_for_path(self, file_path: str, max_terms: int = 50) -> list[str]:
+        """Ranked terms for a file, re-read only when its mtime or size changed.
 
         Args:
-            title: Window title text
+            file_path: Path of the file to scan
+            max_terms: Maximum number of terms to return
 
         Returns:
-            File path if found, empty string otherwise
+            Ranked terms, or an empty list if the file can't be read
         """
-        if not title:
-            return ""
+        try:
+            stat = Path(file_path).stat()
+        except OSError as e:
+            log.debug(f"File does not exist: {file_path} ({e})")
+            return []
 
-        # VS Code format: "filename - folder - Visual Studio Code"
-        # Try to extract the full path by looking for drive letter patterns
-        # Pattern: C:\path\to\file.ext or similar
-        drive_pattern = r'[A-Za-z]:\\[^"<>|?*\n]+'
-        matches = re.findall(drive_pattern, title)
-        if matches:
-            # Return the longest match (most likely the full path)
-            return max(matches, key=len)
-
-        # Notepad++ format: "filename - Notepad++"
-        # Check if there's a path-like string before " - Notepad++"
-        if " - Notepad++" in title:
-            path_part = title.split(" - Notepad++")[0].strip()
-            if Path(path_part).exists():
-                return path_part
-
-        # VS Code might just show filename without path in title
-        # In this case, we can't reliably extract content
-        log.debug(f"Could not parse file path from title: {title}")
-        return ""
+        key = (file_path, stat.st_mtime_ns, stat.st_size, max_terms)
+        terms = self.cache.get(key)
+        if terms is not None:
+            return terms
 
+        try:
+            content = sample_file(file_path, self.max_bytes)
+        except Exception as e:
+            log.debug(f"Failed to extract file content: {e}")
+            return []
 
-class TerminalExtractor(BaseExtractor):
-    """Extractor for terminal windows using UI Automation.
+        # Code symbols where a lexer knows the language, generic terms otherwise
+        terms = symbols.extract_symbols(content, file_path, max_terms=max_terms)
+        self.cache.put(key, terms)
+        log.debug(f"Extracted {len(terms)} terms from {file_path} ({self.cache.stats()})")
+        return terms
 
-    Uses Windows UI Automation to read visible text from terminal buffers.
-    Works with Windows Terminal, cmd, PowerShell, etc.
-    """
 
-    def extract(self, window_info: WindowInfo) -> str:
-        """Extract visible text from terminal using UI Automation.
+class TerminalTextProvider(ABC):
+    """Source of terminal text, so UI Automation can be swapped for a fake."""
+
+    @abstractmethod
+    def read_tail(self, hwnd: int, max_lines: int) -> str:
+        """Return (about) the last `max_lines` lines of the terminal's buffer.
 
         Args:
-            window_info: Window information with terminal hwnd
+            hwnd: Terminal window handle
+            max_lines: Number of lines to read from the end of the buffer
 
         Returns:
-            Visible terminal text, or empty string on failure
+            Buffer tail, or empty string on failure
         """
+        pass
+
+    def stats(self) -> str:
+        """One-line summary for logs, or "" if the provider keeps no counters."""
+        return ""
+
+
+class UIATextProvider(TerminalTextProvider):
+    """Reads terminal text through Windows UI Automation.
+
+    Only a range covering the last lines of the buffer is fetched, never
+    the whole scrollback, which can be megabytes in Windows Terminal.
+
+    Creating the IUIAutomation object is expensive, so one is created
+    lazily per thread and reused; COM objects from an apartment-threaded
+    thread must not be used on another one.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self.clients_created = 0
+        self.client_create_ms = 0.0
+
+    def _automation(self):
+        """This thread's IUIAutomation client, created on first use."""
+        automation = getattr(self._local, "automation", None)
+        if automation is None:
+            from comtypes.gen import UIAutomationClient as uia
+
+            start = time.perf_counter()
+            init_com_thread()
+            automation = comtypes.client.CreateObject(
+                "{ff48dba4-60ef-4201-aa87-54103eef594e}",
+                interface=uia.IUIAutomation
+            )
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._local.automation = automation
+            self.clients_created += 1
+            self.client_create_ms += elapsed_ms
+            log.debug(f"Created UI Automation client on {threading.current_thread().name} in {elapsed_ms:.1f} ms")
+        return automation
+
+    def stats(self) -> str:
+        return f"{self.clients_created} UI Automation clients created in {self.client_create_ms:.0f} ms"
+
+    def read_tail(self, hwnd: int, max_lines: int) -> str:
         if not COMTYPES_AVAILABLE:
             log.debug("comtypes not available, cannot extract terminal content")
             return ""
 
         try:
-            # Initialize UI Automation
-            from comtypes.gen import UIAutomationClient
+            from comtypes.gen import UIAutomationClient as uia
 
-            automation = comtypes.client.CreateObject(
-                "{ff48dba4-60ef-4201-aa87-54103eef594e}",
-                interface=UIAutomationClient.IUIAutomation
-            )
+            automation = self._automation()
 
             # Get element from window handle
-            element = automation.ElementFromHandle(window_info.hwnd)
+            element = automation.ElementFromHandle(hwnd)
             if not element:
                 log.debug("Could not get UI element from window handle")
                 return ""
 
             # Try to get text pattern
             try:
-                text_pattern = element.GetCurrentPattern(UIAutomationClient.UIA_TextPatternId)
-                text_range = text_pattern.DocumentRange
-                text = text_range.GetText(-1)  # -1 means get all text
+                text_pattern = element.GetCurrentPattern(uia.UIA_TextPatternId).QueryInterface(
+                    uia.IUIAutomationTextPattern
+                )
+                document = text_pattern.DocumentRange
+                # Collapse a copy of the document range to its end, then
+                # extend it back over the last max_lines lines
+                tail = document.Clone()
+                tail.MoveEndpointByRange(uia.TextPatternRangeEndpoint_Start, document, uia.TextPatternRangeEndpoint_End)
+                tail.MoveEndpointByUnit(uia.TextPatternRangeEndpoint_Start, uia.TextUnit_Line, -max_lines)
+                text = tail.GetText(max_lines * MAX_LINE_CHARS)
                 log.debug(f"Extracted {len(text)} chars from terminal")
                 return text
             except Exception:
                 # Text pattern not available, try Value pattern
                 try:
-                    value_pattern = element.GetCurrentPattern(UIAutomationClient.UIA_ValuePatternId)
-                    text = value_pattern.CurrentValue
+                    value_pattern = element.GetCurrentPattern(uia.UIA_ValuePatternId).QueryInterface(
+                        uia.IUIAutomationValuePattern
+                    )
+                    text = "\n".join(value_pattern.CurrentValue.splitlines()[-max_lines:])
                     log.debug(f"Extracted {len(text)} chars from terminal (Value pattern)")
                     return text
                 except Exception:
@@ -177,6 +428,134 @@ class TerminalExtractor(BaseExtractor):
             return ""
 
 
+def new_output(previous: str, current: str, anchor_lines: int = 3) -> str:
+    """Return the part of a terminal tail that wasn't in the previous snapshot.
+
+    The previous tail's last few lines are looked up in the current one;
+    everything after them is new. The very last line is left out of the
+    anchor because it is usually the prompt being edited. If the anchor
+    isn't found (screen cleared, or more output than the tail window),
+    the whole current tail counts as new.
+    """
+    if not previous:
+        return current
+    if current == previous:
+        return ""
+    lines = previous.split("\n")
+    anchor = "\n".join(lines[-anchor_lines - 1:-1])
+    if anchor.strip():
+        pos = current.rfind(anchor)
+        if pos >= 0:
+            return current[pos + len(anchor):]
+    return current
+
+
+class DecayingTermTable:
+    """Term frequencies in which older occurrences count for less.
+
+    Weights halve every `half_life_s` seconds, so terms from recent
+    commands outrank ones that scrolled by an hour ago.
+
+    Args:
+        half_life_s: Seconds for a term's weight to halve
+        max_entries: Lowest-weighted terms beyond this are dropped
+    """
+
+    MIN_WEIGHT = 0.05
+
+    def __init__(self, half_life_s: float = 300.0, max_entries: int = 2000):
+        self.half_life_s = half_life_s
+        self.max_entries = max_entries
+        self.weights: dict[str, float] = {}
+        self._updated = time.monotonic()
+
+    def add(self, counts: dict[str, int], now: float | None = None) -> None:
+        """Decay existing weights to `now`, then add new term counts."""
+        now = time.monotonic() if now is None else now
+        factor = 0.5 ** ((now - self._updated) / self.half_life_s)
+        self._updated = now
+        if factor < 1.0:
+            self.weights = {t: w * factor for t, w in self.weights.items() if w * factor >= self.MIN_WEIGHT}
+        for term, count in counts.items():
+            self.weights[term] = self.weights.get(term, 0.0) + count
+        if len(self.weights) > self.max_entries:
+            kept = sorted(self.weights.items(), key=lambda item: -item[1])[:self.max_entries]
+            self.weights = dict(kept)
+
+    def top(self, max_terms: int = 50) -> list[str]:
+        """Highest-ranked terms by weight (case-insensitively deduplicated)."""
+        return term_parser.dedupe_terms(term_parser.rank_terms(self.weights), max_terms)
+
+
+class TerminalExtractor(BaseExtractor):
+    """Extractor for terminal windows.
+
+    Reads a bounded tail of the buffer (Windows Terminal, cmd, PowerShell,
+    etc. via UI Automation by default) and keeps a snapshot per window.
+    Only output that appeared since the last snapshot is tokenized and
+    merged into a decaying term table, so the cost follows new output
+    rather than total scrollback.
+
+    Args:
+        provider: Where terminal text comes from (default: UI Automation)
+        max_lines: Lines read from the end of the buffer
+        half_life_s: Half-life of term weights
+    """
+
+    # Windows whose snapshots are kept
+    MAX_WINDOWS = 16
+
+    def __init__(
+        self,
+        provider: TerminalTextProvider | None = None,
+        max_lines: int = TERMINAL_MAX_LINES,
+        half_life_s: float = TERMINAL_HALF_LIFE_S,
+    ):
+        self.provider = provider or UIATextProvider()
+        self.max_lines = max_lines
+        self.half_life_s = half_life_s
+        self._states: collections.OrderedDict[int, tuple[str, DecayingTermTable]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def extract(self, window_info: WindowInfo) -> str:
+        """Read the tail of the terminal buffer.
+
+        Args:
+            window_info: Window information with terminal hwnd
+
+        Returns:
+            Last max_lines lines of terminal text, or empty string on failure
+        """
+        return self.provider.read_tail(window_info.hwnd, self.max_lines).replace("\r\n", "\n")
+
+    def stats(self) -> str:
+        return self.provider.stats()
+
+    def extract_terms(self, window_info: WindowInfo, max_terms: int = 50) -> list[str]:
+        """Merge terms from new terminal output and return the current top terms.
+
+        Args:
+            window_info: Window information with terminal hwnd
+            max_terms: Maximum number of terms to return
+
+        Returns:
+            Terms ranked by decayed frequency
+        """
+        tail = self.extract(window_info)
+        with self._lock:
+            snapshot, table = self._states.pop(window_info.hwnd, ("", None))
+            if table is None:
+                table = DecayingTermTable(self.half_life_s)
+            delta = new_output(snapshot, tail)
+            if delta:
+                table.add(term_parser.count_terms(delta))
+            self._states[window_info.hwnd] = (tail, table)
+            while len(self._states) > self.MAX_WINDOWS:
+                self._states.popitem(last=False)
+        log.debug(f"Terminal: {len(delta)} new of {len(tail)} chars, {len(table.weights)} terms tracked")
+        return table.top(max_terms)
+
+
 class GenericExtractor(BaseExtractor):
     """Fallback extractor for unknown application types.
 
@@ -197,19 +576,123 @@ class GenericExtractor(BaseExtractor):
         return ""
 
 
+@dataclass
+class ExtractorStats:
+    """Call timing for one extractor."""
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class ExtractorRegistry:
+    """Long-lived extractor instances keyed by app type.
+
+    Each factory is called once, on first use, and app types registered
+    with the same factory share its instance, so caches and per-window
+    state inside extractors persist across utterances. New app types can
+    be added with register() or by a plugin (see load_plugins()).
+    """
+
+    PLUGIN_GROUP = "stvc.extractors"
+
+    def __init__(self, fallback: Callable[[], BaseExtractor] = lambda: GenericExtractor()):
+        self._factories: dict[str, Callable[[], BaseExtractor]] = {}
+        self._instances: dict[Callable[[], BaseExtractor], BaseExtractor] = {}
+        self._fallback = fallback
+        self._lock = threading.Lock()
+        self.stats: dict[str, ExtractorStats] = collections.defaultdict(ExtractorStats)
+
+    def register(self, app_types: str | tuple[str, ...], factory: Callable[[], BaseExtractor]) -> None:
+        """Use `factory` to create the extractor for one or more app types.
+
+        Args:
+            app_types: App type name(s), as returned by detect_app_type()
+            factory: Zero-argument callable (usually the extractor class)
+        """
+        if isinstance(app_types, str):
+            app_types = (app_types,)
+        with self._lock:
+            for app_type in app_types:
+                self._factories[app_type] = factory
+
+    def get(self, app_type: str) -> BaseExtractor:
+        """Return the shared extractor for an app type, creating it on first use."""
+        factory = self._factories.get(app_type, self._fallback)
+        extractor = self._instances.get(factory)
+        if extractor is None:
+            with self._lock:
+                extractor = self._instances.get(factory)
+                if extractor is None:
+                    extractor = self._instances[factory] = factory()
+        return extractor
+
+    def extract_terms(self, app_type: str, window_info: WindowInfo, max_terms: int = 50) -> list[str]:
+        """Extract terms with the app type's extractor, recording how long it took."""
+        extractor = self.get(app_type)
+        start = time.perf_counter()
+        try:
+            return extractor.extract_terms(window_info, max_terms=max_terms)
+        finally:
+            self.stats[type(extractor).__name__].record((time.perf_counter() - start) * 1000)
+
+    def load_plugins(self) -> None:
+        """Call every `stvc.extractors` entry point with this registry.
+
+        A plugin package declares e.g.
+        ``[project.entry-points."stvc.extractors"] mine = "my_pkg:register"``
+        where ``register(registry)`` calls registry.register() (and
+        window_detect.register_app_type() to detect its windows, or
+        symbols.register_lexer() to lex another language).
+        """
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=self.PLUGIN_GROUP):
+            try:
+                entry_point.load()(self)
+                log.info("Loaded extractor plugin '%s'.", entry_point.name)
+            except Exception as e:
+                log.warning(f"Extractor plugin '{entry_point.name}' failed to load: {e}")
+
+    def summary(self) -> str:
+        """One line of timing (and the extractor's own stats) per extractor, for logs."""
+        extras = {type(extractor).__name__: extractor.stats() for extractor in list(self._instances.values())}
+        parts = []
+        for name, st in sorted(self.stats.items()):
+            part = f"{name} {st.calls} calls, mean {st.mean_ms:.1f} ms, max {st.max_ms:.1f} ms"
+            if extras.get(name):
+                part += f", {extras[name]}"
+            parts.append(part)
+        return "; ".join(parts) or "no extractions"
+
+
+registry = ExtractorRegistry()
+registry.register(FILE_APP_TYPES, FileBasedExtractor)
+registry.register("terminal", TerminalExtractor)
+
+
+def register_extractor(app_types: str | tuple[str, ...], factory: Callable[[], BaseExtractor]) -> None:
+    """Plugin hook: register an extractor for new (or existing) app types."""
+    registry.register(app_types, factory)
+
+
 def get_extractor(app_type: str) -> BaseExtractor:
     """Factory function to get the appropriate extractor for an app type.
 
     Args:
         app_type: Application type from detect_app_type()
-                 ("vscode", "notepadpp", "terminal", "unknown")
+                 ("vscode", "notepadpp", "terminal", "unknown", or any
+                 type added with register_extractor())
 
     Returns:
-        Appropriate BaseExtractor instance
+        The registry's long-lived BaseExtractor instance for the app type
     """
-    if app_type in ("vscode", "notepadpp"):
-        return FileBasedExtractor()
-    elif app_type == "terminal":
-        return TerminalExtractor()
-    else:
-        return GenericExtractor()
+    return registry.get(app_type)
@@ -0,0 +1,173 @@
+"""Inverse document frequencies of code terms, for distinctiveness ranking.
+
+Ranking terms by raw frequency fills the prompt with identifiers every
+codebase repeats (self, None, Exception, __init__). Weighting each count
+by how rare the term is across a background corpus of general code
+favours the names specific to the file being edited.
+
+The table ships as code_idf.tsv.gz next to this module: a header line
+with the corpus size followed by one "term<TAB>document frequency" line
+per term, lowercased. It is loaded on first use; terms missing from it
+get the highest weight. Rebuild it with
+
+    python -m stvc.context.idf corpus_dir [corpus_dir ...] [-o code_idf.tsv.gz]
+"""
+
+import argparse
+import gzip
+import logging
+import math
+import os
+import threading
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+IDF_PATH = Path(__file__).with_name("code_idf.tsv.gz")
+
+# Extensions read when building the table, and files read per extension at
+# most so one language doesn't dominate the corpus
+CORPUS_EXTENSIONS = (".py", ".js", ".ts", ".go", ".rs", ".java", ".c", ".h", ".cpp", ".cs")
+MAX_FILES_PER_EXTENSION = 3000
+
+# Terms seen in fewer documents are left out; they'd score close to unseen terms anyway
+MIN_DOCUMENT_FREQUENCY = 3
+
+# Table entries kept at most (most frequent first)
+MAX_ENTRIES = 30000
+
+
+class IdfTable:
+    """Smoothed inverse document frequency per lowercased term.
+
+    Args:
+        documents: Number of documents in the background corpus
+        doc_freq: Documents each (lowercased) term appears in
+    """
+
+    def __init__(self, documents: int, doc_freq: dict[str, int]):
+        self.documents = documents
+        self.doc_freq = doc_freq
+        self._idf = {term: math.log((documents + 1) / (df + 1)) + 1.0 for term, df in doc_freq.items()}
+        self.unseen = math.log(documents + 1) + 1.0
+
+    def __len__(self) -> int:
+        return len(self._idf)
+
+    def weight(self, term: str) -> float:
+        """IDF of `term`; terms absent from the corpus get the maximum."""
+        return self._idf.get(term.lower(), self.unseen)
+
+    @classmethod
+    def load(cls, path: str | Path = IDF_PATH) -> "IdfTable":
+        """Read a table written by save()."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            documents = int(f.readline().split("\t")[1])
+            doc_freq = {}
+            for line in f:
+                term, df = line.rstrip("\n").split("\t")
+                doc_freq[term] = int(df)
+        return cls(documents, doc_freq)
+
+    def save(self, path: str | Path) -> None:
+        """Write the table, most frequent terms first."""
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=9) as f:
+            f.write(f"#documents\t{self.documents}\n")
+            for term, df in sorted(self.doc_freq.items(), key=lambda item: (-item[1], item[0])):
+                f.write(f"{term}\t{df}\n")
+
+    @classmethod
+    def build(
+        cls,
+        files: list[Path],
+        max_bytes: int = 50000,
+        min_df: int = MIN_DOCUMENT_FREQUENCY,
+        max_entries: int = MAX_ENTRIES,
+    ) -> "IdfTable":
+        """Count in how many of `files` each term appears.
+
+        Args:
+            files: Corpus documents
+            max_bytes: Bytes read per file, like the extractors
+            min_df: Terms in fewer documents are dropped
+            max_entries: Entries kept at most
+
+        Returns:
+            The table for this corpus
+        """
+        from .term_parser import count_terms
+
+        doc_freq: dict[str, int] = {}
+        documents = 0
+        for path in files:
+            try:
+                with open(path, encoding="utf-8", errors="ignore") as f:
+                    text = f.read(max_bytes)
+            except OSError:
+                continue
+            documents += 1
+            for term in {term.lower() for term in count_terms(text)}:
+                doc_freq[term] = doc_freq.get(term, 0) + 1
+
+        kept = sorted((item for item in doc_freq.items() if item[1] >= min_df), key=lambda item: -item[1])
+        return cls(documents, dict(kept[:max_entries]))
+
+
+def iter_corpus(roots: list[Path], max_per_extension: int = MAX_FILES_PER_EXTENSION) -> list[Path]:
+    """Source files under `roots`, at most `max_per_extension` of each kind.
+
+    Where there are more, an evenly spaced subset is taken so no single
+    project dominates.
+    """
+    by_extension: dict[str, list[Path]] = {ext: [] for ext in CORPUS_EXTENSIONS}
+    for root in roots:
+        for directory, dirs, names in os.walk(root):
+            dirs.sort()
+            for name in sorted(names):
+                bucket = by_extension.get(os.path.splitext(name)[1].lower())
+                if bucket is not None:
+                    bucket.append(Path(directory) / name)
+
+    files = []
+    for bucket in by_extension.values():
+        step = max(len(bucket) / max_per_extension, 1.0)
+        files.extend(bucket[int(i * step)] for i in range(min(len(bucket), max_per_extension)))
+    return files
+
+
+_table: IdfTable | None = None
+_loaded = False
+_lock = threading.Lock()
+
+
+def get_idf_table() -> IdfTable | None:
+    """The shipped table, loaded on first call; None if it can't be read."""
+    global _table, _loaded
+    if not _loaded:
+        with _lock:
+            if not _loaded:
+                try:
+                    _table = IdfTable.load(IDF_PATH)
+                    log.debug("Loaded %d IDF entries from a %d-file corpus.", len(_table), _table.documents)
+                except (OSError, ValueError, IndexError) as e:
+                    log.warning(f"Could not load term IDF table, ranking by frequency: {e}")
+                _loaded = True
+    return _table
+
+
+def main(argv=None):
+    """Entry point for `python -m stvc.context.idf`: rebuild the IDF table."""
+    parser = argparse.ArgumentParser(prog="python -m stvc.context.idf", description=__doc__.splitlines()[0])
+    parser.add_argument("roots", nargs="+", type=Path, help="directories of general source code")
+    parser.add_argument("-o", "--output", type=Path, default=IDF_PATH)
+    parser.add_argument("--per-extension", type=int, default=MAX_FILES_PER_EXTENSION)
+    args = parser.parse_args(argv)
+
+    files = iter_corpus(args.roots, args.per_extension)
+    table = IdfTable.build(files)
+    table.save(args.output)
+    print(f"{len(table)} terms from {table.documents} files -> {args.output} ({args.output.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
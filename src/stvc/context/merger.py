@@ -1,56 +1,133 @@
 """Prompt merging logic for context-aware transcription."""
 
 import logging
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
 from math import ceil
 
 log = logging.getLogger(__name__)
 
+# faster-whisper keeps only the last max_length // 2 - 1 prompt tokens and
+# drops the rest from the front, which is where the base dictionary sits
+PROMPT_TOKEN_LIMIT = 223
 
-def build_prompt(base_terms: str, context_terms: list[str], max_tokens: int = 224) -> str:
+TOKEN_CACHE_SIZE = 8192
+
+
+class TokenCounter:
+    """Counts Whisper prompt tokens per term, with an LRU cache.
+
+    Each term is encoded the way it appears in a comma-separated prompt
+    (with a leading space), so a prompt costs the sum of its terms plus
+    one token per ", " separator. The GPT-2 pre-tokenizer splits on
+    spaces and punctuation runs, which makes this exact for ordinary
+    terms and at worst a slight overcount for terms ending in
+    punctuation. Without a tokenizer, falls back to ceil(len / 4).
+
+    Args:
+        tokenizer: A `tokenizers.Tokenizer` (WhisperModel.hf_tokenizer), or None
+        cache_size: Number of per-term counts kept
+    """
+
+    def __init__(self, tokenizer=None, cache_size: int = TOKEN_CACHE_SIZE):
+        self._tokenizer = tokenizer
+        self.count = lru_cache(maxsize=cache_size)(self._count)
+
+    @property
+    def exact(self) -> bool:
+        """True if counts come from the real tokenizer."""
+        return self._tokenizer is not None
+
+    def _count(self, term: str) -> int:
+        if self._tokenizer is None:
+            return ceil(len(term) / 4)
+        return len(self._tokenizer.encode(" " + term, add_special_tokens=False).ids)
+
+
+_counter = TokenCounter()
+_counter_lock = threading.Lock()
+
+
+def set_tokenizer(tokenizer) -> None:
+    """Count prompt tokens with `tokenizer` from now on (None for the estimate)."""
+    global _counter
+    with _counter_lock:
+        _counter = TokenCounter(tokenizer)
+    log.debug("Prompt token counting: %s.", "Whisper tokenizer" if tokenizer is not None else "estimate")
+
+
+def get_token_counter() -> TokenCounter:
+    """The TokenCounter used by build_prompt()."""
+    return _counter
+
+
+@dataclass(frozen=True)
+class BaseTerms:
+    """Base dictionary terms prepared once for repeated prompt merging.
+
+    Attributes:
+        text: Comma-separated terms, as passed to Whisper
+        keys: Lowercased terms, for deduplicating context terms
+        tokens: Token count of `text`
+    """
+    text: str
+    keys: frozenset[str]
+    tokens: int
+
+
+def prepare_base_terms(base_terms: str, counter: TokenCounter | None = None) -> BaseTerms:
+    """Parse and count the base dictionary terms.
+
+    Call this when the dictionary (or tokenizer) changes, not per
+    utterance; build_prompt() accepts the result directly.
+    """
+    counter = counter or _counter
+    terms = [term.strip() for term in (base_terms or "").split(",")]
+    terms = [term for term in terms if term]
+    tokens = sum(counter.count(term) for term in terms) + max(len(terms) - 1, 0)
+    return BaseTerms(text=base_terms or "", keys=frozenset(term.lower() for term in terms), tokens=tokens)
+
+
+def build_prompt(
+    base_terms: "str | BaseTerms",
+    context_terms: list[str],
+    max_tokens: int = PROMPT_TOKEN_LIMIT,
+) -> str:
     """Merge base dictionary terms with context-extracted terms within token budget.
 
     Base terms are always included first. Context terms are appended in order
-    until the estimated token count reaches max_tokens. Terms already present
+    until the token count reaches max_tokens. Terms already present
     in base_terms are deduplicated.
 
-    Token estimation: ceil(len(term) / 4) per term, plus 1 token per separator.
-    This is a rough approximation of Whisper's tokenizer (GPT-2 based).
+    Tokens are counted with the Whisper tokenizer registered through
+    set_tokenizer() (cached per term), or estimated as ceil(len(term) / 4)
+    until one is available; each ", " separator costs one token.
 
     Args:
-        base_terms: Comma-separated base dictionary terms (always included)
+        base_terms: Comma-separated base dictionary terms (always included),
+            or a BaseTerms from prepare_base_terms() to skip re-counting them
         context_terms: List of context-extracted terms to append
-        max_tokens: Maximum token budget (default 224, Whisper's prompt limit)
+        max_tokens: Maximum token budget (default: what faster-whisper keeps)
 
     Returns:
         Comma-separated string ready for Whisper's initial_prompt parameter
     """
-    if not base_terms:
-        base_terms = ""
-
-    # Parse base terms into a set for deduplication (case-insensitive)
-    base_set = set()
-    if base_terms:
-        base_set = {term.strip().lower() for term in base_terms.split(",")}
-
-    # Estimate tokens for base terms
-    # Each term: ceil(len/4), plus 1 for comma separator
-    base_token_count = 0
-    if base_terms:
-        for term in base_terms.split(","):
-            term = term.strip()
-            if term:
-                base_token_count += ceil(len(term) / 4) + 1  # +1 for separator
+    counter = _counter
+    if not isinstance(base_terms, BaseTerms):
+        base_terms = prepare_base_terms(base_terms, counter)
 
-    log.debug(f"Base terms token estimate: {base_token_count}")
+    log.debug(f"Base terms token count: {base_terms.tokens}")
 
     # If base terms already exceed budget, return them truncated
-    if base_token_count >= max_tokens:
-        log.warning(f"Base terms ({base_token_count} tokens) exceed budget ({max_tokens})")
-        return base_terms
+    if base_terms.tokens >= max_tokens:
+        log.warning(f"Base terms ({base_terms.tokens} tokens) exceed budget ({max_tokens})")
+        return base_terms.text
 
     # Add context terms until budget is reached
-    merged_parts = [base_terms] if base_terms else []
-    current_tokens = base_token_count
+    merged_parts = [base_terms.text] if base_terms.text else []
+    seen = set(base_terms.keys)
+    current_tokens = base_terms.tokens
 
     added_count = 0
     for term in context_terms:
@@ -59,12 +136,13 @@ def build_prompt(base_terms: str, context_terms: list[str], max_tokens: int = 22
             continue
 
         # Skip if already in base terms (case-insensitive)
-        if term.lower() in base_set:
+        key = term.lower()
+        if key in seen:
             log.debug(f"Skipping duplicate term: '{term}'")
             continue
 
-        # Estimate tokens for this term
-        term_tokens = ceil(len(term) / 4) + 1  # +1 for separator
+        # Separator plus the term itself
+        term_tokens = counter.count(term) + (1 if merged_parts else 0)
 
         # Check if adding this term would exceed budget
         if current_tokens + term_tokens > max_tokens:
@@ -75,10 +153,10 @@ def build_prompt(base_terms: str, context_terms: list[str], max_tokens: int = 22
         merged_parts.append(term)
         current_tokens += term_tokens
         added_count += 1
-        base_set.add(term.lower())  # Track for future dedup
+        seen.add(key)  # Track for future dedup
 
     log.info(
-        f"Built prompt: {current_tokens} estimated tokens "
+        f"Built prompt: {current_tokens} {'tokens' if counter.exact else 'estimated tokens'} "
         f"(base + {added_count} context terms)"
     )
 
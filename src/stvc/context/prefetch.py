@@ -0,0 +1,118 @@
+"""Context extraction started on push-to-talk press.
+
+The foreground window can't change while the hotkey is held, so the
+window lookup, content extraction and prompt merge run on a worker
+thread during recording. On release the transcription stage collects
+the result, waiting at most until the deadline (counted from the press)
+before falling back to the base prompt.
+"""
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from dataclasses import dataclass
+from typing import Callable
+
+from .extractors import init_com_thread
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class Context:
+    """Result of one context extraction.
+
+    Attributes:
+        prompt: Merged initial prompt, or None to use the base prompt
+        app_type: Detected application type, or None if unknown
+    """
+    prompt: str | None = None
+    app_type: str | None = None
+
+
+class ContextPrefetch:
+    """Handle to a context extraction running in the background.
+
+    Args:
+        future: Future resolving to a Context
+        started_at: perf_counter() timestamp of submission
+        deadline: Seconds after `started_at` the result may be waited for
+    """
+
+    def __init__(self, future: Future, started_at: float, deadline: float):
+        self._future = future
+        self.started_at = started_at
+        self.deadline = deadline
+        self.finished_at: float | None = None
+        future.add_done_callback(self._on_done)
+
+    @classmethod
+    def ready(cls, context: Context) -> "ContextPrefetch":
+        """A handle whose result is already known (e.g. from the context tracker)."""
+        future: Future = Future()
+        future.set_result(context)
+        return cls(future, time.perf_counter(), 0.0)
+
+    def _on_done(self, _future: Future):
+        self.finished_at = time.perf_counter()
+
+    def result(self, released_at: float | None = None) -> Context:
+        """Wait for the extraction (up to the deadline) and return its Context.
+
+        Args:
+            released_at: perf_counter() timestamp of the key release, used to
+                log how much of the extraction overlapped recording
+
+        Returns:
+            The extracted Context, or an empty one if the deadline passed or
+            extraction failed.
+        """
+        wait_start = time.perf_counter()
+        timeout = max(self.started_at + self.deadline - wait_start, 0.0)
+        try:
+            context = self._future.result(timeout=timeout)
+        except TimeoutError:
+            log.info(
+                "Context extraction missed its %.0f ms deadline; using the base prompt.", self.deadline * 1000,
+            )
+            return Context()
+        except Exception as e:
+            log.debug(f"Context extraction failed, using base dictionary: {e}")
+            return Context()
+
+        waited = time.perf_counter() - wait_start
+        finished_at = self.finished_at or time.perf_counter()
+        elapsed = finished_at - self.started_at
+        if released_at is not None:
+            hidden = max(min(finished_at, released_at) - self.started_at, 0.0)
+            log.info(
+                "Context: %.0f ms extraction, %.0f ms hidden behind recording, %.0f ms waited after release.",
+                elapsed * 1000, hidden * 1000, waited * 1000,
+            )
+        return context
+
+
+class ContextPrefetcher:
+    """Runs context extraction on a small thread pool.
+
+    Args:
+        build: Callable doing the extraction and returning a Context
+        deadline: Seconds from submission a caller will wait for the result
+        max_workers: Pool size; more than one lets a hung extraction
+            (e.g. an unresponsive UIA provider) not block the next press
+    """
+
+    def __init__(self, build: Callable[[], Context], deadline: float = 0.5, max_workers: int = 2):
+        self._build = build
+        self.deadline = deadline
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="stvc-context", initializer=init_com_thread,
+        )
+
+    def submit(self) -> ContextPrefetch:
+        """Start extracting context for the current foreground window."""
+        return ContextPrefetch(self._pool.submit(self._build), time.perf_counter(), self.deadline)
+
+    def shutdown(self):
+        """Stop accepting work; running extractions are left to finish."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,231 @@
+"""Language-aware symbol extraction for known file types.
+
+The generic term regexes see every identifier-shaped word, including the
+ones in comments, docstrings and string literals. For file types with a
+registered lexer, terms come instead from the code's symbols (what it
+defines, imports, decorates with, calls and assigns), each kind with its
+own weight, then ranked like any other terms (term_parser.rank_terms).
+
+Lexers are picked by file extension; plugins can add their own with
+register_lexer(). A lexer raises SyntaxError on text it can't make sense
+of, and the generic regex path is used instead. Sampled files
+(extractors.sample_file) are lexed piece by piece with
+Lexer.sample_symbols(), so a piece that still ends inside a string
+literal costs only its own tail rather than the whole sample. Results
+are cached per file version by FileBasedExtractor, like regex terms.
+"""
+
+import builtins
+import keyword
+import logging
+import os
+import re
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import List
+
+from . import term_parser
+
+log = logging.getLogger(__name__)
+
+# Weight added per occurrence of each kind of symbol
+DEFINITION = 4.0
+IMPORT = 3.0
+DECORATOR = 3.0
+CALL = 1.0
+ASSIGNMENT = 1.0
+
+# Joins the pieces of a sampled file; a form feed is whitespace to the
+# generic term regexes and rare in source code
+PIECE_SEPARATOR = "\n\f\n"
+
+
+class Lexer(ABC):
+    """Finds the symbols of one language.
+
+    Attributes:
+        extensions: Lowercase file extensions handled, e.g. (".py", ".pyi")
+    """
+
+    extensions: tuple[str, ...] = ()
+
+    @abstractmethod
+    def symbols(self, text: str) -> dict[str, float]:
+        """Weighted symbols of `text`.
+
+        Raises:
+            SyntaxError: If the text can't be lexed
+        """
+
+    def sample_symbols(self, pieces: list[str]) -> dict[str, float]:
+        """Weighted symbols of the pieces of a sampled file, which may end inside a literal.
+
+        By default each piece must lex as a whole and the others are
+        skipped; lexers that can use part of a piece override this.
+        """
+        weights: dict[str, float] = {}
+        for piece in pieces:
+            try:
+                piece_weights = self.symbols(piece)
+            except SyntaxError as e:
+                log.debug(f"Skipping a sample piece: {e}")
+                continue
+            for name, weight in piece_weights.items():
+                weights[name] = weights.get(name, 0.0) + weight
+        return weights
+
+
+def _weigh(weights: dict[str, float], name: str, weight: float):
+    """Add `weight` to each term in an identifier or dotted name."""
+    for term, _ in term_parser._chain_terms(name):
+        weights[term] = weights.get(term, 0.0) + weight
+
+
+class PythonLexer(Lexer):
+    """Python symbols from a few compiled scans.
+
+    A full ast.parse() of a 50 KB module costs several times the regex
+    term scan, and tokenize is slower still, so this lexes with regexes
+    instead. Comments and string literals are blanked first, then each
+    kind of symbol is found over the remaining code: def/class names,
+    decorators, imported modules and names (with aliases), call targets
+    and assignment targets. Each pattern starts with a literal, so the
+    scans jump between candidates instead of trying every position,
+    and repeated targets are counted together. A quote left over
+    once literals are blanked (e.g. from a sample cut mid-docstring) is
+    a SyntaxError, except in a piece of a sampled file (sample_symbols),
+    where the piece is lexed up to that quote. The pieces are then
+    scanned together.
+    """
+
+    extensions = (".py", ".pyi", ".pyw")
+
+    _NOISE = re.compile(r'''
+        \#[^\n]*
+      | \'\'\'[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*\'\'\'
+      | """[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*"""
+      | '[^'\\\n]*(?:\\.[^'\\\n]*)*'
+      | "[^"\\\n]*(?:\\.[^"\\\n]*)*"
+    ''', re.VERBOSE | re.DOTALL)
+
+    # Keywords are anchored with a lookbehind rather than a leading \b,
+    # which would keep the scan from jumping to the literal
+    _DEFS = re.compile(r'def(?<!\wdef)[ \t]+(\w+)')
+    _CLASSES = re.compile(r'class(?<!\wclass)[ \t]+(\w+)')
+    _DECORATORS = re.compile(r'@[ \t]*([\w.]+)')
+    _FROM = re.compile(r'from(?<!\wfrom)[ \t]+([\w.]+)[ \t]+import\b')
+    _IMPORT = re.compile(r'import(?<!\wimport)[ \t]+(\([^)]*\)|[^\n;]+)')
+    _IMPORTED = re.compile(r'([\w.]+)(?:\s+as\s+(\w+))?')
+
+    # Call and assignment targets are matched in the reversed code, where
+    # they follow the "(" or "=" and the search can skip straight to
+    # those characters; "==", "<=", "+=", ":=" etc. are not assignments.
+    # An annotated target ("name: type = ...", at the start of a line or
+    # a parameter) is taken from before the annotation
+    _CALLS_REVERSED = re.compile(r'\([ \t]*([\w.]+)')
+    _ASSIGNMENTS_REVERSED = re.compile(
+        r'=(?<!==)(?![=!<>+\-*/%&|^:@])[ \t]*'
+        r'(?:[\w.\[\], |]+?:[ \t]*([\w.]+)(?=[ \t]*(?:[\n(,]|$))|([\w.]+))'
+    )
+
+    _QUOTE = re.compile("['\"]")
+
+    # Calls to these say nothing about the code at hand
+    _GENERIC = frozenset(keyword.kwlist) | frozenset(dir(builtins))
+
+    def symbols(self, text: str) -> dict[str, float]:
+        code = self._NOISE.sub("", text)
+        # In valid code every quote belongs to a string literal
+        if "'" in code or '"' in code:
+            raise SyntaxError("unterminated string literal")
+        return self._scan(code)
+
+    def sample_symbols(self, pieces: list[str]) -> dict[str, float]:
+        codes = []
+        for piece in pieces:
+            code = self._NOISE.sub("", piece)
+            # A quote left over marks a literal cut by the sampling; the
+            # code before it is sound
+            stray = self._QUOTE.search(code)
+            codes.append(code if stray is None else code[:stray.start()])
+        return self._scan("\n".join(codes))
+
+    def _scan(self, code: str) -> dict[str, float]:
+        """Weighted symbols of code with comments and literals blanked."""
+        weights: dict[str, float] = {}
+        for name in self._DEFS.findall(code) + self._CLASSES.findall(code):
+            _weigh(weights, name, DEFINITION)
+        for name in self._DECORATORS.findall(code):
+            _weigh(weights, name, DECORATOR)
+        for module in self._FROM.findall(code):
+            _weigh(weights, module, IMPORT)
+        for names in self._IMPORT.findall(code):
+            for name, alias in self._IMPORTED.findall(names):
+                _weigh(weights, name, IMPORT)
+                if alias:
+                    _weigh(weights, alias, IMPORT)
+
+        reversed_code = code[::-1]
+        generic = self._GENERIC
+        targets = [annotated or plain for annotated, plain in self._ASSIGNMENTS_REVERSED.findall(reversed_code)]
+        for reversed_names, weight in (
+            (self._CALLS_REVERSED.findall(reversed_code), CALL),
+            (targets, ASSIGNMENT),
+        ):
+            for reversed_name, n in Counter(reversed_names).items():
+                name = reversed_name[::-1].lstrip(".")
+                head, _, tail = name.partition(".")
+                if head in ("self", "cls"):
+                    # self.foo.bar(...) -> foo.bar
+                    name = tail
+                elif not tail and name in generic:
+                    continue
+                _weigh(weights, name, n * weight)
+        return weights
+
+
+_lexers: dict[str, Lexer] = {}
+
+
+def register_lexer(lexer: Lexer) -> None:
+    """Use `lexer` for files with any of its extensions (replacing earlier ones)."""
+    for extension in lexer.extensions:
+        _lexers[extension.lower()] = lexer
+
+
+def lexer_for(path: str) -> Lexer | None:
+    """The lexer registered for the extension of `path`, if any."""
+    return _lexers.get(os.path.splitext(path)[1].lower())
+
+
+register_lexer(PythonLexer())
+
+
+def extract_symbols(text: str, path: str, max_terms: int = 50, ranking: str | None = None) -> List[str]:
+    """Ranked terms of a file, from its symbols where a lexer knows the language.
+
+    Falls back to term_parser.extract_terms() for unknown file types or
+    when the lexer finds nothing (or can't lex a whole file). Text from
+    sample_file() goes through Lexer.sample_symbols() piece by piece.
+
+    Args:
+        text: File content, or pieces joined by PIECE_SEPARATOR
+        path: File path, used to pick the lexer
+        max_terms: Maximum number of terms to return
+        ranking: "tfidf" or "frequency" (default: term_parser.set_ranking())
+
+    Returns:
+        Terms, most useful first
+    """
+    lexer = lexer_for(path)
+    if lexer is None or not text:
+        return term_parser.extract_terms(text, max_terms=max_terms, ranking=ranking)
+    pieces = text.split(PIECE_SEPARATOR)
+    try:
+        weights = lexer.symbols(text) if len(pieces) == 1 else lexer.sample_symbols(pieces)
+    except SyntaxError as e:
+        log.debug(f"Could not lex {path}, using generic terms: {e}")
+        weights = {}
+    if not weights:
+        return term_parser.extract_terms(text, max_terms=max_terms, ranking=ranking)
+    return term_parser.dedupe_terms(term_parser.rank_terms(weights, ranking), max_terms)
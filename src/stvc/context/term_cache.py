@@ -0,0 +1,96 @@
+"""Cache of ranked terms per file version.
+
+Dictating repeatedly into the same unchanged file shouldn't re-read and
+re-scan it each time. Entries are keyed by (path, mtime_ns, size,
+max_terms), so saving the file naturally misses, and evicted least
+recently used first once their estimated memory exceeds the budget.
+Terms are stored as tuples and handed out as fresh lists, so a caller
+extending its result can't change what the next lookup gets.
+"""
+
+import collections
+import logging
+import sys
+import threading
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+CacheKey = tuple[str, int, int, int]
+
+
+def _entry_bytes(key: CacheKey, terms: tuple[str, ...]) -> int:
+    """Rough memory held by one entry: the key, the tuple and its strings."""
+    return sys.getsizeof(key) + sys.getsizeof(key[0]) + sys.getsizeof(terms) + sum(sys.getsizeof(t) for t in terms)
+
+
+class TermCache:
+    """Thread-safe LRU of extracted terms with a memory budget.
+
+    Args:
+        max_bytes: Estimated memory the cached entries may use
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: collections.OrderedDict[CacheKey, tuple[tuple[str, ...], int]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: CacheKey) -> list[str] | None:
+        """Return a copy of the cached terms for `key`, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[0])
+
+    def put(self, key: CacheKey, terms: list[str]) -> None:
+        """Store a copy of `terms` for `key`, evicting old entries to stay within budget."""
+        stored = tuple(terms)
+        size = _entry_bytes(key, stored)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size_bytes -= old[1]
+            self._entries[key] = (stored, size)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that hit (0 if none yet)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> str:
+        """One-line summary for logs."""
+        return (
+            f"{len(self)} files, {self.size_bytes / 1024:.0f} KB, {self.hits} hits, "
+            f"{self.misses} misses ({self.hit_rate:.0%}), {self.evictions} evictions"
+        )
+
+
+# Shared by all FileBasedExtractor instances
+file_term_cache = TermCache()
@@ -1,9 +1,13 @@
 """Term extraction from source code and technical content."""
 
+import math
 import re
 from collections import Counter
+from functools import lru_cache
 from typing import List
 
+from .idf import get_idf_table
+
 # Common English stop words to filter out
 STOP_WORDS = {
     'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
@@ -16,9 +20,136 @@ STOP_WORDS = {
 }
 
 
-def extract_terms(text: str, max_terms: int = 50) -> List[str]:
+# Term classes, in the order the original six-regex implementation ran
+# them; the order breaks frequency ties in the ranking. All but DOTTED
+# only ever match a whole \w+ run, so they are checked with fullmatch()
+# on each run instead of scanning the text.
+CAMEL, PASCAL, SNAKE, UPPER, DOTTED, CAPITAL = range(6)
+
+_RUN_PATTERNS = [
+    # camelCase identifiers (e.g., getUserName, myVariable)
+    (CAMEL, re.compile(r'[a-z]+[A-Z][a-zA-Z0-9]*')),
+    # PascalCase identifiers (e.g., UserService, MyClass)
+    (PASCAL, re.compile(r'[A-Z][a-z]+[A-Z][a-zA-Z0-9]*')),
+    # snake_case identifiers (e.g., get_user_name, my_var)
+    (SNAKE, re.compile(r'[a-z]+_[a-z0-9_]+')),
+    # UPPER_CASE constants (e.g., MAX_RETRIES, API_KEY)
+    (UPPER, re.compile(r'[A-Z]+_[A-Z0-9_]+')),
+    # Single capitalized words (potential framework/library names)
+    (CAPITAL, re.compile(r'[A-Z][a-z]{2,}')),
+]
+
+# Dotted paths (e.g., stvc.config, os.path.join), found within a chain
+_DOTTED_PATTERN = re.compile(r'\b[a-z_][a-z0-9_]*\.[a-z_][a-z0-9_.]*\b')
+
+# Word runs joined by dots: the only unit a term can span
+_CHAIN_PATTERN = re.compile(r'\w+(?:\.+\w+)*')
+
+
+def _keep(term: str) -> bool:
+    """Filter out stop words, single characters and pure numbers."""
+    return not (term.lower() in STOP_WORDS or len(term) < 2 or term.isdigit())
+
+
+@lru_cache(maxsize=65536)
+def _chain_terms(chain: str) -> tuple[tuple[str, int], ...]:
+    """Classify the terms in one chain, in scan order, as (term, class) pairs."""
+    terms = []
+    for run in chain.split('.') if '.' in chain else (chain,):
+        for kind, pattern in _RUN_PATTERNS:
+            if pattern.fullmatch(run):
+                if _keep(run):
+                    terms.append((run, kind))
+                break
+    if '.' in chain:
+        terms.extend((term, DOTTED) for term in _DOTTED_PATTERN.findall(chain) if _keep(term))
+    return tuple(terms)
+
+
+def _scan(text: str) -> tuple[dict[str, int], dict[str, tuple[int, int]]]:
+    """Count terms in one pass; also return each term's (class, first occurrence) rank."""
+    counts: dict[str, int] = {}
+    first_seen: dict[str, tuple[int, int]] = {}
+    order = 0
+    for chain, n in Counter(_CHAIN_PATTERN.findall(text)).items():
+        for term, kind in _chain_terms(chain):
+            if term in counts:
+                counts[term] += n
+            else:
+                counts[term] = n
+                first_seen[term] = (kind, order)
+            order += 1
+    return counts, first_seen
+
+
+def count_terms(text: str) -> dict[str, int]:
+    """Occurrences of every technical term in text (no ranking or limit)."""
+    if not text:
+        return {}
+    return _scan(text)[0]
+
+
+def dedupe_terms(ranked: List[str], max_terms: int) -> List[str]:
+    """Keep the first spelling of each term (case-insensitive), up to max_terms."""
+    seen_lower = set()
+    ranked_terms = []
+
+    for term in ranked:
+        term_lower = term.lower()
+        if term_lower not in seen_lower:
+            seen_lower.add(term_lower)
+            ranked_terms.append(term)
+
+            if len(ranked_terms) >= max_terms:
+                break
+
+    return ranked_terms
+
+
+# "tfidf" weighs counts by rarity in a background corpus (see idf.py);
+# "frequency" ranks by raw counts alone
+RANKINGS = ("tfidf", "frequency")
+_ranking = "tfidf"
+
+
+def set_ranking(ranking: str) -> None:
+    """Choose how extract_terms() and rank_terms() order terms by default."""
+    global _ranking
+    if ranking not in RANKINGS:
+        raise ValueError(f"Unknown term ranking {ranking!r}, expected one of {RANKINGS}")
+    _ranking = ranking
+
+
+def rank_terms(counts: dict[str, float], ranking: str | None = None, tie_break: dict | None = None) -> List[str]:
+    """Order terms best first.
+
+    With "tfidf" each term scores log(1 + count) times its IDF, so a name
+    specific to this text beats one that is merely everywhere; one dict
+    lookup per term. Falls back to frequency if the IDF table is missing.
+
+    Args:
+        counts: Occurrences (or decayed weights) per term
+        ranking: "tfidf" or "frequency" (default: set_ranking())
+        tie_break: Optional sort key per term for equal scores; otherwise
+            ties keep the order of `counts`
+
+    Returns:
+        Every term in `counts`, best first
+    """
+    table = get_idf_table() if (ranking or _ranking) == "tfidf" else None
+    if table is None:
+        scores = {term: -count for term, count in counts.items()}
+    else:
+        weight = table.weight
+        scores = {term: -math.log1p(count) * weight(term) for term, count in counts.items()}
+    if tie_break is None:
+        return sorted(scores, key=scores.__getitem__)
+    return sorted(scores, key=lambda term: (scores[term], tie_break[term]))
+
+
+def extract_terms(text: str, max_terms: int = 50, ranking: str | None = None) -> List[str]:
     """
-    Extract technical terms from text using regex patterns.
+    Extract technical terms from text in a single scan.
 
     Identifies:
     - camelCase identifiers (e.g., getUserName)
@@ -28,80 +159,25 @@ def extract_terms(text: str, max_terms: int = 50) -> List[str]:
     - Dotted module paths (e.g., stvc.config)
     - Framework/library names (capitalized patterns)
 
+    The text is split into dot-joined word chains by one compiled regex
+    and identical chains are counted together, so each distinct chain is
+    classified once (and cached across calls). Terms are ranked by
+    rank_terms(), ties broken by class and then by first occurrence; with
+    "frequency" this matches running one regex per class.
+
     Args:
         text: Source text to extract terms from
         max_terms: Maximum number of terms to return (default 50)
+        ranking: "tfidf" or "frequency" (default: set_ranking())
 
     Returns:
-        List of terms ordered by frequency (most common first)
+        List of terms, most useful first
     """
     if not text:
         return []
 
-    all_terms = []
-
-    # Pattern 1: camelCase identifiers (e.g., getUserName, myVariable)
-    # Must start with lowercase, have at least one uppercase letter
-    camel_pattern = r'\b[a-z]+[A-Z][a-zA-Z0-9]*\b'
-    all_terms.extend(re.findall(camel_pattern, text))
-
-    # Pattern 2: PascalCase identifiers (e.g., UserService, MyClass)
-    # Must start with uppercase, have at least one more uppercase letter
-    pascal_pattern = r'\b[A-Z][a-z]+[A-Z][a-zA-Z0-9]*\b'
-    all_terms.extend(re.findall(pascal_pattern, text))
-
-    # Pattern 3: snake_case identifiers (e.g., get_user_name, my_var)
-    # Lowercase with underscores, at least 2 parts
-    snake_pattern = r'\b[a-z]+_[a-z0-9_]+\b'
-    all_terms.extend(re.findall(snake_pattern, text))
-
-    # Pattern 4: UPPER_CASE constants (e.g., MAX_RETRIES, API_KEY)
-    # All uppercase with underscores, at least 2 parts
-    upper_pattern = r'\b[A-Z]+_[A-Z0-9_]+\b'
-    all_terms.extend(re.findall(upper_pattern, text))
-
-    # Pattern 5: Dotted paths (e.g., stvc.config, os.path.join)
-    # At least 2 parts separated by dots
-    dotted_pattern = r'\b[a-z_][a-z0-9_]*\.[a-z_][a-z0-9_.]*\b'
-    all_terms.extend(re.findall(dotted_pattern, text))
-
-    # Pattern 6: Single capitalized words (potential framework/library names)
-    # Single word starting with uppercase, at least 3 chars
-    capital_pattern = r'\b[A-Z][a-z]{2,}\b'
-    all_terms.extend(re.findall(capital_pattern, text))
-
-    # Filter out stop words and invalid terms
-    filtered_terms = []
-    for term in all_terms:
-        # Convert to lowercase for stop-word check
-        term_lower = term.lower()
-
-        # Skip if:
-        # - It's a stop word
-        # - Single character
-        # - Pure numbers
-        # - Too short (less than 2 chars)
-        if (term_lower in STOP_WORDS or
-            len(term) < 2 or
-            term.isdigit()):
-            continue
+    counts, first_seen = _scan(text)
+    ranked = rank_terms(counts, ranking, tie_break=first_seen)
 
-        filtered_terms.append(term)
-
-    # Count frequency and rank by most common
-    term_counts = Counter(filtered_terms)
-
-    # Get unique terms ordered by frequency (case-insensitive deduplication)
-    seen_lower = set()
-    ranked_terms = []
-
-    for term, count in term_counts.most_common():
-        term_lower = term.lower()
-        if term_lower not in seen_lower:
-            seen_lower.add(term_lower)
-            ranked_terms.append(term)
-
-            if len(ranked_terms) >= max_terms:
-                break
-
-    return ranked_terms
+    # Unique terms in rank order (case-insensitive deduplication)
+    return dedupe_terms(ranked, max_terms)
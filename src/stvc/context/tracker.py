@@ -0,0 +1,342 @@
+"""Background context tracking driven by foreground-window changes.
+
+Instead of extracting context when push-to-talk is pressed, the tracker
+follows focus changes (debounced, so alt-tabbing through windows doesn't
+trigger a read per window) and keeps a ready-made merged prompt per
+(app type, file path) in a small LRU cache. Looking up the prompt for
+the focused window is then a dict lookup plus, for files, one stat()
+to check the file hasn't been saved since and a check that the
+workspace index hasn't published new project-wide terms since.
+
+Terminal entries can't be validated that cheaply, so while a terminal
+has focus the tracker re-reads its new output every `terminal_poll_s`
+and rebuilds the prompt only if the term ranking changed.
+"""
+
+import collections
+import ctypes
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from .extractors import FILE_APP_TYPES, init_com_thread, parse_file_path, registry
+from .prefetch import Context
+from .window_detect import WindowInfo, detect_app_type, get_active_window
+from .workspace_index import get_workspace_index
+
+try:
+    import win32gui
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+WM_QUIT = 0x0012
+
+
+class PollingFocusSource:
+    """Reports foreground-window changes by polling.
+
+    Args:
+        get_hwnd: Returns the current foreground hwnd (default: win32gui)
+        interval: Seconds between polls
+    """
+
+    def __init__(self, get_hwnd: Callable[[], int] | None = None, interval: float = 0.25):
+        if get_hwnd is None:
+            if not WIN32_AVAILABLE:
+                raise RuntimeError("Focus polling requires pywin32")
+            get_hwnd = win32gui.GetForegroundWindow
+        self._get_hwnd = get_hwnd
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, on_focus: Callable[[int], None]):
+        """Start polling, calling on_focus(hwnd) whenever the foreground window changes."""
+        def poll():
+            last = None
+            while not self._stop.wait(self.interval):
+                hwnd = self._get_hwnd()
+                if hwnd != last:
+                    last = hwnd
+                    on_focus(hwnd)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=poll, name="stvc-focus-poll", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+class WinEventFocusSource:
+    """Reports foreground-window changes through SetWinEventHook.
+
+    The hook is out-of-context, so Windows delivers events to a message
+    loop on this source's own thread; no polling and no DLL injection.
+    """
+
+    def __init__(self):
+        if sys.platform != "win32":
+            raise RuntimeError("WinEvent hooks are only available on Windows")
+        self._thread: threading.Thread | None = None
+        self._thread_id = 0
+        self._proc = None
+
+    def start(self, on_focus: Callable[[int], None]):
+        """Install the hook, calling on_focus(hwnd) on each foreground change."""
+        import ctypes.wintypes as w
+
+        user32 = ctypes.windll.user32
+        proc_type = ctypes.WINFUNCTYPE(None, w.HANDLE, w.DWORD, w.HWND, w.LONG, w.LONG, w.DWORD, w.DWORD)
+
+        def callback(_hook, _event, hwnd, _obj, _child, _thread, _time):
+            try:
+                on_focus(hwnd or 0)
+            except Exception:
+                log.exception("Focus callback failed.")
+
+        # Keep a reference: the hook calls into this for as long as it's installed
+        self._proc = proc_type(callback)
+        ready = threading.Event()
+
+        def loop():
+            self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+            hook = user32.SetWinEventHook(
+                EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, 0, self._proc, 0, 0,
+                WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS,
+            )
+            ready.set()
+            if not hook:
+                log.warning("SetWinEventHook failed; context tracking won't see focus changes.")
+                return
+            msg = w.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+            user32.UnhookWinEvent(hook)
+
+        self._thread = threading.Thread(target=loop, name="stvc-focus-hook", daemon=True)
+        self._thread.start()
+        ready.wait(timeout=1.0)
+
+    def stop(self):
+        """Remove the hook and end its message loop."""
+        if self._thread is not None:
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
+def default_focus_source():
+    """WinEvent hook on Windows, polling where only pywin32 works, else None."""
+    if sys.platform == "win32":
+        return WinEventFocusSource()
+    if WIN32_AVAILABLE:
+        return PollingFocusSource()
+    return None
+
+
+@dataclass
+class _Entry:
+    context: Context
+    path: str | None = None
+    mtime_ns: int | None = None
+    terms: tuple[str, ...] = ()
+    checked_at: float = 0.0
+    index_generation: int | None = None
+
+
+class ContextTracker:
+    """Keeps a merged prompt ready for the focused window.
+
+    Args:
+        merge: Builds the prompt from context terms (e.g. build_prompt
+            bound to the base dictionary)
+        source: Focus source with start(on_focus) and stop()
+        window_info: Returns the foreground WindowInfo
+        debounce: Seconds focus must stay put before its context is read
+        cache_size: Windows whose prompts are kept
+        terminal_poll_s: Seconds between re-reads of a focused terminal
+    """
+
+    def __init__(
+        self,
+        merge: Callable[[list[str]], str],
+        source,
+        window_info: Callable[[], WindowInfo] = get_active_window,
+        debounce: float = 0.25,
+        cache_size: int = 32,
+        terminal_poll_s: float = 2.0,
+    ):
+        self._merge = merge
+        self._source = source
+        self._window_info = window_info
+        self.debounce = debounce
+        self.cache_size = cache_size
+        self.terminal_poll_s = terminal_poll_s
+
+        self._cache: collections.OrderedDict[tuple[str, str], _Entry] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        # Latest hwnd reported by the source vs. the one the cache reflects
+        self._focused_hwnd: int | None = None
+        self._current: tuple[int, tuple[str, str]] | None = None
+
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+
+    def _key(self, info: WindowInfo) -> tuple[str, str]:
+        app_type = detect_app_type(info)
+        if app_type in FILE_APP_TYPES:
+            return app_type, parse_file_path(info.title)
+        if app_type == "terminal":
+            return app_type, str(info.hwnd)
+        return app_type, ""
+
+    def _on_focus(self, hwnd: int):
+        self._focused_hwnd = hwnd
+        self._wake.set()
+
+    def _valid(self, entry: _Entry) -> bool:
+        if entry.path is None:
+            return True
+        index = get_workspace_index()
+        if index is not None and index.generation != entry.index_generation:
+            return False
+        try:
+            return os.stat(entry.path).st_mtime_ns == entry.mtime_ns
+        except OSError:
+            return False
+
+    def _build(self, key: tuple[str, str], info: WindowInfo, previous: _Entry | None) -> _Entry:
+        """Extract content for a window and merge its prompt (tracker thread)."""
+        app_type, path = key
+        entry = _Entry(context=Context(app_type=app_type), checked_at=time.perf_counter())
+        if app_type in FILE_APP_TYPES and path:
+            try:
+                entry.path, entry.mtime_ns = path, os.stat(path).st_mtime_ns
+            except OSError:
+                pass
+
+        index = get_workspace_index()
+        if index is not None:
+            if entry.path is not None:
+                # Loads persisted top terms now rather than invalidating this entry later
+                index.request(entry.path)
+            # Read before extracting: a scan publishing mid-build leaves the entry stale
+            entry.index_generation = index.generation
+        terms = registry.extract_terms(app_type, info, max_terms=50)
+        if app_type == "terminal":
+            # Only new output is tokenized; skip the merge if the ranking didn't move
+            entry.terms = tuple(terms)
+            if previous is not None and previous.terms == entry.terms:
+                entry.context = previous.context
+                return entry
+        if terms:
+            entry.context = Context(prompt=self._merge(terms), app_type=app_type)
+        self.builds += 1
+        return entry
+
+    def refresh(self):
+        """Bring the cache entry for the foreground window up to date."""
+        info = self._window_info()
+        key = self._key(info)
+        with self._lock:
+            entry = self._cache.get(key)
+        terminal_due = (
+            entry is not None and key[0] == "terminal"
+            and time.perf_counter() - entry.checked_at >= self.terminal_poll_s
+        )
+        if entry is None or terminal_due or not self._valid(entry):
+            start = time.perf_counter()
+            entry = self._build(key, info, entry)
+            log.debug("Context tracker: %s %s ready in %.0f ms.", key[0], key[1], (time.perf_counter() - start) * 1000)
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            self._current = (info.hwnd, key)
+
+    def lookup(self) -> Context | None:
+        """Return the prompt for the focused window, or None if it isn't ready.
+
+        Misses while a focus change is still being debounced or processed,
+        or when the file has changed on disk since its prompt was built.
+        """
+        with self._lock:
+            current = self._current
+            entry = self._cache.get(current[1]) if current else None
+        if (
+            entry is None
+            or (self._focused_hwnd is not None and current[0] != self._focused_hwnd)
+            or not self._valid(entry)
+        ):
+            self.misses += 1
+            self._wake.set()
+            return None
+        self.hits += 1
+        return entry.context
+
+    def clear(self):
+        """Drop every cached prompt (e.g. after the base dictionary changed)."""
+        with self._lock:
+            self._cache.clear()
+            self._current = None
+        self._wake.set()
+
+    def _run(self):
+        init_com_thread()
+        while not self._stop.is_set():
+            woke = self._wake.wait(timeout=self.terminal_poll_s)
+            if self._stop.is_set():
+                return
+            if woke:
+                # Debounce: wait until focus stays put for a while
+                self._wake.clear()
+                while self._wake.wait(timeout=self.debounce):
+                    self._wake.clear()
+                    if self._stop.is_set():
+                        return
+            try:
+                self.refresh()
+            except Exception:
+                log.exception("Context tracker refresh failed.")
+
+    def start(self):
+        """Start following focus changes."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stvc-context-tracker", daemon=True)
+        self._thread.start()
+        self._source.start(self._on_focus)
+        self._wake.set()
+
+    def stop(self):
+        """Stop the focus source and the tracker thread."""
+        self._source.stop()
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        log.info(
+            "Context tracker: %d hits, %d misses, %d prompt builds.", self.hits, self.misses, self.builds,
+        )
@@ -1,6 +1,9 @@
 """Active window detection for context-aware transcription."""
 
+import collections
 import logging
+import threading
+import time
 from dataclasses import dataclass
 
 try:
@@ -13,8 +16,14 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# Seconds a cached process is trusted before its create time is re-checked
+PROCESS_CACHE_TTL_S = 30.0
 
-@dataclass
+# Processes whose metadata is kept
+PROCESS_CACHE_SIZE = 64
+
+
+@dataclass(slots=True)
 class WindowInfo:
     """Information about the active foreground window.
 
@@ -30,11 +39,132 @@ class WindowInfo:
     exe_path: str
 
 
+@dataclass(slots=True)
+class _ProcessEntry:
+    create_time: float | None
+    process_name: str
+    exe_path: str
+    checked_at: float
+
+
+class ProcessInfoCache:
+    """LRU of process name and exe path per (pid, create time).
+
+    psutil's name() and exe() open the process each time and can be slow,
+    especially when they end in AccessDenied. Within `ttl` of the last
+    check a cached pid is answered without touching the process at all;
+    after that its create time is re-read (one cheap call) so a reused
+    pid is noticed and looked up afresh. A process that denies even its
+    create time (e.g. an elevated one) is cached empty for `ttl` too.
+
+    Args:
+        ttl: Seconds an entry is trusted without re-checking
+        max_entries: Processes kept, least recently used evicted first
+    """
+
+    def __init__(self, ttl: float = PROCESS_CACHE_TTL_S, max_entries: int = PROCESS_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: collections.OrderedDict[int, _ProcessEntry] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.hit_seconds = 0.0
+        self.miss_seconds = 0.0
+
+    def lookup(self, pid: int) -> tuple[str, str]:
+        """Return (process_name, exe_path) for `pid`; empty strings if unavailable."""
+        start = time.perf_counter()
+        with self._lock:
+            entry = self._entries.get(pid)
+            if entry is not None:
+                self._entries.move_to_end(pid)
+
+        if entry is not None and start - entry.checked_at < self.ttl:
+            return self._hit(entry, start)
+
+        try:
+            proc = psutil.Process(pid)
+            create_time = proc.create_time()
+        except psutil.AccessDenied as e:
+            log.debug(f"Could not get process info for PID {pid}: {e}")
+            self._store(pid, _ProcessEntry(None, "", "", start))
+            self._count_miss(start)
+            return "", ""
+        except psutil.NoSuchProcess as e:
+            log.debug(f"Could not get process info for PID {pid}: {e}")
+            self._forget(pid)
+            self._count_miss(start)
+            return "", ""
+
+        if entry is not None and entry.create_time == create_time:
+            entry.checked_at = start
+            return self._hit(entry, start)
+
+        # New process (or a reused pid): AccessDenied on exe() is cached
+        # too, so elevated windows don't pay for it on every dictation
+        process_name = ""
+        exe_path = ""
+        try:
+            process_name = proc.name()
+            exe_path = proc.exe()
+        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+            log.debug(f"Could not get process info for PID {pid}: {e}")
+
+        self._store(pid, _ProcessEntry(create_time, process_name, exe_path, start))
+        self._count_miss(start)
+        return process_name, exe_path
+
+    def _hit(self, entry: _ProcessEntry, start: float) -> tuple[str, str]:
+        self.hits += 1
+        self.hit_seconds += time.perf_counter() - start
+        return entry.process_name, entry.exe_path
+
+    def _count_miss(self, start: float):
+        self.misses += 1
+        self.miss_seconds += time.perf_counter() - start
+
+    def _store(self, pid: int, entry: _ProcessEntry):
+        with self._lock:
+            self._entries[pid] = entry
+            self._entries.move_to_end(pid)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _forget(self, pid: int):
+        with self._lock:
+            self._entries.pop(pid, None)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that hit (0 if none yet)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> str:
+        """One-line summary for logs."""
+        hit_us = self.hit_seconds / self.hits * 1e6 if self.hits else 0.0
+        miss_us = self.miss_seconds / self.misses * 1e6 if self.misses else 0.0
+        return (
+            f"{len(self._entries)} processes, {self.hits} hits ({hit_us:.0f} us), "
+            f"{self.misses} misses ({miss_us:.0f} us), {self.hit_rate:.0%} hit rate"
+        )
+
+
+# Shared by every get_active_window() call
+process_cache = ProcessInfoCache()
+
+
 def get_active_window() -> WindowInfo:
     """Get information about the currently active foreground window.
 
     Uses Windows API (win32gui) to detect the foreground window and
-    retrieves process information via psutil.
+    retrieves process information via psutil, cached in process_cache.
 
     Returns:
         WindowInfo with hwnd, title, process_name, and exe_path.
@@ -47,6 +177,7 @@ def get_active_window() -> WindowInfo:
         log.error("win32gui, win32process, or psutil not available")
         raise RuntimeError("Window detection requires pywin32 and psutil")
 
+    start = time.perf_counter()
     try:
         # Get foreground window handle
         hwnd = win32gui.GetForegroundWindow()
@@ -60,17 +191,13 @@ def get_active_window() -> WindowInfo:
         # Get process ID from window
         _, pid = win32process.GetWindowThreadProcessId(hwnd)
 
-        # Get process information
-        process_name = ""
-        exe_path = ""
-        try:
-            proc = psutil.Process(pid)
-            process_name = proc.name()
-            exe_path = proc.exe()
-        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-            log.debug(f"Could not get process info for PID {pid}: {e}")
+        # Get process information (cached per process)
+        process_name, exe_path = process_cache.lookup(pid)
 
-        log.debug(f"Active window: hwnd={hwnd}, title='{title}', process='{process_name}'")
+        log.debug(
+            f"Active window: hwnd={hwnd}, title='{title}', process='{process_name}' "
+            f"in {(time.perf_counter() - start) * 1e6:.0f} us"
+        )
         return WindowInfo(
             hwnd=hwnd,
             title=title,
@@ -83,6 +210,28 @@ def get_active_window() -> WindowInfo:
         return WindowInfo(hwnd=0, title="", process_name="", exe_path="")
 
 
+# App types added by plugins: (app_type, process names, title keywords)
+_custom_app_types: list[tuple[str, tuple[str, ...], tuple[str, ...]]] = []
+
+
+def register_app_type(app_type: str, process_names: tuple[str, ...] = (), title_keywords: tuple[str, ...] = ()):
+    """Teach detect_app_type() a new application type.
+
+    Checked after the built-in types. Matching is case-insensitive and by
+    substring, like the built-in rules.
+
+    Args:
+        app_type: Name to return (pair it with extractors.register_extractor())
+        process_names: Executable names, e.g. ("idea64.exe",)
+        title_keywords: Window title fragments, e.g. ("intellij idea",)
+    """
+    _custom_app_types.append((
+        app_type,
+        tuple(name.lower() for name in process_names),
+        tuple(keyword.lower() for keyword in title_keywords),
+    ))
+
+
 def detect_app_type(info: WindowInfo) -> str:
     """Detect the type of application based on window information.
 
@@ -90,7 +239,8 @@ def detect_app_type(info: WindowInfo) -> str:
         info: WindowInfo containing process name and window title
 
     Returns:
-        One of: "vscode", "notepadpp", "terminal", "unknown"
+        One of: "vscode", "notepadpp", "terminal", a registered custom
+        type, or "unknown"
     """
     process_lower = info.process_name.lower()
     title_lower = info.title.lower()
@@ -120,5 +270,11 @@ def detect_app_type(info: WindowInfo) -> str:
     if "windows powershell" in title_lower or "command prompt" in title_lower:
         return "terminal"
 
+    for app_type, process_names, title_keywords in _custom_app_types:
+        if any(name in process_lower for name in process_names):
+            return app_type
+        if any(keyword in title_lower for keyword in title_keywords):
+            return app_type
+
     log.debug(f"Unknown app type: process='{info.process_name}', title='{info.title}'")
     return "unknown"
@@ -0,0 +1,393 @@
+"""Project-wide identifier index for context terms.
+
+The window title only names one file, so identifiers defined in sibling
+modules never reach the prompt. The indexer finds the workspace root of
+the active file (the nearest ancestor holding a .git directory or a
+project manifest), scans its source files on a background thread and
+keeps identifier frequencies in a per-workspace SQLite database under
+~/.stvc/index. Rescans only re-read files whose mtime or size changed.
+
+The push-to-talk path reads the top terms from memory (refreshed after
+each scan) and at most queues a rescan; only the first request for a
+workspace reads its persisted top terms from the database. Every change
+to a workspace's top terms bumps `generation`, so callers caching
+prompts built from them know to rebuild.
+
+Scans stay within `cpu_fraction` of a core: the directory walk, file
+reads and database queries are timed together and the indexer sleeps
+in proportion after each slice of work.
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from stvc.config import INDEX_DIR
+
+from .term_parser import count_terms, dedupe_terms, rank_terms
+
+log = logging.getLogger(__name__)
+
+# Files or directories marking the root of a workspace
+ROOT_MARKERS = (".git", "pyproject.toml", "setup.py", "package.json", "Cargo.toml", "go.mod")
+
+SOURCE_EXTENSIONS = {
+    ".py", ".pyi", ".js", ".jsx", ".ts", ".tsx", ".java", ".kt", ".go", ".rs",
+    ".c", ".h", ".cc", ".cpp", ".hpp", ".cs", ".rb", ".php", ".swift", ".scala",
+    ".sql", ".sh", ".ps1", ".lua",
+}
+
+# Never worth scanning, whether or not .gitignore says so
+SKIP_DIRS = {".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", ".tox", ".mypy_cache"}
+
+# Keep this many top terms in memory per workspace
+TOP_TERMS = 200
+
+# Workspaces are rescanned at most this often
+RESCAN_INTERVAL_S = 60.0
+
+# Work done between throttling sleeps, in seconds
+THROTTLE_SLICE_S = 0.02
+
+
+def find_workspace_root(path: str | Path) -> Path | None:
+    """Nearest ancestor directory of `path` containing a root marker."""
+    current = Path(path).resolve()
+    if current.is_file():
+        current = current.parent
+    for directory in (current, *current.parents):
+        if any((directory / marker).exists() for marker in ROOT_MARKERS):
+            return directory
+    return None
+
+
+def _gitignore_regex(pattern: str) -> str:
+    """Translate one gitignore glob into a regex over '/'-separated paths."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+class GitIgnore:
+    """The rules of one .gitignore file, relative to its directory.
+
+    Supports comments, negation, directory-only patterns (trailing /),
+    anchored patterns (containing /) and * / ? / ** globs.
+    """
+
+    def __init__(self, lines: list[str]):
+        self.rules: list[tuple[re.Pattern, bool, bool]] = []
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            # A leading or inner slash anchors to this directory; a trailing one doesn't
+            anchored = "/" in line
+            body = _gitignore_regex(line.lstrip("/"))
+            regex = body if anchored else f"(?:.*/)?{body}"
+            self.rules.append((re.compile(f"^{regex}$"), negate, dir_only))
+
+    @classmethod
+    def load(cls, directory: Path) -> "GitIgnore | None":
+        path = directory / ".gitignore"
+        try:
+            with open(path, encoding="utf-8", errors="ignore") as f:
+                return cls(f.readlines())
+        except OSError:
+            return None
+
+    def match(self, rel_path: str, is_dir: bool) -> bool | None:
+        """True if ignored, False if re-included, None if no rule applies."""
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negate
+        return result
+
+
+def iter_source_files(root: Path, max_file_bytes: int, max_files: int):
+    """Yield (path, stat) for source files under root that .gitignore doesn't exclude."""
+    count = 0
+    # Stack of (directory, [(gitignore dir, rules), ...] in effect for it)
+    stack = [(root, [])]
+    while stack:
+        directory, inherited = stack.pop()
+        rules = inherited
+        gitignore = GitIgnore.load(directory)
+        if gitignore is not None:
+            rules = [*inherited, (directory, gitignore)]
+
+        try:
+            entries = sorted(os.scandir(directory), key=lambda e: e.name)
+        except OSError:
+            continue
+
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir and entry.name in SKIP_DIRS:
+                continue
+            if not is_dir and os.path.splitext(entry.name)[1].lower() not in SOURCE_EXTENSIONS:
+                continue
+
+            ignored = False
+            for base, gitignore in rules:
+                rel = Path(entry.path).relative_to(base).as_posix()
+                verdict = gitignore.match(rel, is_dir)
+                if verdict is not None:
+                    ignored = verdict
+            if ignored:
+                continue
+
+            if is_dir:
+                stack.append((Path(entry.path), rules))
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if stat.st_size > max_file_bytes:
+                continue
+            yield Path(entry.path), stat
+            count += 1
+            if count >= max_files:
+                log.info("Workspace index: %s has more than %d source files, stopping there.", root, max_files)
+                return
+
+
+class WorkspaceIndex:
+    """Background, incremental identifier index of the active file's workspace.
+
+    Args:
+        index_dir: Where the per-workspace SQLite databases live
+        max_file_bytes: Larger files are skipped
+        max_files: Source files indexed per workspace at most
+        cpu_fraction: Share of one core the indexer may use; it sleeps
+            between files to stay under it
+    """
+
+    def __init__(
+        self,
+        index_dir: Path = INDEX_DIR,
+        max_file_bytes: int = 256 * 1024,
+        max_files: int = 5000,
+        cpu_fraction: float = 0.25,
+    ):
+        self.index_dir = Path(index_dir)
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self.cpu_fraction = min(max(cpu_fraction, 0.01), 1.0)
+
+        self._roots: dict[Path, Path | None] = {}
+        self._top: dict[Path, list[str]] = {}
+        self.generation = 0
+        self._scanned_at: dict[Path, float] = {}
+        self._pending: queue.Queue[Path | None] = queue.Queue()
+        self._queued: set[Path] = set()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _root_for(self, path: str) -> Path | None:
+        directory = Path(path).parent
+        if directory not in self._roots:
+            self._roots[directory] = find_workspace_root(directory)
+        return self._roots[directory]
+
+    def _db_path(self, root: Path) -> Path:
+        digest = hashlib.sha1(str(root).lower().encode()).hexdigest()[:12]
+        return self.index_dir / f"{root.name}-{digest}.sqlite"
+
+    def _connect(self, root: Path) -> sqlite3.Connection:
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self._db_path(root))
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER);
+            CREATE TABLE IF NOT EXISTS terms (path TEXT, term TEXT, count INTEGER);
+            CREATE INDEX IF NOT EXISTS terms_path ON terms (path);
+        """)
+        return db
+
+    def request(self, path: str) -> None:
+        """Queue the workspace containing `path` for a (re)scan if it's due.
+
+        Doesn't wait for the scan. The first request for a workspace loads
+        its persisted top terms, if there are any, so they are served
+        right away.
+        """
+        root = self._root_for(path)
+        if root is None:
+            return
+        if root not in self._top and self._db_path(root).exists():
+            db = self._connect(root)
+            try:
+                self._publish(root, self._load_top(db))
+            finally:
+                db.close()
+        with self._lock:
+            due = time.monotonic() - self._scanned_at.get(root, float("-inf")) >= RESCAN_INTERVAL_S
+            if not due or root in self._queued:
+                return
+            self._queued.add(root)
+        self._pending.put(root)
+
+    def top_terms(self, path: str, max_terms: int = 50) -> list[str]:
+        """Most frequent identifiers of the workspace containing `path` (from memory)."""
+        root = self._root_for(path)
+        if root is None:
+            return []
+        return self._top.get(root, [])[:max_terms]
+
+    def _throttle(self, busy: float):
+        """Sleep long enough that `busy` seconds of work stay within cpu_fraction."""
+        if self.cpu_fraction < 1.0:
+            time.sleep(busy * (1.0 / self.cpu_fraction - 1.0))
+
+    def _publish(self, root: Path, top: list[str]):
+        """Serve `top` for `root`, bumping the generation if it changed."""
+        with self._lock:
+            if self._top.get(root) != top:
+                self._top[root] = top
+                self.generation += 1
+
+    def _load_top(self, db: sqlite3.Connection) -> list[str]:
+        # Rank a wider pool by frequency, then re-rank it (by distinctiveness)
+        rows = db.execute(
+            "SELECT term, SUM(count) AS total FROM terms GROUP BY term ORDER BY total DESC, term LIMIT ?",
+            (TOP_TERMS * 5,),
+        ).fetchall()
+        return dedupe_terms(rank_terms(dict(rows)), TOP_TERMS)
+
+    def scan(self, root: Path) -> int:
+        """Bring the index of `root` up to date; returns the number of files re-read."""
+        start = time.perf_counter()
+        busy_since = start
+
+        def throttle():
+            # Called between units of work; sleeps once a slice has been used
+            nonlocal busy_since
+            busy = time.perf_counter() - busy_since
+            if busy >= THROTTLE_SLICE_S:
+                self._throttle(busy)
+                busy_since = time.perf_counter()
+
+        db = self._connect(root)
+        try:
+            if root not in self._top:
+                # Serve the persisted index while the rescan runs
+                self._publish(root, self._load_top(db))
+                throttle()
+
+            known = {path: (mtime, size) for path, mtime, size in db.execute("SELECT path, mtime_ns, size FROM files")}
+            seen = set()
+            changed = 0
+            for path, stat in iter_source_files(root, self.max_file_bytes, self.max_files):
+                # Covers the walk (scandir, stat, .gitignore matching) up to here
+                throttle()
+                if self._stopping.is_set():
+                    return changed
+                key = str(path)
+                seen.add(key)
+                if known.get(key) == (stat.st_mtime_ns, stat.st_size):
+                    continue
+
+                try:
+                    with open(path, encoding="utf-8", errors="ignore") as f:
+                        counts = count_terms(f.read(self.max_file_bytes))
+                except OSError:
+                    continue
+                with db:
+                    db.execute("DELETE FROM terms WHERE path = ?", (key,))
+                    db.executemany("INSERT INTO terms VALUES (?, ?, ?)", [(key, t, n) for t, n in counts.items()])
+                    db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?)", (key, stat.st_mtime_ns, stat.st_size))
+                changed += 1
+
+            removed = [path for path in known if path not in seen]
+            if removed:
+                with db:
+                    db.executemany("DELETE FROM terms WHERE path = ?", [(p,) for p in removed])
+                    db.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+
+            if changed or removed or not self._top.get(root):
+                self._publish(root, self._load_top(db))
+        finally:
+            db.close()
+        self._throttle(time.perf_counter() - busy_since)
+
+        log.info(
+            "Workspace index: %s, %d files, %d re-read, %d removed in %.1fs.",
+            root, len(seen), changed, len(removed), time.perf_counter() - start,
+        )
+        return changed
+
+    def _run(self):
+        while True:
+            root = self._pending.get()
+            if root is None:
+                return
+            try:
+                self.scan(root)
+            except Exception:
+                log.exception("Workspace index: scanning %s failed.", root)
+            with self._lock:
+                self._queued.discard(root)
+                self._scanned_at[root] = time.monotonic()
+
+    def start(self):
+        """Start the indexer thread."""
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="stvc-workspace-index", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the indexer after the current file."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._pending.put(None)
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+
+_workspace_index: WorkspaceIndex | None = None
+
+
+def set_workspace_index(index: WorkspaceIndex | None) -> None:
+    """Make file-based extractors draw project-wide terms from `index` (None to stop)."""
+    global _workspace_index
+    _workspace_index = index
+
+
+def get_workspace_index() -> WorkspaceIndex | None:
+    """The registered WorkspaceIndex, if any."""
+    return _workspace_index
@@ -0,0 +1,146 @@
+"""Stand-ins for the Whisper model, text injector and other reference code.
+
+They let the transcribe -> post-process -> inject path run without a
+GPU, model download or Windows session, e.g. to check segment ordering
+and spacing or to time the pipeline around a known decode speed.
+
+    transcriber = Transcriber(...)
+    transcriber.use_model(FakeWhisperModel(["Hello there.", "How are you?"], delay=0.2))
+    injector = FakeInjector()
+    focus = FakeFocusSource()   # for ContextTracker; focus.focus(hwnd) switches windows
+    terminal = FakeTextProvider()   # for TerminalExtractor; terminal.write(hwnd, text)
+    reference_extract_terms(text)   # golden output for term_parser.extract_terms
+"""
+
+import re
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+from stvc.context.extractors import TerminalTextProvider
+from stvc.context.term_parser import STOP_WORDS
+
+
+class FakeWhisperModel:
+    """Mimics faster_whisper.WhisperModel.transcribe with canned segments.
+
+    Segments are produced lazily, `delay` seconds apart, the way
+    faster-whisper decodes one window at a time.
+
+    Args:
+        texts: Segment texts to return, in order
+        delay: Seconds of simulated decoding per segment
+    """
+
+    def __init__(self, texts: list[str], delay: float = 0.0):
+        self.texts = list(texts)
+        self.delay = delay
+        self.calls: list[dict] = []
+
+    def _segments(self, duration: float):
+        step = duration / max(len(self.texts), 1)
+        for i, text in enumerate(self.texts):
+            if self.delay:
+                time.sleep(self.delay)
+            yield SimpleNamespace(text=f" {text}", start=i * step, end=(i + 1) * step, words=[])
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        duration = len(audio) / 16000
+        info = SimpleNamespace(language=kwargs.get("language", "en"), duration=duration)
+        return self._segments(duration), info
+
+
+class FakeInjector:
+    """Records injected text instead of sending keystrokes.
+
+    Call it in place of stvc.injector.inject_text.
+    """
+
+    def __init__(self):
+        self.calls: list[tuple[float, str]] = []
+
+    def __call__(self, text: str) -> int:
+        self.calls.append((time.perf_counter(), text))
+        return len(text) * 2
+
+    @property
+    def text(self) -> str:
+        """Everything injected so far, concatenated."""
+        return "".join(text for _, text in self.calls)
+
+    @property
+    def first_at(self) -> float | None:
+        """perf_counter() of the first injection, if any."""
+        return self.calls[0][0] if self.calls else None
+
+
+class FakeFocusSource:
+    """Focus source for ContextTracker driven by explicit focus() calls."""
+
+    def __init__(self):
+        self._on_focus = None
+
+    def start(self, on_focus):
+        self._on_focus = on_focus
+
+    def stop(self):
+        self._on_focus = None
+
+    def focus(self, hwnd: int):
+        """Simulate the window `hwnd` coming to the foreground."""
+        if self._on_focus is not None:
+            self._on_focus(hwnd)
+
+
+class FakeTextProvider(TerminalTextProvider):
+    """Terminal text provider backed by in-memory buffers, one per hwnd."""
+
+    def __init__(self):
+        self.buffers: dict[int, list[str]] = {}
+        self.reads = 0
+
+    def write(self, hwnd: int, text: str):
+        """Append output to a terminal's buffer."""
+        lines = self.buffers.setdefault(hwnd, [""])
+        first, *rest = text.split("\n")
+        lines[-1] += first
+        lines.extend(rest)
+
+    def clear(self, hwnd: int):
+        """Simulate `cls` / `clear`."""
+        self.buffers[hwnd] = [""]
+
+    def read_tail(self, hwnd: int, max_lines: int) -> str:
+        self.reads += 1
+        return "\n".join(self.buffers.get(hwnd, [""])[-max_lines:])
+
+
+def reference_extract_terms(text: str, max_terms: int = 50) -> list[str]:
+    """The original six-pass extract_terms, kept as the golden reference.
+
+    The single-pass extract_terms(ranking="frequency") must return the same list.
+    """
+    if not text:
+        return []
+    all_terms = []
+    for pattern in (
+        r'\b[a-z]+[A-Z][a-zA-Z0-9]*\b',
+        r'\b[A-Z][a-z]+[A-Z][a-zA-Z0-9]*\b',
+        r'\b[a-z]+_[a-z0-9_]+\b',
+        r'\b[A-Z]+_[A-Z0-9_]+\b',
+        r'\b[a-z_][a-z0-9_]*\.[a-z_][a-z0-9_.]*\b',
+        r'\b[A-Z][a-z]{2,}\b',
+    ):
+        all_terms.extend(re.findall(pattern, text))
+    filtered = [t for t in all_terms if not (t.lower() in STOP_WORDS or len(t) < 2 or t.isdigit())]
+
+    seen_lower = set()
+    ranked = []
+    for term, _ in Counter(filtered).most_common():
+        if term.lower() not in seen_lower:
+            seen_lower.add(term.lower())
+            ranked.append(term)
+            if len(ranked) >= max_terms:
+                break
+    return ranked
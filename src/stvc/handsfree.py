@@ -0,0 +1,278 @@
+"""Hands-free continuous dictation with VAD endpointing.
+
+One long-lived capture source feeds a streaming VAD segmenter. Each
+finished speech segment is queued for transcription while capture keeps
+going, so the user can keep talking while the previous phrase decodes.
+"""
+
+import collections
+import logging
+import queue
+import threading
+import time
+from typing import Callable
+
+import numpy as np
+
+from stvc.audio import (
+    SAMPLE_RATE, VAD_FLOOR_DB, VAD_FRAME_MS, VAD_MARGIN_DB, VAD_ZCR_THRESHOLD,
+    frame_features,
+)
+
+log = logging.getLogger(__name__)
+
+
+class VadSegmenter:
+    """Streaming speech endpointer over arbitrary-sized audio blocks.
+
+    Audio is cut into 30 ms frames and classified by energy and
+    zero-crossing rate against a noise floor: a low percentile of the
+    energy of every frame in the last `floor_window_s`, so a room that
+    gets louder is absorbed within seconds whether or not its noise
+    passes for speech. A segment opens after `min_speech_ms` of speech
+    and closes after `min_silence_ms` of silence, with `speech_pad_ms`
+    of context kept on both sides. Segments longer than `max_segment_s`
+    are cut so a monologue still gets transcribed incrementally.
+    Segments that, by the floor at the time they end, hardly rise above
+    the background (e.g. opened when the noise first came up) are
+    dropped instead of being sent to the model.
+    """
+
+    # Percentile of recent frame energies taken as the noise floor
+    FLOOR_PERCENTILE = 10.0
+
+    # A segment needs this share of frames above the final threshold
+    MIN_SPEECH_FRACTION = 0.1
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        min_speech_ms: int = 300,
+        min_silence_ms: int = 1000,
+        speech_pad_ms: int = 300,
+        max_segment_s: float = 30.0,
+        floor_db: float = VAD_FLOOR_DB,
+        margin_db: float = VAD_MARGIN_DB,
+        floor_window_s: float = 10.0,
+    ):
+        self.sample_rate = sample_rate
+        self.floor_db = floor_db
+        self.margin_db = margin_db
+        self._frame = int(sample_rate * VAD_FRAME_MS / 1000)
+        self._min_speech = max(1, min_speech_ms // VAD_FRAME_MS)
+        self._min_silence = max(1, min_silence_ms // VAD_FRAME_MS)
+        self._pad = speech_pad_ms // VAD_FRAME_MS
+        self._max_frames = int(max_segment_s * 1000 / VAD_FRAME_MS)
+
+        self._leftover = np.zeros(0, dtype=np.float32)
+        self._history = np.zeros(max(1, int(floor_window_s * 1000 / VAD_FRAME_MS)), dtype=np.float32)
+        self._history_len = 0
+        self._history_pos = 0
+        self._noise_floor = floor_db
+        self._segment_db: list[float] = []
+        self._preroll_db: collections.deque[float] = collections.deque(maxlen=self._pad + self._min_speech)
+        self._preroll: collections.deque[np.ndarray] = collections.deque(maxlen=self._pad + self._min_speech)
+        self._segment: list[np.ndarray] = []
+        self._in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
+
+    def _threshold(self) -> float:
+        return max(self.floor_db, self._noise_floor + self.margin_db)
+
+    def _is_speech(self, energy_db: float, zcr: float) -> bool:
+        """Update the noise floor with this frame, then classify it."""
+        self._history[self._history_pos] = energy_db
+        self._history_pos = (self._history_pos + 1) % self._history.size
+        self._history_len = min(self._history_len + 1, self._history.size)
+        self._noise_floor = float(np.percentile(self._history[:self._history_len], self.FLOOR_PERCENTILE))
+
+        threshold = self._threshold()
+        return energy_db > threshold or (
+            energy_db > threshold - 6 and energy_db > self.floor_db and zcr > VAD_ZCR_THRESHOLD
+        )
+
+    def _emit(self, frames: list[np.ndarray], energies: list[float], finished: list[np.ndarray]):
+        """Append a segment to `finished` unless it is only background noise."""
+        threshold = self._threshold()
+        loud = sum(e > threshold for e in energies)
+        if loud < self.MIN_SPEECH_FRACTION * len(energies):
+            log.debug(
+                "VAD: dropped a %.1fs segment at the noise floor (%.0f dBFS).",
+                len(frames) * VAD_FRAME_MS / 1000, self._noise_floor,
+            )
+            return
+        finished.append(np.concatenate(frames))
+
+    def feed(self, block: np.ndarray) -> list[np.ndarray]:
+        """Consume a block of audio and return any segments it completed."""
+        audio = np.concatenate((self._leftover, block)) if self._leftover.size else block
+        n = audio.size // self._frame
+        self._leftover = audio[n * self._frame:].copy()
+        if n == 0:
+            return []
+
+        frames = audio[:n * self._frame].reshape(n, self._frame)
+        energy_db, zcr = frame_features(frames)
+
+        finished = []
+        for frame, e, z in zip(frames, energy_db, zcr):
+            e = float(e)
+            speech = self._is_speech(e, float(z))
+
+            if not self._in_speech:
+                self._preroll.append(frame)
+                self._preroll_db.append(e)
+                self._speech_run = self._speech_run + 1 if speech else 0
+                if self._speech_run >= self._min_speech:
+                    self._in_speech = True
+                    self._segment = list(self._preroll)
+                    self._segment_db = list(self._preroll_db)
+                    self._preroll.clear()
+                    self._preroll_db.clear()
+                    self._silence_run = 0
+                continue
+
+            self._segment.append(frame)
+            self._segment_db.append(e)
+            self._silence_run = 0 if speech else self._silence_run + 1
+
+            if self._silence_run >= self._min_silence:
+                keep = len(self._segment) - self._silence_run + self._pad
+                self._emit(self._segment[:keep], self._segment_db[:keep], finished)
+                self._segment = []
+                self._segment_db = []
+                self._in_speech = False
+                self._speech_run = 0
+            elif len(self._segment) >= self._max_frames:
+                self._emit(self._segment, self._segment_db, finished)
+                self._segment = []
+                self._segment_db = []
+
+        return finished
+
+    def flush(self) -> np.ndarray | None:
+        """Return the segment in progress, if any, and reset."""
+        finished = []
+        if self._in_speech and self._segment:
+            keep = len(self._segment) - max(self._silence_run - self._pad, 0)
+            self._emit(self._segment[:keep], self._segment_db[:keep], finished)
+        self._segment = []
+        self._segment_db = []
+        self._preroll.clear()
+        self._preroll_db.clear()
+        self._in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
+        return finished[0] if finished else None
+
+
+class HandsFreeDictation:
+    """Continuous-listen pipeline: capture -> VAD segmenter -> transcription queue.
+
+    A capture thread reads blocks from `source` (MicrophoneSource or
+    WavFileSource) and feeds the segmenter; a worker thread pulls
+    finished segments off a bounded queue and hands them to
+    `on_segment`, which transcribes and injects. Real-time factor is
+    processing time divided by speech duration; it must stay below 1
+    for the pipeline to keep up.
+
+    Args:
+        source: Object with blocks() iterator and close()
+        on_segment: Called with each speech segment on the worker thread
+        segmenter: VadSegmenter to use (default settings if None)
+        queue_size: Segments allowed to wait for transcription
+    """
+
+    def __init__(
+        self,
+        source,
+        on_segment: Callable[[np.ndarray], None],
+        segmenter: VadSegmenter | None = None,
+        queue_size: int = 8,
+    ):
+        self._source = source
+        self._on_segment = on_segment
+        self._segmenter = segmenter or VadSegmenter()
+        self._segments: queue.Queue[np.ndarray | None] = queue.Queue(maxsize=queue_size)
+        self._capture_thread: threading.Thread | None = None
+        self._worker_thread: threading.Thread | None = None
+
+        self.captured_seconds = 0.0
+        self.speech_seconds = 0.0
+        self.processing_seconds = 0.0
+        self.segment_count = 0
+
+    @property
+    def real_time_factor(self) -> float:
+        """Total processing time over total speech time (0 if nothing processed)."""
+        if self.speech_seconds == 0:
+            return 0.0
+        return self.processing_seconds / self.speech_seconds
+
+    def _enqueue(self, segment: np.ndarray):
+        if self._segments.full():
+            log.warning("Hands-free transcription is falling behind (%d segments queued).", self._segments.qsize())
+        self._segments.put(segment)
+
+    def _capture(self):
+        sample_rate = self._segmenter.sample_rate
+        try:
+            for block in self._source.blocks():
+                self.captured_seconds += block.size / sample_rate
+                for segment in self._segmenter.feed(block):
+                    self._enqueue(segment)
+            segment = self._segmenter.flush()
+            if segment is not None:
+                self._enqueue(segment)
+        except Exception:
+            log.exception("Hands-free capture failed.")
+        finally:
+            self._segments.put(None)
+
+    def _work(self):
+        sample_rate = self._segmenter.sample_rate
+        while True:
+            segment = self._segments.get()
+            if segment is None:
+                return
+            duration = segment.size / sample_rate
+            start = time.perf_counter()
+            try:
+                self._on_segment(segment)
+            except Exception:
+                log.exception("Hands-free segment processing failed.")
+            elapsed = time.perf_counter() - start
+
+            self.segment_count += 1
+            self.speech_seconds += duration
+            self.processing_seconds += elapsed
+            log.info(
+                "Segment %d: %.2fs speech processed in %.0f ms (RTF %.2f, overall %.2f).",
+                self.segment_count, duration, elapsed * 1000,
+                elapsed / duration if duration else 0.0, self.real_time_factor,
+            )
+
+    def start(self):
+        """Start capture and transcription threads."""
+        self._capture_thread = threading.Thread(target=self._capture, name="stvc-handsfree-capture", daemon=True)
+        self._worker_thread = threading.Thread(target=self._work, name="stvc-handsfree-worker", daemon=True)
+        self._worker_thread.start()
+        self._capture_thread.start()
+        log.info("Hands-free dictation started.")
+
+    def wait(self):
+        """Block until the source is exhausted and every segment is processed."""
+        if self._capture_thread is not None:
+            self._capture_thread.join()
+        if self._worker_thread is not None:
+            self._worker_thread.join()
+
+    def stop(self):
+        """Close the source and wait for queued segments to finish."""
+        self._source.close()
+        self.wait()
+        log.info(
+            "Hands-free dictation stopped: %d segments, %.1fs speech of %.1fs captured, RTF %.2f.",
+            self.segment_count, self.speech_seconds, self.captured_seconds, self.real_time_factor,
+        )
@@ -1,6 +1,7 @@
 """Global push-to-talk hotkey listener using pynput."""
 
 import logging
+import time
 from typing import Callable
 
 from pynput import keyboard
@@ -28,6 +29,9 @@ SPECIAL_KEY_MAP = {
 # F13=0x7C(124), F14=0x7D(125), ..., F24=0x87(135)
 SPECIAL_VK_MAP = {f"f{i}": 0x7C + (i - 13) for i in range(13, 25)}
 
+# Hook callbacks slower than this risk Windows dropping the low-level hook
+SLOW_CALLBACK_MS = 5.0
+
 
 def parse_hotkey(hotkey_str: str) -> tuple[set[str], str]:
     """Parse a hotkey string like 'ctrl+f13' into modifier set and key.
@@ -45,7 +49,9 @@ class HotkeyListener:
     """Listens for a push-to-talk hotkey combination.
 
     Calls on_press when the hotkey is pressed, on_release when released.
-    Uses pynput's low-level keyboard hook (no admin required).
+    Uses pynput's low-level keyboard hook (no admin required), so the
+    callbacks run on the hook thread and must return quickly; their
+    duration is tracked in callback_count / callback_max_ms.
     """
 
     def __init__(
@@ -60,6 +66,9 @@ class HotkeyListener:
         self._pressed_modifiers: set[keyboard.Key] = set()
         self._hotkey_active = False
         self._listener: keyboard.Listener | None = None
+        self.callback_count = 0
+        self.callback_total_ms = 0.0
+        self.callback_max_ms = 0.0
 
         # Resolve the main key to a pynput Key or vk code
         self._special_key = SPECIAL_KEY_MAP.get(self._key)
@@ -95,6 +104,23 @@ class HotkeyListener:
         except AttributeError:
             return False
 
+    def _dispatch(self, callback: Callable[[], None] | None, name: str):
+        """Invoke a user callback on the hook thread and record how long it took."""
+        if callback is None:
+            return
+        start = time.perf_counter()
+        try:
+            callback()
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.callback_count += 1
+            self.callback_total_ms += elapsed_ms
+            self.callback_max_ms = max(self.callback_max_ms, elapsed_ms)
+            if elapsed_ms > SLOW_CALLBACK_MS:
+                log.warning("Hotkey %s callback blocked the hook for %.1f ms.", name, elapsed_ms)
+            else:
+                log.debug("Hotkey %s callback took %.3f ms.", name, elapsed_ms)
+
     def _handle_press(self, key):
         """Handle key press events."""
         # Track modifier state
@@ -107,8 +133,7 @@ class HotkeyListener:
         if self._key_matches(key) and self._modifier_match() and not self._hotkey_active:
             self._hotkey_active = True
             log.debug("PTT hotkey pressed.")
-            if self._on_press:
-                self._on_press()
+            self._dispatch(self._on_press, "press")
 
     def _handle_release(self, key):
         """Handle key release events."""
@@ -119,16 +144,14 @@ class HotkeyListener:
                 if self._hotkey_active and not self._modifier_match():
                     self._hotkey_active = False
                     log.debug("PTT modifier released.")
-                    if self._on_release:
-                        self._on_release()
+                    self._dispatch(self._on_release, "release")
                 return
 
         # Check if main key released
         if self._key_matches(key) and self._hotkey_active:
             self._hotkey_active = False
             log.debug("PTT hotkey released.")
-            if self._on_release:
-                self._on_release()
+            self._dispatch(self._on_release, "release")
 
     def start(self):
         """Start listening for the hotkey in a background thread."""
@@ -145,7 +168,13 @@ class HotkeyListener:
         if self._listener is not None:
             self._listener.stop()
             self._listener = None
-        log.info("Hotkey listener stopped.")
+        if self.callback_count:
+            log.info(
+                "Hotkey listener stopped (%d callbacks, avg %.3f ms, max %.3f ms).",
+                self.callback_count, self.callback_total_ms / self.callback_count, self.callback_max_ms,
+            )
+        else:
+            log.info("Hotkey listener stopped.")
 
     def update_hotkey(self, hotkey_str: str) -> None:
         """Update the hotkey combination and restart listener.
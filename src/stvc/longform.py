@@ -0,0 +1,140 @@
+"""Chunked transcription for long dictations.
+
+Long recordings are cut at VAD pauses into chunks of at most 30s
+(Whisper's window) and decoded together through faster-whisper's
+BatchedInferencePipeline, on CPU as well as GPU.
+
+On CPU, batching beats model replicas: one replica already spreads a
+decode over all cpu_threads, and each extra replica (num_workers) costs
+the model's memory again while splitting the same cores, whereas a batch
+turns batch_size windows into one larger matrix product on the one
+model. The price is activation memory for batch_size windows at once,
+and no conditioning on previous text across chunks, which the overlap
+removal below makes up for at split points. `python -m stvc.bench
+longform` compares it with one sequential transcribe() call.
+
+Chunk texts are stitched back in order; chunks that had to be
+hard-split inside speech overlap slightly, and the duplicated words are
+removed at the seam.
+"""
+
+import logging
+
+import numpy as np
+
+from stvc.audio import SAMPLE_RATE, detect_speech
+from stvc.transcriber import DecodeProfile, Transcriber
+
+log = logging.getLogger(__name__)
+
+MAX_CHUNK_SECONDS = 30.0
+SPLIT_OVERLAP_SECONDS = 1.0
+
+# Longest run of words checked when removing overlap between chunks
+MAX_OVERLAP_WORDS = 12
+
+
+def plan_chunks(
+    speech_timestamps: list[tuple[int, int]],
+    total_samples: int,
+    max_chunk_s: float = MAX_CHUNK_SECONDS,
+    overlap_s: float = SPLIT_OVERLAP_SECONDS,
+    sample_rate: int = SAMPLE_RATE,
+) -> list[tuple[int, int]]:
+    """Pack speech segments into chunks no longer than `max_chunk_s`.
+
+    Consecutive segments are merged while they fit; a single segment
+    longer than the limit is split with `overlap_s` of shared audio so
+    the word at the cut is heard whole by at least one chunk.
+
+    Returns:
+        List of (start, end) sample offsets in order.
+    """
+    max_len = int(max_chunk_s * sample_rate)
+    overlap = int(overlap_s * sample_rate)
+    if not speech_timestamps:
+        speech_timestamps = [(0, total_samples)]
+
+    chunks: list[tuple[int, int]] = []
+    for start, end in speech_timestamps:
+        if chunks and end - chunks[-1][0] <= max_len:
+            chunks[-1] = (chunks[-1][0], end)
+            continue
+        while end - start > max_len:
+            chunks.append((start, start + max_len))
+            start += max_len - overlap
+        chunks.append((start, end))
+    return chunks
+
+
+def _words(text: str) -> list[str]:
+    return [w.strip(".,!?;:").lower() for w in text.split()]
+
+
+def stitch(texts: list[str], overlapping: list[bool] | None = None) -> str:
+    """Join chunk texts in order, dropping words repeated across a seam.
+
+    Args:
+        texts: Chunk transcripts in order
+        overlapping: Per chunk, whether its audio overlaps the previous
+            chunk; only those seams are deduplicated (all if None)
+    """
+    result: list[str] = []
+    for i, text in enumerate(texts):
+        words = text.split()
+        if result and words and (overlapping is None or overlapping[i]):
+            tail, head = _words(" ".join(result[-MAX_OVERLAP_WORDS:])), _words(" ".join(words[:MAX_OVERLAP_WORDS]))
+            for k in range(min(len(tail), len(head)), 0, -1):
+                if tail[-k:] == head[:k]:
+                    words = words[k:]
+                    break
+        result.extend(words)
+    return " ".join(result)
+
+
+class LongFormTranscriber:
+    """Chunked, batched transcription on top of a Transcriber's loaded model.
+
+    Args:
+        transcriber: Transcriber whose model, settings and decode guard are reused
+        batch_size: Chunks decoded per batch
+        max_chunk_s: Maximum chunk length in seconds
+    """
+
+    def __init__(self, transcriber: Transcriber, batch_size: int = 8, max_chunk_s: float = MAX_CHUNK_SECONDS):
+        self._transcriber = transcriber
+        self.batch_size = batch_size
+        self.max_chunk_s = max_chunk_s
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        initial_prompt: str | None = None,
+        speech_timestamps: list[tuple[int, int]] | None = None,
+        profile: DecodeProfile | None = None,
+    ) -> str:
+        """Transcribe a long recording in chunks.
+
+        Args:
+            audio: 16kHz float32 mono audio
+            initial_prompt: Prompt for every chunk (None uses the base prompt)
+            speech_timestamps: Speech spans from trim_silence(); detected if None
+            profile: Optional decode profile, as for Transcriber.transcribe()
+
+        Returns:
+            Stitched transcript.
+        """
+        self._transcriber.load_model()
+        if audio.size == 0:
+            return ""
+
+        if speech_timestamps is None:
+            speech_timestamps = detect_speech(audio)
+        chunks = plan_chunks(speech_timestamps, audio.size, self.max_chunk_s)
+        texts = self._transcriber.transcribe_chunks(
+            audio, chunks, initial_prompt=initial_prompt, profile=profile, batch_size=self.batch_size,
+        )
+
+        log.info("Long-form: %.1fs of audio in %d chunks.", audio.size / SAMPLE_RATE, len(chunks))
+        overlapping = [i > 0 and chunks[i][0] < chunks[i - 1][1] for i in range(len(chunks))]
+        return stitch(texts, overlapping)
@@ -0,0 +1,256 @@
+"""Offline-first local store of CTranslate2 Whisper models.
+
+Models live under ~/.stvc/models/<name>/ and are listed in
+~/.stvc/models/registry.json with per-file sizes and SHA-256 checksums.
+Registered names resolve to their directory and load without touching
+the network; unregistered names are tried from the Hugging Face cache
+with local_files_only. Nothing is downloaded at load time unless
+``allow_download = true`` is set in the [model] config; otherwise store
+the model first with the `download` command.
+
+Usage:
+    python -m stvc.models list
+    python -m stvc.models download large-v3-turbo
+    python -m stvc.models import my-model C:\\path\\to\\ct2-model
+    python -m stvc.models convert openai/whisper-small.en small.en [--quantization int8]
+    python -m stvc.models verify [name]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from stvc.config import MODELS_DIR
+
+log = logging.getLogger(__name__)
+
+REGISTRY_PATH = MODELS_DIR / "registry.json"
+
+# Files faster-whisper needs besides model.bin
+TOKENIZER_FILES = ["tokenizer.json", "preprocessor_config.json"]
+
+
+def _load_registry() -> dict:
+    if not REGISTRY_PATH.exists():
+        return {}
+    try:
+        with open(REGISTRY_PATH) as f:
+            return json.load(f)
+    except Exception as e:
+        log.warning(f"Failed to read model registry {REGISTRY_PATH}: {e}")
+        return {}
+
+
+def _save_registry(registry: dict) -> None:
+    MODELS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(REGISTRY_PATH, "w") as f:
+        json.dump(registry, f, indent=2)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _describe_files(model_dir: Path) -> dict:
+    """Size and SHA-256 of every file in a model directory."""
+    return {
+        str(path.relative_to(model_dir)): {"size": path.stat().st_size, "sha256": _sha256(path)}
+        for path in sorted(model_dir.rglob("*"))
+        if path.is_file()
+    }
+
+
+def register_model(name: str, model_dir: Path, source: str) -> dict:
+    """Checksum a model directory and record it in the registry."""
+    if not (model_dir / "model.bin").exists():
+        raise ValueError(f"{model_dir} is not a CTranslate2 model (no model.bin)")
+
+    entry = {
+        "path": str(model_dir),
+        "source": source,
+        "added": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "files": _describe_files(model_dir),
+    }
+    registry = _load_registry()
+    registry[name] = entry
+    _save_registry(registry)
+    log.info("Registered model '%s' at %s.", name, model_dir)
+    return entry
+
+
+def resolve_model(name: str) -> str | None:
+    """Resolve a model name to a local CTranslate2 directory.
+
+    Existing directories are returned as-is. Registered models get a
+    cheap size check (full checksums are left to `verify`). Returns None
+    if the model isn't available locally.
+    """
+    if Path(name).is_dir():
+        return name
+
+    entry = _load_registry().get(name)
+    if entry is None:
+        return None
+
+    model_dir = Path(entry["path"])
+    for rel, info in entry.get("files", {}).items():
+        path = model_dir / rel
+        if not path.is_file() or path.stat().st_size != info["size"]:
+            log.warning("Registered model '%s' is incomplete (%s); ignoring it.", name, rel)
+            return None
+    return str(model_dir)
+
+
+def verify_model(name: str) -> bool:
+    """Recompute checksums of a registered model against the registry."""
+    entry = _load_registry().get(name)
+    if entry is None:
+        raise KeyError(f"Model '{name}' is not registered")
+
+    model_dir = Path(entry["path"])
+    ok = True
+    for rel, info in entry.get("files", {}).items():
+        path = model_dir / rel
+        if not path.is_file() or _sha256(path) != info["sha256"]:
+            log.error("Checksum mismatch for %s/%s", name, rel)
+            ok = False
+    return ok
+
+
+def model_available(name: str) -> bool:
+    """Whether `name` can be loaded without the network.
+
+    True for local directories, registered models and models already in
+    the Hugging Face cache.
+    """
+    if resolve_model(name) is not None:
+        return True
+    try:
+        from faster_whisper.utils import download_model as fw_download
+        fw_download(name, local_files_only=True)
+        return True
+    except Exception:
+        return False
+
+
+def load_whisper_model(name: str, allow_download: bool = False, **kwargs):
+    """Create a WhisperModel from the local store or the Hugging Face cache.
+
+    Keyword arguments are passed to WhisperModel (device, compute_type, ...).
+
+    Args:
+        name: Model name or CTranslate2 directory
+        allow_download: Fetch the model from the network if it isn't stored locally
+
+    Raises:
+        FileNotFoundError: If the model isn't available offline and
+            downloading isn't allowed
+    """
+    from faster_whisper import WhisperModel
+
+    start = time.perf_counter()
+    local_dir = resolve_model(name)
+    if local_dir is not None:
+        model = WhisperModel(local_dir, local_files_only=True, **kwargs)
+        source = local_dir
+    else:
+        try:
+            model = WhisperModel(name, local_files_only=True, **kwargs)
+            source = "Hugging Face cache"
+        except Exception as e:
+            if not allow_download:
+                raise FileNotFoundError(
+                    f"Model '{name}' is not stored locally. "
+                    f"Run 'python -m stvc.models download {name}' to store it "
+                    f"(or set allow_download = true in the [model] config)."
+                ) from e
+            log.warning("Model '%s' not available offline, downloading.", name)
+            model = WhisperModel(name, **kwargs)
+            source = "download"
+
+    log.info("Model '%s' loaded from %s in %.2fs.", name, source, time.perf_counter() - start)
+    return model
+
+
+def download_model(name: str) -> dict:
+    """Fetch a pre-converted faster-whisper model into the local store."""
+    from faster_whisper.utils import download_model as fw_download
+
+    model_dir = MODELS_DIR / name
+    fw_download(name, output_dir=str(model_dir))
+    return register_model(name, model_dir, source=f"download:{name}")
+
+
+def import_model(name: str, source_dir: str) -> dict:
+    """Copy an existing CTranslate2 model directory into the local store."""
+    source = Path(source_dir)
+    model_dir = MODELS_DIR / name
+    if source.resolve() != model_dir.resolve():
+        shutil.copytree(source, model_dir, dirs_exist_ok=True)
+    return register_model(name, model_dir, source=f"import:{source}")
+
+
+def convert_model(model_id: str, name: str, quantization: str = "float16") -> dict:
+    """Convert a Transformers Whisper checkpoint to CTranslate2 and register it."""
+    from ctranslate2.converters import TransformersConverter
+
+    model_dir = MODELS_DIR / name
+    converter = TransformersConverter(model_id, copy_files=TOKENIZER_FILES)
+    converter.convert(str(model_dir), quantization=quantization, force=True)
+    return register_model(name, model_dir, source=f"convert:{model_id}:{quantization}")
+
+
+def main(argv=None):
+    """Entry point for `python -m stvc.models`."""
+    parser = argparse.ArgumentParser(prog="python -m stvc.models", description="Manage STVC's local model store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="list registered models")
+
+    p = sub.add_parser("download", help="download a pre-converted model")
+    p.add_argument("name", help="faster-whisper model name, e.g. large-v3-turbo")
+
+    p = sub.add_parser("import", help="import a CTranslate2 model directory")
+    p.add_argument("name")
+    p.add_argument("path")
+
+    p = sub.add_parser("convert", help="convert a Transformers checkpoint")
+    p.add_argument("model_id", help="e.g. openai/whisper-small.en")
+    p.add_argument("name")
+    p.add_argument("--quantization", default="float16")
+
+    p = sub.add_parser("verify", help="check stored models against their checksums")
+    p.add_argument("name", nargs="?")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "list":
+        for name, entry in sorted(_load_registry().items()):
+            size = sum(info["size"] for info in entry.get("files", {}).values())
+            print(f"{name:24} {size / 1e6:8.1f} MB  {entry['path']}  ({entry.get('source', '')})")
+    elif args.command == "download":
+        download_model(args.name)
+    elif args.command == "import":
+        import_model(args.name, args.path)
+    elif args.command == "convert":
+        convert_model(args.model_id, args.name, args.quantization)
+    elif args.command == "verify":
+        names = [args.name] if args.name else sorted(_load_registry())
+        failed = [name for name in names if not verify_model(name)]
+        for name in names:
+            print(f"{name}: {'FAILED' if name in failed else 'ok'}")
+        raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Pipelined dictation stages joined by bounded queues.
+
+Capture, transcription and injection each run on their own thread, so a
+new push-to-talk recording can start while the previous one is still
+decoding. Every stage is a single FIFO worker, which keeps output in
+press order without any sequence bookkeeping.
+"""
+
+import inspect
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class Utterance:
+    """One push-to-talk recording moving through the pipeline.
+
+    Attributes:
+        audio: Recorded samples (16kHz float32 mono)
+        released_at: perf_counter() timestamp of the key release
+        session: Streaming session still holding the uncommitted tail, if any
+        context: ContextPrefetch started when the key was pressed, if any
+        joiner: SegmentJoiner used by the injection stage for this utterance
+        first_injected_at: perf_counter() timestamp of the first injected text
+    """
+    audio: np.ndarray
+    released_at: float
+    session: Any = None
+    context: Any = None
+    joiner: Any = None
+    first_injected_at: float | None = None
+
+
+@dataclass
+class Piece:
+    """One transcript segment of an utterance on its way to injection.
+
+    The transcription stage sends a final Piece (with no text) after the
+    last segment so the injection stage knows the utterance is done.
+    """
+    utterance: Utterance
+    text: str = ""
+    final: bool = False
+
+
+class Stage:
+    """A worker thread applying `handler` to items from a bounded inbox.
+
+    Non-None handler results are forwarded to `output`; a handler may
+    also be a generator function, in which case every yielded item is
+    forwarded as soon as it is produced. Exceptions are logged and the
+    item is dropped, so one bad utterance can't stall the stages behind it.
+
+    Args:
+        name: Thread name, also used in log messages
+        handler: Called with each item on the stage thread
+        maxsize: Inbox capacity (0 for unbounded)
+        output: Next stage, if any
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Any],
+        maxsize: int = 0,
+        output: "Stage | None" = None,
+    ):
+        self.name = name
+        self._handler = handler
+        self._output = output
+        self._inbox: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread: threading.Thread | None = None
+
+    def put(self, item):
+        """Queue an item, blocking while the inbox is full."""
+        if self._inbox.full():
+            log.warning("%s stage is backed up (%d queued), waiting.", self.name, self._inbox.qsize())
+        self._inbox.put(item)
+
+    def _run(self):
+        while True:
+            item = self._inbox.get()
+            if item is None:
+                return
+            try:
+                result = self._handler(item)
+                if inspect.isgenerator(result):
+                    for part in result:
+                        self._forward(part)
+                else:
+                    self._forward(result)
+            except Exception:
+                log.exception("%s stage failed.", self.name)
+
+    def _forward(self, result):
+        if result is not None and self._output is not None:
+            self._output.put(result)
+
+    def start(self):
+        """Start the stage thread."""
+        self._thread = threading.Thread(target=self._run, name=f"stvc-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        """Finish queued items, then stop the thread."""
+        if self._thread is not None:
+            self._inbox.put(None)
+            self._thread.join(timeout)
+            self._thread = None
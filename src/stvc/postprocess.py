@@ -3,7 +3,9 @@ import re
 
 def fix_missing_question_marks(text: str) -> str:
     """Add question marks to interrogative sentences Whisper missed."""
-    interrogative = r'((?:^|[.\!?]\s+)(?:who|what|where|when|why|how|can|could|would|should|is|are|do|does|did|will|shall|have|has|had)\b[^.\!?]*)\.'
+    # The sentence start is looked behind, not consumed, so consecutive
+    # questions are all fixed
+    interrogative = r'((?:^|(?<=[.\!?]\s))\s*(?:who|what|where|when|why|how|can|could|would|should|is|are|do|does|did|will|shall|have|has|had)\b[^.\!?]*)\.'
     return re.sub(interrogative, r'\1?', text, flags=re.IGNORECASE)
 
 
@@ -14,9 +16,71 @@ def remove_filler_words(text: str) -> str:
 
 
 def process(text: str, fix_questions: bool = True, remove_fillers: bool = True) -> str:
-    """Run all post-processing stages on transcribed text."""
-    if fix_questions:
-        text = fix_missing_question_marks(text)
+    """Run all post-processing stages on transcribed text.
+
+    Fillers go first so a leading "um" doesn't hide a question.
+    """
     if remove_fillers:
         text = remove_filler_words(text)
+    if fix_questions:
+        text = fix_missing_question_marks(text)
     return text.strip()
+
+
+# Segments starting with these attach to the previous text without a space;
+# opening quotes and brackets still get one
+NO_SPACE_BEFORE = set(".,!?;:)]}")
+
+# Sentence ends as fix_missing_question_marks() sees them
+SENTENCE_END = re.compile(r'[.!?](?=\s|$)')
+
+
+class SegmentJoiner:
+    """Post-processes transcript segments one at a time for incremental injection.
+
+    Each fed segment is cleaned with process() and prefixed with a space
+    when it follows earlier text, so injecting the pieces one after
+    another produces the same spacing as joining the full transcript.
+    A segment starting with a double quote closes the quote when one is
+    open and attaches to the previous text; otherwise it opens a quote
+    and gets its space like a word.
+
+    Whisper often ends a segment mid-sentence, so question marks are
+    fixed on the sentence still open since the last terminal punctuation
+    rather than per segment ("What does the" + "config loader return."
+    becomes "...return?", as it would in the joined transcript).
+    """
+
+    def __init__(self, fix_questions: bool = True, remove_fillers: bool = True):
+        self.fix_questions = fix_questions
+        self.remove_fillers = remove_fillers
+        self.started = False
+        self._quote_open = False
+        self._sentence = ""
+
+    def feed(self, segment: str) -> str:
+        """Return the text to inject for the next segment ("" if nothing is left)."""
+        text = process(segment, fix_questions=False, remove_fillers=self.remove_fillers)
+        if not text:
+            return ""
+        closes_quote = text[0] == '"' and self._quote_open
+        if self.started and text[0] not in NO_SPACE_BEFORE and not closes_quote:
+            text = " " + text
+        self.started = True
+        if text.count('"') % 2:
+            self._quote_open = not self._quote_open
+        if self.fix_questions:
+            text = self._fix_questions(text)
+        return text
+
+    def _fix_questions(self, text: str) -> str:
+        """Fix question marks in `text` as the end of the open sentence; track what stays open."""
+        sentence = self._sentence + text
+        # The open sentence starts a sentence; only the new text can change
+        lead = len(sentence) - len(sentence.lstrip())
+        sentence = sentence[:lead] + fix_missing_question_marks(sentence[lead:])
+        text = sentence[len(self._sentence):]
+
+        ends = list(SENTENCE_END.finditer(sentence))
+        self._sentence = sentence[ends[-1].end():] if ends else sentence
+        return text
@@ -0,0 +1,231 @@
+"""Streaming transcription while push-to-talk is held.
+
+A background thread re-decodes the not-yet-committed part of the
+recording every few hundred milliseconds. Words that two consecutive
+hypotheses agree on are committed (LocalAgreement-2) and the audio
+before them is never decoded again. On release only the uncommitted
+tail is decoded, so release-to-text latency tracks the tail length
+rather than the whole utterance.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable
+
+import numpy as np
+
+from stvc.audio import SAMPLE_RATE
+from stvc.transcriber import Transcriber
+
+log = logging.getLogger(__name__)
+
+# Whisper's receptive field is 30s; force progress well before that
+MAX_UNCOMMITTED_SECONDS = 25.0
+
+Word = tuple[float, float, str]
+
+
+def _normalize(word: str) -> str:
+    """Comparison key for agreement: case- and punctuation-insensitive."""
+    return word.strip().strip(".,!?;:").lower()
+
+
+def common_prefix(previous: list[Word], current: list[Word]) -> int:
+    """Return how many leading words two hypotheses agree on."""
+    n = 0
+    for (_, _, a), (_, _, b) in zip(previous, current):
+        if _normalize(a) != _normalize(b):
+            break
+        n += 1
+    return n
+
+
+class StreamingSession:
+    """Incrementally transcribes one push-to-talk recording.
+
+    Usage:
+        session = StreamingSession(transcriber, recorder.get_audio)
+        session.start()
+        # ... user speaks, recorder keeps filling its buffer ...
+        recorder.stop()
+        session.freeze(recorder.get_audio())
+        text = session.finish()
+
+    Args:
+        transcriber: Transcriber used for both partial and tail decodes.
+        audio_source: Callable returning all audio recorded so far as a
+            1-D float32 array (e.g. AudioRecorder.get_audio).
+        initial_prompt: Prompt passed to every decode, as for
+            Transcriber.transcribe().
+        step: Seconds between background decodes.
+        min_chunk: Minimum seconds of new uncommitted audio before a
+            background decode is attempted.
+    """
+
+    def __init__(
+        self,
+        transcriber: Transcriber,
+        audio_source: Callable[[], np.ndarray],
+        initial_prompt: str | None = None,
+        step: float = 1.0,
+        min_chunk: float = 1.0,
+        sample_rate: int = SAMPLE_RATE,
+    ):
+        self._transcriber = transcriber
+        self._audio_source = audio_source
+        self._initial_prompt = initial_prompt
+        self.step = step
+        self.min_chunk = min_chunk
+        self.sample_rate = sample_rate
+
+        self._committed: list[Word] = []
+        self._pending: list[Word] = []
+        self._committed_sample = 0
+        self._decode_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self.partial_decodes = 0
+        self.tail_seconds = 0.0
+
+    @property
+    def committed_text(self) -> str:
+        """Text committed so far."""
+        return "".join(word for _, _, word in self._committed).strip()
+
+    def _decode_from(self, audio: np.ndarray, start_sample: int) -> list[Word]:
+        """Decode audio[start_sample:] and shift timestamps to absolute time."""
+        offset = start_sample / self.sample_rate
+        words = self._transcriber.transcribe_words(
+            audio[start_sample:], initial_prompt=self._initial_prompt,
+        )
+        return [(start + offset, end + offset, word) for start, end, word in words]
+
+    def _commit(self, words: list[Word]):
+        """Commit words and drop the audio they cover from future decodes."""
+        if not words:
+            return
+        self._committed.extend(words)
+        self._committed_sample = max(self._committed_sample, int(words[-1][1] * self.sample_rate))
+        log.debug("Streaming committed: %s", "".join(w for _, _, w in words).strip())
+
+    def process(self) -> bool:
+        """Run one partial decode over the uncommitted audio.
+
+        Called periodically by the background thread; exposed so callers
+        (and benchmarks) can drive the session synchronously.
+
+        Returns:
+            True if a decode ran, False if there was not enough new audio.
+        """
+        with self._decode_lock:
+            audio = self._audio_source()
+            uncommitted = (audio.size - self._committed_sample) / self.sample_rate
+            if uncommitted < self.min_chunk:
+                return False
+
+            hypothesis = self._decode_from(audio, self._committed_sample)
+            self.partial_decodes += 1
+
+            agreed = common_prefix(self._pending, hypothesis)
+            self._commit(hypothesis[:agreed])
+            self._pending = hypothesis[agreed:]
+
+            if uncommitted > MAX_UNCOMMITTED_SECONDS and self._pending:
+                # No agreement for too long; accept the latest hypothesis
+                # except its last word, which may still be cut mid-speech
+                self._commit(self._pending[:-1])
+                self._pending = self._pending[-1:]
+            return True
+
+    def _run(self):
+        """Background loop: decode every `step` seconds until finish()."""
+        while not self._stop.wait(self.step):
+            try:
+                self.process()
+            except Exception:
+                log.exception("Streaming partial decode failed.")
+
+    def start(self):
+        """Start background partial decoding."""
+        self._thread = threading.Thread(target=self._run, name="stvc-streaming", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stop background decoding without decoding the tail."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def freeze(self, audio: np.ndarray):
+        """Decode `audio` from now on instead of reading the live source.
+
+        Call on release with the captured recording: finish() may run
+        after the next press has started recording into the source.
+        """
+        with self._decode_lock:
+            self._audio_source = lambda: audio
+
+    def finish(self) -> str:
+        """Stop background decoding, decode the uncommitted tail and return the full text."""
+        self.cancel()
+
+        with self._decode_lock:
+            audio = self._audio_source()
+            self.tail_seconds = max(audio.size - self._committed_sample, 0) / self.sample_rate
+            if self.tail_seconds > 0:
+                self._commit(self._decode_from(audio, self._committed_sample))
+            self._pending = []
+
+        log.debug(
+            "Streaming finished: %d partial decodes, %.2fs tail decoded on release.",
+            self.partial_decodes, self.tail_seconds,
+        )
+        return self.committed_text
+
+
+def measure_release_latency(
+    transcriber: Transcriber,
+    audio: np.ndarray,
+    step: float = 1.0,
+    sample_rate: int = SAMPLE_RATE,
+) -> dict:
+    """Compare release-to-text latency of batch vs streaming transcription.
+
+    The recording is replayed in `step`-sized increments and the streaming
+    session is driven synchronously at each increment, standing in for the
+    work the background thread does while the key is held. Only the
+    work remaining after the last sample counts as release latency.
+
+    Returns:
+        Dict with batch_latency, streaming_latency, tail_seconds and
+        partial_decodes, plus both transcripts.
+    """
+    t0 = time.perf_counter()
+    batch_text = transcriber.transcribe(audio)
+    batch_latency = time.perf_counter() - t0
+
+    recorded = 0
+    session = StreamingSession(
+        transcriber, lambda: audio[:recorded], step=step, sample_rate=sample_rate,
+    )
+    increment = int(step * sample_rate)
+    while recorded < audio.size:
+        recorded = min(recorded + increment, audio.size)
+        session.process()
+
+    t0 = time.perf_counter()
+    streaming_text = session.finish()
+    streaming_latency = time.perf_counter() - t0
+
+    return {
+        "duration": audio.size / sample_rate,
+        "batch_latency": batch_latency,
+        "streaming_latency": streaming_latency,
+        "tail_seconds": session.tail_seconds,
+        "partial_decodes": session.partial_decodes,
+        "batch_text": batch_text,
+        "streaming_text": streaming_text,
+    }
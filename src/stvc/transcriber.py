@@ -1,13 +1,171 @@
 """Faster-whisper transcription engine wrapper."""
 
 import logging
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterator
+
 import numpy as np
 
 log = logging.getLogger(__name__)
 
+SAMPLE_RATE = 16000
+
+# Whisper's decoder context. faster-whisper rejects a decode whose prompt
+# plus max_new_tokens exceeds it; the prompt is up to MAX_PROMPT_TOKENS of
+# initial prompt / previous text plus PROMPT_OVERHEAD special tokens
+# (<|startofprev|>, <|startoftranscript|>, language, task, <|notimestamps|>)
+MAX_LENGTH = 448
+MAX_PROMPT_TOKENS = MAX_LENGTH // 2 - 1
+PROMPT_OVERHEAD = 5
+
+
+@dataclass(frozen=True)
+class DecodeProfile:
+    """Named set of faster-whisper decoding options.
+
+    Attributes:
+        name: Profile name ("fast", "balanced", "accurate")
+        beam_size: Beam width (1 = greedy)
+        best_of: Candidates sampled at non-zero temperature
+        temperature: Temperature schedule; a single 0.0 disables fallback
+        without_timestamps: Skip timestamp tokens (shorter decode)
+        condition_on_previous_text: Feed earlier windows' text as context
+    """
+    name: str
+    beam_size: int
+    best_of: int
+    temperature: tuple[float, ...]
+    without_timestamps: bool
+    condition_on_previous_text: bool
+
+    def kwargs(self) -> dict:
+        """Keyword arguments for WhisperModel.transcribe()."""
+        return {
+            "beam_size": self.beam_size,
+            "best_of": self.best_of,
+            "temperature": list(self.temperature),
+            "without_timestamps": self.without_timestamps,
+            "condition_on_previous_text": self.condition_on_previous_text,
+        }
+
+
+DECODE_PROFILES = {
+    # Short commands: greedy, no timestamps, no fallback re-decodes
+    "fast": DecodeProfile("fast", beam_size=1, best_of=1, temperature=(0.0,),
+                          without_timestamps=True, condition_on_previous_text=False),
+    "balanced": DecodeProfile("balanced", beam_size=3, best_of=3, temperature=(0.0, 0.2, 0.4),
+                              without_timestamps=True, condition_on_previous_text=False),
+    # faster-whisper's defaults: full beam and temperature fallback
+    "accurate": DecodeProfile("accurate", beam_size=5, best_of=5, temperature=(0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+                              without_timestamps=False, condition_on_previous_text=True),
+}
+
+# App types where dictation is mostly short commands
+COMMAND_APP_TYPES = {"terminal"}
+
+
+def select_profile(
+    duration: float,
+    app_type: str | None = None,
+    short_duration: float = 3.0,
+    long_duration: float = 20.0,
+) -> DecodeProfile:
+    """Pick a decode profile from clip length and target application.
+
+    Clips under `short_duration` (or under 10s into a terminal) are
+    command-like and get "fast"; clips over `long_duration` are
+    paragraphs and get "accurate"; everything else is "balanced".
+    """
+    if duration < short_duration:
+        return DECODE_PROFILES["fast"]
+    if app_type in COMMAND_APP_TYPES and duration < 10.0:
+        return DECODE_PROFILES["fast"]
+    if duration > long_duration:
+        return DECODE_PROFILES["accurate"]
+    return DECODE_PROFILES["balanced"]
+
+
+def compression_ratio(text: str) -> float:
+    """zlib compression ratio, as Whisper uses to spot repetitive output."""
+    data = text.encode("utf-8")
+    return len(data) / len(zlib.compress(data)) if data else 0.0
+
+
+@dataclass
+class DecodeGuard:
+    """Bounds on how much text a decode may produce for its audio.
+
+    Whisper can loop a phrase on noise until the window's token limit,
+    and temperature fallback can repeat that several times. The guard
+    caps generated tokens per window relative to audio duration and
+    watches segments as they stream out; on a repetition loop,
+    compression-ratio blowup or runaway length it stops consuming the
+    segment generator, keeping the text accepted so far.
+
+    The time budget is off by default: a slow machine decodes legitimate
+    speech slower than real time. When enabled it is a multiple of the
+    expected decode time, `decode_rtf` seconds per audio second (set from
+    autotune's calibration where there is one), and the segment that ran
+    over is kept.
+
+    Attributes:
+        tokens_per_second: Token budget per second of audio (plus slack)
+        chars_per_second: Text budget per second of audio (plus slack)
+        max_compression_ratio: Abort once accumulated text compresses better
+        max_repeats: Abort when the same segment text repeats this often
+        time_budget_factor: Stop after this many times the expected decode time (0 disables)
+        decode_rtf: Expected decode seconds per second of audio
+        min_time_budget: Floor for the time budget, in seconds
+    """
+    tokens_per_second: float = 12.0
+    chars_per_second: float = 40.0
+    max_compression_ratio: float = 2.4
+    max_repeats: int = 3
+    time_budget_factor: float = 0.0
+    decode_rtf: float = 1.0
+    min_time_budget: float = 3.0
+
+    def max_new_tokens(self, duration: float, prompt_tokens: int = MAX_PROMPT_TOKENS) -> int:
+        """Per-window token cap for a clip.
+
+        Args:
+            duration: Seconds of audio
+            prompt_tokens: Prompt tokens the decode may carry (faster-whisper
+                keeps at most MAX_PROMPT_TOKENS of them)
+
+        Returns:
+            At most Whisper's sample length (MAX_LENGTH // 2), and small
+            enough that prompt plus output fit within MAX_LENGTH.
+        """
+        limit = min(MAX_LENGTH // 2, MAX_LENGTH - min(prompt_tokens, MAX_PROMPT_TOKENS) - PROMPT_OVERHEAD)
+        return int(min(limit, max(16, duration * self.tokens_per_second + 16)))
+
+    def over_time_budget(self, duration: float, elapsed: float) -> bool:
+        """True once a decode has run past its time budget (never if disabled)."""
+        if self.time_budget_factor <= 0:
+            return False
+        return elapsed > max(self.min_time_budget, duration * self.decode_rtf * self.time_budget_factor)
+
+    def check(self, texts: list[str], duration: float, elapsed: float) -> str | None:
+        """Return an abort reason for the segments so far, or None to continue."""
+        if len(texts) >= self.max_repeats and len(set(texts[-self.max_repeats:])) == 1:
+            return "repetition"
+        joined = " ".join(texts)
+        if len(joined) > duration * self.chars_per_second + 80:
+            return "length"
+        if len(joined) > 80 and compression_ratio(joined) > self.max_compression_ratio:
+            return "compression_ratio"
+        if self.over_time_budget(duration, elapsed):
+            return "time_budget"
+        return None
+
 
 class Transcriber:
-    """Wraps faster-whisper for batch transcription on GPU."""
+    """Wraps faster-whisper for batch transcription on GPU or CPU."""
 
     def __init__(
         self,
@@ -17,6 +175,10 @@ class Transcriber:
         beam_size: int = 5,
         language: str = "en",
         initial_prompt: str = "",
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        guard: DecodeGuard | None = None,
+        allow_download: bool = False,
     ):
         self.model_name = model_name
         self.device = device
@@ -24,29 +186,116 @@ class Transcriber:
         self.beam_size = beam_size
         self.language = language
         self.initial_prompt = initial_prompt
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.guard = guard
+        self.allow_download = allow_download
         self._model = None
+        self._batched = None
+        self._load_lock = threading.Lock()
+
+        # Guard metrics
+        self.guard_aborts: Counter[str] = Counter()
+        self.last_decode_seconds = 0.0
+        self.max_decode_seconds = 0.0
 
-    def _load_model(self):
-        """Lazily load the faster-whisper model."""
+    def load_model(self):
+        """Load the faster-whisper model unless it is already loaded."""
         if self._model is not None:
             return
 
-        log.info(
-            "Loading model '%s' on %s (%s)...",
-            self.model_name, self.device, self.compute_type,
-        )
-        from faster_whisper import WhisperModel
+        with self._load_lock:
+            if self._model is not None:
+                return
+
+            log.info(
+                "Loading model '%s' on %s (%s)...",
+                self.model_name, self.device, self.compute_type,
+            )
+            from stvc.models import load_whisper_model
+
+            self._model = load_whisper_model(
+                self.model_name,
+                allow_download=self.allow_download,
+                device=self.device,
+                compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads,
+                num_workers=self.num_workers,
+            )
+
+    def use_model(self, model):
+        """Use an already loaded WhisperModel (e.g. from calibration) instead of loading one.
+
+        The model must match model_name, device and compute_type.
+        """
+        with self._load_lock:
+            self._model = model
+            self._batched = None
+
+    @property
+    def model(self):
+        """The WhisperModel, loaded on first access."""
+        self.load_model()
+        return self._model
 
-        self._model = WhisperModel(
-            self.model_name,
-            device=self.device,
-            compute_type=self.compute_type,
+    @property
+    def tokenizer(self):
+        """The loaded model's Hugging Face tokenizer, or None before loading."""
+        return getattr(self._model, "hf_tokenizer", None)
+
+    def _guarded(self, segments, duration: float):
+        """Yield segments until the decode guard trips, then stop the generator.
+
+        Also records wall time of the decode for worst-case tracking.
+        """
+        start = time.perf_counter()
+        texts: list[str] = []
+        try:
+            for segment in segments:
+                if self.guard is not None:
+                    texts.append(segment.text.strip().lower())
+                    reason = self.guard.check(texts, duration, time.perf_counter() - start)
+                    if reason is not None:
+                        self.guard_aborts[reason] += 1
+                        log.warning(
+                            "Decode aborted (%s) after %d segments on %.2fs of audio; aborts so far: %s",
+                            reason, len(texts), duration, dict(self.guard_aborts),
+                        )
+                        if reason == "time_budget":
+                            # The segment is fine, the decode just ran long
+                            yield segment
+                        segments.close()
+                        return
+                yield segment
+        finally:
+            self.last_decode_seconds = time.perf_counter() - start
+            self.max_decode_seconds = max(self.max_decode_seconds, self.last_decode_seconds)
+
+    def _prompt_tokens(self, prompt: str | None, duration: float, condition_on_previous_text: bool) -> int:
+        """Upper bound on the prompt tokens a decode window will carry."""
+        if condition_on_previous_text and duration > 30.0:
+            # Later windows are prompted with earlier windows' text
+            return MAX_PROMPT_TOKENS
+        if not prompt:
+            return 0
+        tokenizer = self.tokenizer
+        if tokenizer is None:
+            return MAX_PROMPT_TOKENS
+        # faster-whisper encodes the prompt the same way
+        return len(tokenizer.encode(" " + prompt.strip(), add_special_tokens=False).ids)
+
+    def _guard_kwargs(self, duration: float, kwargs: dict) -> dict:
+        """Decode options enforcing the guard's token cap for a decode with `kwargs`."""
+        if self.guard is None:
+            return {}
+        prompt_tokens = self._prompt_tokens(
+            kwargs.get("initial_prompt"), duration, kwargs.get("condition_on_previous_text", True),
         )
-        log.info("Model loaded.")
+        return {"max_new_tokens": self.guard.max_new_tokens(duration, prompt_tokens)}
 
     def warmup(self):
         """Load model and run a dummy transcription to warm up GPU kernels."""
-        self._load_model()
+        self.load_model()
         dummy = np.zeros(16000, dtype=np.float32)  # 1s of silence
         segments, _ = self._model.transcribe(
             dummy,
@@ -58,42 +307,188 @@ class Transcriber:
             pass
         log.info("Warmup complete.")
 
-    def transcribe(self, audio: np.ndarray, initial_prompt: str | None = None) -> str:
+    def transcribe_iter(
+        self,
+        audio: np.ndarray,
+        initial_prompt: str | None = None,
+        speech_timestamps: list[tuple[int, int]] | None = None,
+        profile: DecodeProfile | None = None,
+    ) -> Iterator[str]:
+        """Transcribe audio, yielding each segment's text as it is decoded.
+
+        Arguments are as for transcribe(). faster-whisper decodes lazily,
+        so the first segment is available long before a long utterance
+        has finished decoding.
+
+        Yields:
+            Stripped, non-empty segment texts in order.
+        """
+        self.load_model()
+
+        if audio.size == 0:
+            return
+
+        kwargs = {
+            "beam_size": self.beam_size,
+            "language": self.language,
+            "vad_filter": True,
+        }
+        if profile is not None:
+            kwargs.update(profile.kwargs())
+
+        duration = audio.size / SAMPLE_RATE
+        if speech_timestamps is not None:
+            kwargs["vad_filter"] = False
+            kwargs["clip_timestamps"] = [
+                t / SAMPLE_RATE for span in speech_timestamps for t in span
+            ]
+            duration = sum(end - start for start, end in speech_timestamps) / SAMPLE_RATE
+
+        # Use per-call prompt if provided, otherwise fall back to base prompt
+        prompt_to_use = initial_prompt if initial_prompt is not None else self.initial_prompt
+        if prompt_to_use:
+            kwargs["initial_prompt"] = prompt_to_use
+        kwargs.update(self._guard_kwargs(duration, kwargs))
+
+        segments, info = self._model.transcribe(audio, **kwargs)
+
+        for segment in self._guarded(segments, duration):
+            text = segment.text.strip()
+            if text:
+                log.debug("Segment: %s", text)
+                yield text
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        initial_prompt: str | None = None,
+        speech_timestamps: list[tuple[int, int]] | None = None,
+        profile: DecodeProfile | None = None,
+    ) -> str:
         """Transcribe a numpy audio array (16kHz float32 mono) to text.
 
         Args:
             audio: Audio samples as float32 numpy array, 16kHz sample rate.
             initial_prompt: Optional prompt override for this transcription call.
                           If None, uses self.initial_prompt.
+            speech_timestamps: Optional (start, end) sample offsets from
+                          stvc.audio.trim_silence(). When given, the model's
+                          own VAD pass is skipped and only these spans are decoded.
+            profile: Optional decode profile; if None, uses self.beam_size
+                          with faster-whisper's other defaults.
 
         Returns:
             Transcribed text string.
         """
-        self._load_model()
+        result = " ".join(self.transcribe_iter(audio, initial_prompt, speech_timestamps, profile)).strip()
+        log.debug("Transcribed: %s", result)
+        return result
+
+    def transcribe_chunks(
+        self,
+        audio: np.ndarray,
+        chunks: list[tuple[int, int]],
+        initial_prompt: str | None = None,
+        profile: DecodeProfile | None = None,
+        batch_size: int = 8,
+    ) -> list[str]:
+        """Decode chunks of at most 30s together through faster-whisper's batched pipeline.
+
+        Every chunk is one decode window with its own prompt, so the
+        profile's condition_on_previous_text does not apply; the decode
+        guard caps each window and watches the segments as a whole.
+
+        Args:
+            audio: 16kHz float32 mono audio
+            chunks: (start, end) sample offsets in order, each <= 30s
+            initial_prompt: Prompt for every chunk (None uses the base prompt)
+            profile: Optional decode profile, as for transcribe()
+            batch_size: Chunks encoded and decoded per batch
+
+        Returns:
+            Text per chunk, in the order of `chunks`.
+        """
+        self.load_model()
+        if not chunks:
+            return []
+        if self._batched is None:
+            from faster_whisper import BatchedInferencePipeline
+            self._batched = BatchedInferencePipeline(model=self._model)
+
+        kwargs = {
+            "beam_size": self.beam_size,
+            "language": self.language,
+        }
+        if profile is not None:
+            kwargs.update(profile.kwargs())
+        kwargs.pop("condition_on_previous_text", None)
+        kwargs.update({
+            "batch_size": batch_size,
+            "vad_filter": False,
+            "clip_timestamps": [
+                {"start": start / SAMPLE_RATE, "end": end / SAMPLE_RATE} for start, end in chunks
+            ],
+        })
+        prompt_to_use = initial_prompt if initial_prompt is not None else self.initial_prompt
+        if prompt_to_use:
+            kwargs["initial_prompt"] = prompt_to_use
+
+        window = max(end - start for start, end in chunks) / SAMPLE_RATE
+        if self.guard is not None:
+            prompt_tokens = self._prompt_tokens(prompt_to_use, window, condition_on_previous_text=False)
+            kwargs["max_new_tokens"] = self.guard.max_new_tokens(window, prompt_tokens)
+
+        segments, _ = self._batched.transcribe(audio, **kwargs)
+
+        duration = sum(end - start for start, end in chunks) / SAMPLE_RATE
+        texts: list[list[str]] = [[] for _ in chunks]
+        starts = np.array([start / SAMPLE_RATE for start, _ in chunks])
+        for segment in self._guarded(segments, duration):
+            index = max(int(np.searchsorted(starts, segment.start, side="right")) - 1, 0)
+            texts[index].append(segment.text.strip())
+        return [" ".join(part for part in parts if part) for parts in texts]
+
+    def transcribe_words(
+        self, audio: np.ndarray, initial_prompt: str | None = None
+    ) -> list[tuple[float, float, str]]:
+        """Transcribe audio and return word-level timestamps.
+
+        Used by streaming mode, which needs word boundaries to decide how
+        much of the hypothesis is stable.
+
+        Args:
+            audio: Audio samples as float32 numpy array, 16kHz sample rate.
+            initial_prompt: Optional prompt override, as for transcribe().
+
+        Returns:
+            List of (start_seconds, end_seconds, word) tuples. Words keep
+            Whisper's leading space so they can be joined with "".
+        """
+        self.load_model()
 
         if audio.size == 0:
-            return ""
+            return []
 
         kwargs = {
             "beam_size": self.beam_size,
             "language": self.language,
             "vad_filter": True,
+            "word_timestamps": True,
         }
+        duration = audio.size / SAMPLE_RATE
 
-        # Use per-call prompt if provided, otherwise fall back to base prompt
         prompt_to_use = initial_prompt if initial_prompt is not None else self.initial_prompt
         if prompt_to_use:
             kwargs["initial_prompt"] = prompt_to_use
+        kwargs.update(self._guard_kwargs(duration, kwargs))
 
         segments, info = self._model.transcribe(audio, **kwargs)
 
-        text_parts = []
-        for segment in segments:
-            text_parts.append(segment.text.strip())
-
-        result = " ".join(text_parts).strip()
-        log.debug("Transcribed: %s", result)
-        return result
+        words = []
+        for segment in self._guarded(segments, duration):
+            for word in segment.words or ():
+                words.append((word.start, word.end, word.word))
+        return words
 
     def update_base_prompt(self, prompt: str) -> None:
         """Update the base initial_prompt used for transcription.
@@ -11,6 +11,7 @@ log = logging.getLogger(__name__)
 
 
 class TrayState(Enum):
+    LOADING = "loading"
     IDLE = "idle"
     LISTENING = "listening"
     TRANSCRIBING = "transcribing"
@@ -18,6 +19,7 @@ class TrayState(Enum):
 
 # Colors for each state (RGB)
 STATE_COLORS = {
+    TrayState.LOADING: (0, 120, 255),        # Blue
     TrayState.IDLE: (128, 128, 128),        # Gray
     TrayState.LISTENING: (0, 200, 0),        # Green
     TrayState.TRANSCRIBING: (255, 200, 0),   # Yellow
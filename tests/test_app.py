@@ -0,0 +1,119 @@
+"""STVCApp handlers driven with a fake model and injector.
+
+The app module needs the Windows desktop dependencies (sounddevice,
+pynput, pystray, the Win32 input API); these tests are skipped without them.
+"""
+
+import copy
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from stvc import config
+from stvc.context.prefetch import Context, ContextPrefetch
+from stvc.fakes import FakeInjector, FakeWhisperModel
+from stvc.pipeline import Utterance
+from stvc.transcriber import SAMPLE_RATE, Transcriber
+
+try:
+    from stvc import app as app_module
+except (ImportError, AttributeError) as e:
+    pytest.skip(f"STVCApp needs the desktop dependencies: {e}", allow_module_level=True)
+
+
+@pytest.fixture
+def app(monkeypatch):
+    settings = copy.deepcopy(config.DEFAULTS)
+    # No microphone VAD or foreground window here
+    settings["vad"]["enabled"] = False
+    settings["context"]["enabled"] = False
+    monkeypatch.setattr(app_module, "load_config", lambda: settings)
+    saved = []
+    monkeypatch.setattr(app_module, "save_config", lambda cfg: saved.append(copy.deepcopy(cfg)))
+    stvc_app = app_module.STVCApp()
+    stvc_app.saved_configs = saved
+    return stvc_app
+
+
+def test_autotune_without_local_models_keeps_auto(app, monkeypatch):
+    monkeypatch.setattr(
+        app_module, "calibrate",
+        lambda model_cfg, language: ({"device": "cpu", "compute_type": "int8", "name": "large-v3-turbo"}, None, False),
+    )
+    app._transcriber = app_module.Transcriber(model_name="large-v3-turbo", device="auto", compute_type="auto")
+
+    app._autotune()
+
+    assert app._transcriber.device == "cpu"
+    assert app._config["model"]["device"] == "auto"
+    assert app._config["model"]["compute_type"] == "auto"
+    assert app.saved_configs == []
+
+
+def test_autotune_saves_calibrated_settings(app, monkeypatch):
+    settings = {"device": "cpu", "compute_type": "int8", "name": "base.en", "decode_rtf": 0.2}
+    monkeypatch.setattr(app_module, "calibrate", lambda model_cfg, language: (dict(settings), None, True))
+    app._transcriber = app_module.Transcriber(device="auto", compute_type="auto")
+
+    app._autotune()
+
+    assert app.saved_configs[-1]["model"]["device"] == "cpu"
+    assert app.saved_configs[-1]["model"]["decode_rtf"] == 0.2
+
+
+def run_utterances(app, texts: list[str], count: int = 1, delay: float = 0.0) -> FakeInjector:
+    """Push `count` utterances through the app's transcription and injection stages."""
+    app._transcriber = Transcriber(model_name="fake", device="cpu")
+    app._transcriber.use_model(FakeWhisperModel(texts, delay=delay))
+    app._inject = injector = FakeInjector()
+    app._model_ready.set()
+
+    app._inject_stage.start()
+    app._transcribe_stage.start()
+    for _ in range(count):
+        app._refresh_tray(in_flight=1)
+        audio = np.zeros(2 * SAMPLE_RATE, dtype=np.float32)
+        app._transcribe_stage.put(Utterance(audio=audio, released_at=0.0))
+    app._transcribe_stage.stop(timeout=5)
+    app._inject_stage.stop(timeout=5)
+    return injector
+
+
+def test_segments_injected_in_order_across_utterances(app):
+    injector = run_utterances(app, ["First part.", "Second part.", "Third part."], count=2, delay=0.01)
+
+    assert [text for _, text in injector.calls] == [
+        "First part.", " Second part.", " Third part.",
+        "First part.", " Second part.", " Third part.",
+    ]
+    assert app._in_flight == 0
+
+
+def test_question_spanning_segments(app):
+    injector = run_utterances(app, ["What does the", "config loader return.", "It returns a dict."])
+
+    assert injector.text == "What does the config loader return? It returns a dict."
+
+
+class ReadyPrefetcher:
+    """ContextPrefetcher stand-in whose extraction has already finished."""
+
+    def __init__(self, context):
+        self.context = context
+
+    def submit(self):
+        return ContextPrefetch.ready(self.context)
+
+
+def test_streaming_session_gets_context_prompt(app):
+    app._config["streaming"]["enabled"] = True
+    app._prefetcher = ReadyPrefetcher(Context(prompt="pytest, numpy", app_type="vscode"))
+    app._recorder = SimpleNamespace(start=lambda: None, get_audio=lambda: np.zeros(0, dtype=np.float32))
+    app._model_ready.set()
+
+    app._start_recording()
+    session = app._streaming_session
+    session.cancel()
+
+    assert session._initial_prompt == "pytest, numpy"
@@ -0,0 +1,41 @@
+"""Autotune calibration without stored models."""
+
+import pytest
+
+from stvc import autotune, models
+
+
+@pytest.fixture
+def cpu_only(monkeypatch):
+    monkeypatch.setattr(autotune, "resolve_device", lambda device, compute_type: ("cpu", "int8"))
+    monkeypatch.setattr(autotune, "physical_cores", lambda: 4)
+
+
+def test_nothing_stored_locally_is_not_calibrated(cpu_only, monkeypatch):
+    monkeypatch.setattr(models, "model_available", lambda name: False)
+
+    def no_load(name, **kwargs):
+        raise AssertionError(f"loaded {name}")
+
+    monkeypatch.setattr(models, "load_whisper_model", no_load)
+
+    settings, model, calibrated = autotune.calibrate({"device": "auto", "compute_type": "auto"})
+
+    assert not calibrated
+    assert model is None
+    assert settings["name"] == "large-v3-turbo"
+    assert "decode_rtf" not in settings
+
+
+def test_picks_first_local_model_meeting_target(cpu_only, monkeypatch):
+    monkeypatch.setattr(models, "model_available", lambda name: name in ("small.en", "base.en"))
+    monkeypatch.setattr(models, "load_whisper_model", lambda name, **kwargs: name)
+    latencies = {"small.en": 2.5, "base.en": 1.0}
+    monkeypatch.setattr(autotune, "measure_decode_latency", lambda model, language, beam_size: latencies[model])
+
+    settings, model, calibrated = autotune.calibrate({"latency_target": 1.5}, language="en")
+
+    assert calibrated
+    assert model == "base.en"
+    assert settings["name"] == "base.en"
+    assert settings["decode_rtf"] == pytest.approx(1.0 / autotune.CALIBRATION_SECONDS)
@@ -0,0 +1,39 @@
+"""Long-form chunking and stitching over a fake batched pipeline."""
+
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sounddevice")
+
+from stvc.fakes import FakeWhisperModel  # noqa: E402
+from stvc.longform import LongFormTranscriber, plan_chunks  # noqa: E402
+from stvc.transcriber import DECODE_PROFILES, SAMPLE_RATE, DecodeGuard, Transcriber  # noqa: E402
+
+
+@pytest.fixture
+def transcriber(monkeypatch):
+    monkeypatch.setitem(sys.modules, "faster_whisper", SimpleNamespace(BatchedInferencePipeline=lambda model: model))
+    return Transcriber(model_name="fake", device="cpu", guard=DecodeGuard())
+
+
+def test_long_span_split_with_overlap():
+    chunks = plan_chunks([(0, 50 * SAMPLE_RATE)], 50 * SAMPLE_RATE)
+    assert chunks == [(0, 30 * SAMPLE_RATE), (29 * SAMPLE_RATE, 50 * SAMPLE_RATE)]
+
+
+def test_chunks_decoded_in_one_batched_call(transcriber):
+    model = FakeWhisperModel(["one two three", "three four"])
+    transcriber.use_model(model)
+    audio = np.zeros(58 * SAMPLE_RATE, dtype=np.float32)
+
+    text = LongFormTranscriber(transcriber).transcribe(
+        audio, speech_timestamps=[(0, audio.size)], profile=DECODE_PROFILES["fast"],
+    )
+
+    # The repeated word at the overlapping seam is dropped
+    assert text == "one two three four"
+    assert len(model.calls) == 1
+    assert model.calls[0]["beam_size"] == 1 and "max_new_tokens" in model.calls[0]
@@ -0,0 +1,34 @@
+"""Incremental post-processing matches post-processing the joined transcript."""
+
+import pytest
+
+from stvc.postprocess import SegmentJoiner, process
+
+
+def feed_all(segments: list[str]) -> str:
+    joiner = SegmentJoiner()
+    return "".join(joiner.feed(segment) for segment in segments)
+
+
+@pytest.mark.parametrize("segments", [
+    ["What does the", "config loader return."],
+    ["The build", "is ready."],
+    ["Is it done.", "What about", "the tests. Fine."],
+    ["Um what", "is this.", "Why."],
+    ["We know how", "it works."],
+    ["First part.", "Second part, and", "a third."],
+])
+def test_matches_joined_transcript(segments):
+    assert feed_all(segments) == process(" ".join(segments))
+
+
+def test_question_split_across_segments():
+    assert feed_all(["What does the", "config loader return."]) == "What does the config loader return?"
+
+
+def test_quotes():
+    assert feed_all(["He said", '"Quoted', '" and left.']) == 'He said "Quoted" and left.'
+
+
+def test_closing_punctuation_attaches():
+    assert feed_all(["Call it", ", then stop", "."]) == "Call it, then stop."
@@ -0,0 +1,86 @@
+"""Python symbol extraction."""
+
+from stvc.context.extractors import sample_file
+from stvc.context.symbols import ASSIGNMENT, DEFINITION, PIECE_SEPARATOR, PythonLexer, extract_symbols
+
+
+def symbols(code: str) -> dict[str, float]:
+    return PythonLexer().symbols(code)
+
+
+def test_keywords_inside_identifiers_are_not_matched():
+    code = (
+        "for subclass in node_types:\n"
+        "    undef = redefine  or fallback\n"
+        "    data_from  source_dir import_ = do_import  (module_path)\n"
+    )
+    assert PythonLexer._CLASSES.findall(code) == []
+    assert PythonLexer._DEFS.findall(code) == []
+    assert PythonLexer._FROM.findall(code) == []
+    assert PythonLexer._IMPORT.findall(code) == []
+    assert "module_path" not in symbols(code)
+
+
+def test_definitions_and_imports():
+    weights = symbols(
+        "from stvc.context import term_parser\n"
+        "import file_utils as fu\n"
+        "class TermCache:\n"
+        "    def get_terms(self):\n"
+        "        pass\n"
+    )
+    assert weights["TermCache"] >= DEFINITION
+    assert weights["get_terms"] >= DEFINITION
+    assert "stvc.context" in weights and "term_parser" in weights and "file_utils" in weights
+
+
+def test_annotated_assignment_records_the_name():
+    weights = symbols(
+        "class Settings:\n"
+        "    max_retries: int = 3\n"
+        "    term_cache: dict[str, list[int]] | None = None\n"
+        "\n"
+        "    def reset(self, retry_delay: float = 0.5):\n"
+        "        self.last_error: str = ''\n"
+        "        if ready: total_count = 0\n"
+    )
+    for name in ("max_retries", "term_cache", "retry_delay", "last_error", "total_count"):
+        assert weights.get(name) == ASSIGNMENT, name
+    assert "ready" not in weights
+
+
+def test_piece_ending_inside_a_docstring_keeps_its_code():
+    pieces = [
+        "import file_utils\n"
+        "def load_wav(path):\n"
+        "    samples = read_frames(path)\n"
+        '    """Cut off here, mentioned in passing\n',
+        "def decode_samples(data):\n"
+        "    return convert_pcm(data)\n",
+    ]
+    terms = extract_symbols(PIECE_SEPARATOR.join(pieces), "audio.py")
+
+    assert {"file_utils", "load_wav", "read_frames", "decode_samples", "convert_pcm"} <= set(terms)
+    # Prose from the cut docstring would only come from the regex fallback
+    assert "mentioned" not in terms and "passing" not in terms
+
+
+def test_sampled_file_is_lexed(tmp_path):
+    module = (
+        "def handle_request(request_body):\n"
+        '    """Answer one request, quoting it in the "reply" field.\n'
+        "\n"
+        "    Longer description, with more prose in it.\n"
+        '    """\n'
+        "    return build_reply(request_body)\n"
+        "\n"
+    )
+    path = tmp_path / "server.py"
+    path.write_text(module * 400)
+
+    sample = sample_file(path, 8 * 1024)
+
+    assert PIECE_SEPARATOR in sample
+    terms = extract_symbols(sample, str(path))
+    assert {"handle_request", "build_reply"} <= set(terms)
+    assert "prose" not in terms and "description" not in terms
@@ -0,0 +1,84 @@
+"""Term cache LRU order, memory budget, counters and file-version keys."""
+
+import os
+
+from stvc.context.extractors import FileBasedExtractor
+from stvc.context.term_cache import TermCache, _entry_bytes
+
+
+def key(name: str) -> tuple[str, int, int, int]:
+    return (name, 0, 0, 50)
+
+
+def test_get_returns_a_copy():
+    cache = TermCache()
+    cache.put(key("a.py"), ["TermCache", "get_terms"])
+
+    terms = cache.get(key("a.py"))
+    terms.append("workspace_term")
+
+    assert cache.get(key("a.py")) == ["TermCache", "get_terms"]
+
+
+def test_least_recently_used_evicted_first():
+    terms = ["alpha_term", "beta_term"]
+    cache = TermCache(max_bytes=3 * _entry_bytes(key("a.py"), tuple(terms)))
+    cache.put(key("a.py"), terms)
+    cache.put(key("b.py"), terms)
+    cache.put(key("c.py"), terms)
+    cache.get(key("a.py"))
+
+    cache.put(key("d.py"), terms)
+
+    assert cache.get(key("b.py")) is None
+    assert cache.get(key("a.py")) == terms
+    assert cache.evictions == 1
+
+
+def test_memory_budget_bounds_size():
+    cache = TermCache(max_bytes=4096)
+    for i in range(100):
+        cache.put(key(f"file{i}.py"), [f"term_{i}_{j}" for j in range(5)])
+
+    assert 0 < cache.size_bytes <= 4096
+    assert len(cache) + cache.evictions == 100
+    # An entry larger than the whole budget isn't stored at all
+    cache.put(key("huge.py"), ["x" * 8192])
+    assert cache.get(key("huge.py")) is None
+
+
+def test_hit_and_miss_counters():
+    cache = TermCache()
+    cache.get(key("a.py"))
+    cache.put(key("a.py"), ["alpha_term"])
+    cache.get(key("a.py"))
+    cache.get(key("a.py"))
+
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert cache.hit_rate == 2 / 3
+    assert "2 hits, 1 misses" in cache.stats()
+
+
+def test_file_change_invalidates_by_mtime_and_size(tmp_path):
+    path = tmp_path / "loader.py"
+    path.write_text("def load_config():\n    return read_settings()\n")
+    cache = TermCache()
+    extractor = FileBasedExtractor(cache=cache)
+
+    first = extractor.terms_for_path(str(path))
+    assert "load_config" in first
+    assert extractor.terms_for_path(str(path)) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Same size, newer mtime
+    stat = path.stat()
+    path.write_text("def save_config():\n    return read_settings()\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert "save_config" in extractor.terms_for_path(str(path))
+
+    # Same mtime, different size
+    stat = path.stat()
+    path.write_text("def save_config_file():\n    return read_settings()\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert "save_config_file" in extractor.terms_for_path(str(path))
+    assert cache.misses == 3
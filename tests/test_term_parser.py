@@ -0,0 +1,29 @@
+"""Single-pass term extraction against the original six-regex version."""
+
+from pathlib import Path
+
+import pytest
+
+from stvc.context.term_parser import extract_terms
+from stvc.fakes import reference_extract_terms
+
+SOURCES = sorted((Path(__file__).parent.parent / "src" / "stvc").rglob("*.py"))
+
+SAMPLES = [
+    "",
+    "getUserName and get_user_name call os.path.join with MAX_RETRIES",
+    "HttpClient HttpClient httpClient; Exception None self.config_dir",
+    "Traceback: ValueError in parse_args() at line 42, see README",
+    "a1_b2 X_Y __init__ _private.attr 12345 Foo.Bar.baz",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_matches_reference_on_samples(text):
+    assert extract_terms(text, ranking="frequency") == reference_extract_terms(text)
+
+
+@pytest.mark.parametrize("path", SOURCES, ids=lambda path: path.name)
+def test_matches_reference_on_sources(path):
+    text = path.read_text(encoding="utf-8", errors="ignore")[:50000]
+    assert extract_terms(text, ranking="frequency") == reference_extract_terms(text)
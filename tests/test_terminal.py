@@ -0,0 +1,110 @@
+"""Terminal context: delta-only term counting over a fake text provider."""
+
+import time
+
+import pytest
+
+from stvc.context.extractors import (
+    DecayingTermTable, ExtractorRegistry, TerminalExtractor, UIATextProvider, new_output,
+)
+from stvc.context.window_detect import WindowInfo
+from stvc.fakes import FakeTextProvider
+
+HWND = 42
+
+
+@pytest.fixture
+def terminal():
+    return FakeTextProvider()
+
+
+@pytest.fixture
+def extractor(terminal):
+    return TerminalExtractor(provider=terminal, max_lines=50, half_life_s=1e9)
+
+
+def window(hwnd: int = HWND) -> WindowInfo:
+    return WindowInfo(hwnd=hwnd, title="Windows PowerShell", process_name="powershell.exe", exe_path="")
+
+
+def weights(extractor: TerminalExtractor, hwnd: int = HWND) -> dict[str, float]:
+    return extractor._states[hwnd][1].weights
+
+
+def test_new_output_returns_only_appended_lines():
+    previous = "$ make\nbuild_step one\nbuild_step two\n$ "
+    current = "$ make\nbuild_step one\nbuild_step two\n$ pytest\nrun_tests passed\n$ "
+    assert new_output(previous, current) == "\n$ pytest\nrun_tests passed\n$ "
+    assert new_output(current, current) == ""
+
+
+def test_new_output_falls_back_to_whole_tail_when_anchor_is_gone():
+    assert new_output("old_output one\nold_output two\n$ ", "fresh_start\n$ ") == "fresh_start\n$ "
+
+
+def test_only_new_output_is_counted(terminal, extractor):
+    terminal.write(HWND, "$ pytest\nrun_tests passed\n$ ")
+    extractor.extract_terms(window())
+    assert weights(extractor)["run_tests"] == pytest.approx(1.0)
+
+    # Re-reading the same screen adds nothing; new output adds only itself
+    extractor.extract_terms(window())
+    terminal.write(HWND, "make\nbuild_step done\n$ ")
+    extractor.extract_terms(window())
+    assert weights(extractor)["run_tests"] == pytest.approx(1.0)
+    assert weights(extractor)["build_step"] == pytest.approx(1.0)
+    assert terminal.reads == 3
+
+
+def test_cleared_screen_is_read_whole(terminal, extractor):
+    terminal.write(HWND, "$ git status\nfeature_branch clean\n$ ")
+    extractor.extract_terms(window())
+
+    terminal.clear(HWND)
+    terminal.write(HWND, "$ git log\nfeature_branch merged\n$ ")
+    extractor.extract_terms(window())
+
+    assert weights(extractor)["feature_branch"] == pytest.approx(2.0)
+
+
+def test_windows_are_tracked_separately(terminal, extractor):
+    terminal.write(1, "first_window output\n$ ")
+    terminal.write(2, "second_window output\n$ ")
+    assert "first_window" in extractor.extract_terms(window(1))
+    assert "first_window" not in extractor.extract_terms(window(2))
+
+
+def test_decaying_table_halves_weights():
+    t0 = time.monotonic()
+    table = DecayingTermTable(half_life_s=10.0)
+    table.add({"old_term": 4}, now=t0)
+    table.add({"new_term": 1}, now=t0 + 10.0)
+    assert table.weights["old_term"] == pytest.approx(2.0)
+    assert table.weights["new_term"] == pytest.approx(1.0)
+
+    table.add({}, now=t0 + 20.0)
+    assert table.weights["old_term"] == pytest.approx(1.0)
+    assert table.weights["new_term"] == pytest.approx(0.5)
+
+
+def test_decaying_table_drops_faded_and_excess_terms():
+    t0 = time.monotonic()
+    table = DecayingTermTable(half_life_s=1.0, max_entries=2)
+    table.add({"faded_term": 1}, now=t0)
+    table.add({"term_a": 3, "term_b": 2}, now=t0 + 10.0)
+    assert "faded_term" not in table.weights
+
+    table.add({"term_c": 1}, now=t0 + 10.0)
+    assert set(table.weights) == {"term_a", "term_b"}
+
+
+def test_summary_reports_uia_client_creation():
+    provider = UIATextProvider()
+    provider.clients_created, provider.client_create_ms = 2, 41.6
+    registry = ExtractorRegistry()
+    registry.register("terminal", lambda: TerminalExtractor(provider))
+
+    registry.extract_terms("terminal", window(1))
+
+    assert "TerminalExtractor 1 calls" in registry.summary()
+    assert "2 UI Automation clients created in 42 ms" in registry.summary()
@@ -0,0 +1,107 @@
+"""Decode guard limits and batched decoding, checked against a fake Whisper model."""
+
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+from stvc.fakes import FakeWhisperModel
+from stvc.transcriber import (
+    DECODE_PROFILES, MAX_LENGTH, MAX_PROMPT_TOKENS, SAMPLE_RATE, DecodeGuard, Transcriber,
+)
+
+
+class FakeTokenizer:
+    """One token per word, like a prompt of short terms."""
+
+    def encode(self, text, add_special_tokens=True):
+        return SimpleNamespace(ids=text.split())
+
+
+def make_transcriber(model, guard=None):
+    transcriber = Transcriber(model_name="fake", device="cpu", guard=guard or DecodeGuard())
+    transcriber.use_model(model)
+    return transcriber
+
+
+def test_full_prompt_fits_whisper_context():
+    model = FakeWhisperModel(["Hello there."])
+    model.hf_tokenizer = FakeTokenizer()
+    transcriber = make_transcriber(model)
+    prompt = " ".join(f"term{i}" for i in range(MAX_PROMPT_TOKENS))
+
+    transcriber.transcribe(np.zeros(20 * SAMPLE_RATE, dtype=np.float32), initial_prompt=prompt)
+
+    # faster-whisper prompts with <|startofprev|> + prompt + 3-4 special tokens
+    # and raises ValueError past MAX_LENGTH
+    prompt_length = 1 + MAX_PROMPT_TOKENS + 4
+    assert prompt_length + model.calls[0]["max_new_tokens"] <= MAX_LENGTH
+
+
+def test_short_prompt_keeps_duration_cap():
+    model = FakeWhisperModel(["Hello there."])
+    model.hf_tokenizer = FakeTokenizer()
+    transcriber = make_transcriber(model)
+
+    transcriber.transcribe(np.zeros(2 * SAMPLE_RATE, dtype=np.float32), initial_prompt="pytest, numpy")
+
+    assert model.calls[0]["max_new_tokens"] == 2 * 12 + 16
+
+
+def test_time_budget_disabled_by_default():
+    assert not DecodeGuard().over_time_budget(duration=1.0, elapsed=60.0)
+
+
+def test_time_budget_scales_with_decode_rtf():
+    guard = DecodeGuard(time_budget_factor=2.0, decode_rtf=1.5)
+    assert not guard.over_time_budget(duration=10.0, elapsed=29.0)
+    assert guard.over_time_budget(duration=10.0, elapsed=31.0)
+
+
+def test_time_budget_keeps_decoded_segments():
+    model = FakeWhisperModel(["One.", "Two.", "Three."], delay=0.1)
+    guard = DecodeGuard(time_budget_factor=1.0, decode_rtf=0.01, min_time_budget=0.15)
+    transcriber = make_transcriber(model, guard)
+
+    text = transcriber.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))
+
+    assert text == "One. Two."
+    assert transcriber.guard_aborts["time_budget"] == 1
+
+
+def batched(monkeypatch, model, guard=None):
+    """Transcriber whose BatchedInferencePipeline is the fake model itself."""
+    monkeypatch.setitem(sys.modules, "faster_whisper", SimpleNamespace(BatchedInferencePipeline=lambda model: model))
+    return make_transcriber(model, guard)
+
+
+def test_batched_chunks_use_profile_and_guard(monkeypatch):
+    model = FakeWhisperModel(["First chunk.", "Second chunk."])
+    model.hf_tokenizer = FakeTokenizer()
+    transcriber = batched(monkeypatch, model)
+    chunks = [(0, 10 * SAMPLE_RATE), (10 * SAMPLE_RATE, 20 * SAMPLE_RATE)]
+
+    texts = transcriber.transcribe_chunks(
+        np.zeros(20 * SAMPLE_RATE, dtype=np.float32), chunks,
+        initial_prompt="pytest, numpy", profile=DECODE_PROFILES["accurate"],
+    )
+
+    assert texts == ["First chunk.", "Second chunk."]
+    call = model.calls[0]
+    assert call["beam_size"] == 5 and call["temperature"] == list(DECODE_PROFILES["accurate"].temperature)
+    assert "condition_on_previous_text" not in call
+    # Capped per 10s window, not for the 20s of audio
+    assert call["max_new_tokens"] == 10 * 12 + 16
+
+
+def test_batched_chunks_stop_on_repetition(monkeypatch):
+    model = FakeWhisperModel(["Thank you."] * 6)
+    transcriber = batched(monkeypatch, model)
+
+    texts = transcriber.transcribe_chunks(
+        np.zeros(60 * SAMPLE_RATE, dtype=np.float32), [(0, 30 * SAMPLE_RATE), (30 * SAMPLE_RATE, 60 * SAMPLE_RATE)],
+    )
+
+    assert texts == ["Thank you. Thank you.", ""]
+    assert transcriber.guard_aborts["repetition"] == 1
+
@@ -0,0 +1,106 @@
+"""Process metadata cache, over a stand-in for psutil."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from stvc.context import window_detect
+from stvc.context.window_detect import ProcessInfoCache
+
+
+class NoSuchProcess(Exception):
+    pass
+
+
+class AccessDenied(Exception):
+    pass
+
+
+class FakeProcess:
+    """psutil.Process over a table of pid -> (create_time, name, exe); None denies access."""
+
+    calls: list[tuple[int, str]] = []
+    table: dict[int, tuple[float, str, str] | None] = {}
+
+    def __init__(self, pid: int):
+        self.pid = pid
+
+    def _info(self, call: str):
+        FakeProcess.calls.append((self.pid, call))
+        if self.pid not in self.table:
+            raise NoSuchProcess(self.pid)
+        if self.table[self.pid] is None:
+            raise AccessDenied(self.pid)
+        return self.table[self.pid]
+
+    def create_time(self):
+        return self._info("create_time")[0]
+
+    def name(self):
+        return self._info("name")[1]
+
+    def exe(self):
+        return self._info("exe")[2]
+
+
+@pytest.fixture
+def processes(monkeypatch):
+    FakeProcess.calls, FakeProcess.table = [], {}
+    fake = SimpleNamespace(Process=FakeProcess, NoSuchProcess=NoSuchProcess, AccessDenied=AccessDenied)
+    monkeypatch.setattr(window_detect, "psutil", fake, raising=False)
+    return FakeProcess
+
+
+def test_hit_within_ttl_skips_the_process(processes):
+    processes.table[10] = (100.0, "Code.exe", r"C:\VSCode\Code.exe")
+    cache = ProcessInfoCache(ttl=60.0)
+
+    assert cache.lookup(10) == ("Code.exe", r"C:\VSCode\Code.exe")
+    calls = len(processes.calls)
+    assert cache.lookup(10) == ("Code.exe", r"C:\VSCode\Code.exe")
+
+    assert len(processes.calls) == calls
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_after_ttl_only_create_time_is_rechecked(processes):
+    processes.table[10] = (100.0, "Code.exe", r"C:\VSCode\Code.exe")
+    cache = ProcessInfoCache(ttl=0.0)
+    cache.lookup(10)
+    processes.calls.clear()
+
+    assert cache.lookup(10) == ("Code.exe", r"C:\VSCode\Code.exe")
+    assert processes.calls == [(10, "create_time")]
+    assert cache.hits == 1
+
+
+def test_reused_pid_is_looked_up_afresh(processes):
+    processes.table[10] = (100.0, "Code.exe", r"C:\VSCode\Code.exe")
+    cache = ProcessInfoCache(ttl=0.0)
+    cache.lookup(10)
+
+    processes.table[10] = (200.0, "WindowsTerminal.exe", r"C:\WT\WindowsTerminal.exe")
+
+    assert cache.lookup(10) == ("WindowsTerminal.exe", r"C:\WT\WindowsTerminal.exe")
+    assert cache.misses == 2
+
+
+def test_access_denied_is_cached_for_the_ttl(processes):
+    processes.table[10] = None
+    cache = ProcessInfoCache(ttl=60.0)
+
+    assert cache.lookup(10) == ("", "")
+    assert cache.lookup(10) == ("", "")
+
+    assert processes.calls == [(10, "create_time")]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_exited_process_is_forgotten(processes):
+    processes.table[10] = (100.0, "Code.exe", r"C:\VSCode\Code.exe")
+    cache = ProcessInfoCache(ttl=0.0)
+    cache.lookup(10)
+    del processes.table[10]
+
+    assert cache.lookup(10) == ("", "")
+    assert "0 processes" in cache.stats()
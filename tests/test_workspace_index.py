@@ -0,0 +1,135 @@
+"""Workspace index: .gitignore rules, incremental scans and tracker invalidation."""
+
+import os
+
+import pytest
+
+from stvc.context import workspace_index
+from stvc.context.tracker import ContextTracker
+from stvc.context.window_detect import WindowInfo
+from stvc.context.workspace_index import GitIgnore, WorkspaceIndex, iter_source_files
+from stvc.fakes import FakeFocusSource
+
+
+def ignored(lines: list[str], rel_path: str, is_dir: bool = False) -> bool | None:
+    return GitIgnore(lines).match(rel_path, is_dir)
+
+
+def test_gitignore_unanchored_pattern_matches_at_any_depth():
+    assert ignored(["*.log"], "debug.log")
+    assert ignored(["*.log"], "logs/deep/debug.log")
+    assert ignored(["*.log"], "debug.py") is None
+
+
+def test_gitignore_anchored_pattern_matches_only_at_root():
+    assert ignored(["/build/"], "build", is_dir=True)
+    assert ignored(["/build/"], "src/build", is_dir=True) is None
+    assert ignored(["docs/gen"], "docs/gen", is_dir=True)
+    assert ignored(["docs/gen"], "src/docs/gen", is_dir=True) is None
+
+
+def test_gitignore_dir_only_pattern_skips_files():
+    assert ignored(["build/"], "src/build", is_dir=True)
+    assert ignored(["build/"], "src/build", is_dir=False) is None
+
+
+def test_gitignore_negation_reincludes():
+    rules = ["*.py", "!keep.py", "# comment", ""]
+    assert ignored(rules, "drop.py")
+    assert ignored(rules, "keep.py") is False
+
+
+def test_gitignore_double_star():
+    assert ignored(["**/fixtures/*.py"], "tests/unit/fixtures/data.py")
+    assert ignored(["a/**/z.py"], "a/b/c/z.py")
+
+
+def write(path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    root = tmp_path / "project"
+    write(root / "pyproject.toml", "[project]\nname = 'demo'\n")
+    write(root / ".gitignore", "/build/\n*.gen.py\n")
+    write(root / "app" / "loader.py", "def load_settings():\n    return parse_config_file()\n")
+    write(root / "app" / "models.py", "class UserAccount:\n    account_id = 0\n")
+    write(root / "build" / "out.py", "generated_symbol = 1\n")
+    write(root / "app" / "build" / "nested.py", "nested_build_symbol = 1\n")
+    write(root / "app" / "schema.gen.py", "generated_schema = 1\n")
+    write(root / "notes.txt", "not_source_code\n")
+    return root
+
+
+def test_iter_source_files_applies_gitignore(workspace):
+    found = {path.relative_to(workspace).as_posix() for path, _ in iter_source_files(workspace, 1 << 20, 100)}
+    assert found == {"app/loader.py", "app/models.py", "app/build/nested.py"}
+
+
+@pytest.fixture
+def index(tmp_path):
+    return WorkspaceIndex(index_dir=tmp_path / "index", cpu_fraction=1.0)
+
+
+def test_scan_rereads_only_changed_files(workspace, index):
+    assert index.scan(workspace) == 3
+    assert "load_settings" in index.top_terms(str(workspace / "app" / "loader.py"))
+    assert index.scan(workspace) == 0
+
+    loader = workspace / "app" / "loader.py"
+    write(loader, "def load_settings_v2():\n    return read_env_file()\n")
+    os.utime(loader, ns=(loader.stat().st_atime_ns, loader.stat().st_mtime_ns + 10**9))
+    assert index.scan(workspace) == 1
+    top = index.top_terms(str(loader))
+    assert "read_env_file" in top and "load_settings" not in top
+
+
+def test_scan_drops_removed_files(workspace, index):
+    index.scan(workspace)
+    generation = index.generation
+    (workspace / "app" / "models.py").unlink()
+
+    assert index.scan(workspace) == 0
+    assert "UserAccount" not in index.top_terms(str(workspace / "app" / "loader.py"))
+    assert index.generation > generation
+
+
+def test_first_request_loads_persisted_terms(workspace, tmp_path):
+    WorkspaceIndex(index_dir=tmp_path / "index", cpu_fraction=1.0).scan(workspace)
+
+    fresh = WorkspaceIndex(index_dir=tmp_path / "index", cpu_fraction=1.0)
+    loader = str(workspace / "app" / "loader.py")
+    assert fresh.top_terms(loader) == []
+    fresh.request(loader)
+    assert "load_settings" in fresh.top_terms(loader)
+
+
+def test_tracker_rebuilds_prompt_when_index_publishes(workspace, index):
+    loader = workspace / "app" / "loader.py"
+    info = WindowInfo(hwnd=7, title=f"{loader} - Notepad++", process_name="notepad++.exe", exe_path="")
+    tracker = ContextTracker(", ".join, FakeFocusSource(), window_info=lambda: info)
+
+    workspace_index.set_workspace_index(index)
+    try:
+        tracker.refresh()
+        assert "UserAccount" not in tracker.lookup().prompt
+
+        index.scan(workspace)
+        assert tracker.lookup() is None
+        tracker.refresh()
+        assert "UserAccount" in tracker.lookup().prompt
+    finally:
+        workspace_index.set_workspace_index(None)
+
+
+def test_unchanged_rescan_is_still_throttled(workspace, index, monkeypatch):
+    index.scan(workspace)
+    slept = []
+    monkeypatch.setattr(workspace_index, "THROTTLE_SLICE_S", 0.0)
+    monkeypatch.setattr(index, "_throttle", slept.append)
+
+    assert index.scan(workspace) == 0
+    # Once per file walked, plus the remainder at the end
+    assert len(slept) == 4